@@ -8,7 +8,8 @@ from app.config import settings
 from app.database import Base
 
 config = context.config
-config.set_main_option("sqlalchemy.url", f"sqlite:///{settings.db_path}")
+# ConfigParser treats % as interpolation, which URL-encoded passwords may contain
+config.set_main_option("sqlalchemy.url", settings.database_url.replace("%", "%%"))
 
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
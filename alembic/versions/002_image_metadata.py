@@ -0,0 +1,77 @@
+"""image metadata columns
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+"""
+
+import hashlib
+from io import BytesIO
+
+import sqlalchemy as sa
+from PIL import Image
+
+from alembic import op
+
+revision = "002"
+down_revision = "001"
+branch_labels = None
+depends_on = None
+
+# (table, column prefix) pairs that store an uploaded image
+_IMAGE_TABLES = [("logo_settings", "logo"), ("background_image_settings", "image")]
+
+_MEDIA_TYPES = {"png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg", "svg": "image/svg+xml"}
+
+
+def _describe(data: bytes, filename: str | None) -> dict:
+    width = height = mime_type = None
+    try:
+        with Image.open(BytesIO(data)) as image:
+            width, height = image.size
+            mime_type = Image.MIME.get(image.format)
+    except Exception:
+        pass
+    if not mime_type:
+        ext = filename.rsplit(".", 1)[-1].lower() if filename and "." in filename else "png"
+        mime_type = _MEDIA_TYPES.get(ext, "image/png")
+    return {
+        "size": len(data),
+        "hash": hashlib.sha256(data).hexdigest(),
+        "width": width,
+        "height": height,
+        "mime_type": mime_type,
+    }
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table_name, prefix in _IMAGE_TABLES:
+        op.add_column(table_name, sa.Column(f"{prefix}_size", sa.Integer(), nullable=True))
+        op.add_column(table_name, sa.Column(f"{prefix}_hash", sa.String(), nullable=True))
+        op.add_column(table_name, sa.Column(f"{prefix}_width", sa.Integer(), nullable=True))
+        op.add_column(table_name, sa.Column(f"{prefix}_height", sa.Integer(), nullable=True))
+        op.add_column(table_name, sa.Column(f"{prefix}_mime_type", sa.String(), nullable=True))
+
+        rows = bind.execute(
+            sa.text(f"SELECT setting_name, {prefix}_data, {prefix}_filename FROM {table_name}")
+        ).fetchall()
+        for setting_name, data, filename in rows:
+            if data is None:
+                continue
+            meta = _describe(data, filename)
+            bind.execute(
+                sa.text(
+                    f"UPDATE {table_name} SET {prefix}_size = :size, {prefix}_hash = :hash, "
+                    f"{prefix}_width = :width, {prefix}_height = :height, {prefix}_mime_type = :mime_type "
+                    "WHERE setting_name = :setting_name"
+                ),
+                {**meta, "setting_name": setting_name},
+            )
+
+
+def downgrade() -> None:
+    for table_name, prefix in _IMAGE_TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            for suffix in ("mime_type", "height", "width", "hash", "size"):
+                batch_op.drop_column(f"{prefix}_{suffix}")
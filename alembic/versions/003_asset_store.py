@@ -0,0 +1,71 @@
+"""move image BLOBs to the asset store
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+"""
+
+import hashlib
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.services.asset_store import read_asset, store_asset
+
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+# (table, column prefix) pairs that store an uploaded image
+_IMAGE_TABLES = [("logo_settings", "logo"), ("background_image_settings", "image")]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table_name, prefix in _IMAGE_TABLES:
+        rows = bind.execute(sa.text(f"SELECT setting_name, {prefix}_data FROM {table_name}")).fetchall()
+        for setting_name, data in rows:
+            if data is None:
+                # No image was ever stored; drop the row instead of inventing an empty asset
+                bind.execute(
+                    sa.text(f"DELETE FROM {table_name} WHERE setting_name = :setting_name"),
+                    {"setting_name": setting_name},
+                )
+                continue
+            data = bytes(data)  # PostgreSQL returns bytea as memoryview
+            content_hash = hashlib.sha256(data).hexdigest()
+            store_asset(data, content_hash)
+            bind.execute(
+                sa.text(
+                    f"UPDATE {table_name} SET {prefix}_hash = :hash, {prefix}_size = :size "
+                    "WHERE setting_name = :setting_name"
+                ),
+                {"hash": content_hash, "size": len(data), "setting_name": setting_name},
+            )
+
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column(f"{prefix}_data")
+            batch_op.alter_column(f"{prefix}_hash", existing_type=sa.String(), nullable=False)
+            batch_op.alter_column(f"{prefix}_size", existing_type=sa.Integer(), nullable=False)
+            batch_op.create_index(f"ix_{table_name}_{prefix}_hash", [f"{prefix}_hash"])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table_name, prefix in _IMAGE_TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_index(f"ix_{table_name}_{prefix}_hash")
+            batch_op.alter_column(f"{prefix}_hash", existing_type=sa.String(), nullable=True)
+            batch_op.alter_column(f"{prefix}_size", existing_type=sa.Integer(), nullable=True)
+            batch_op.add_column(sa.Column(f"{prefix}_data", sa.LargeBinary(), nullable=True))
+
+        rows = bind.execute(sa.text(f"SELECT setting_name, {prefix}_hash FROM {table_name}")).fetchall()
+        for setting_name, content_hash in rows:
+            bind.execute(
+                sa.text(f"UPDATE {table_name} SET {prefix}_data = :data WHERE setting_name = :setting_name"),
+                {"data": read_asset(content_hash) or b"", "setting_name": setting_name},
+            )
+
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(f"{prefix}_data", existing_type=sa.LargeBinary(), nullable=False)
@@ -0,0 +1,40 @@
+"""appointment updated_at for retention
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+"""
+
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("appointments", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    # Existing rows start their retention period now rather than being pruned on the first compaction
+    op.get_bind().execute(
+        sa.text("UPDATE appointments SET updated_at = :now"),
+        {"now": datetime.now(timezone.utc).replace(tzinfo=None)},
+    )
+    op.create_index("ix_appointments_updated_at", "appointments", ["updated_at"])
+
+    if op.get_bind().dialect.name == "sqlite":
+        # The background compaction only runs incremental VACUUMs. Switching the auto_vacuum mode needs one full
+        # VACUUM under an exclusive lock, so it happens here, before any worker serves requests.
+        with op.get_context().autocommit_block():
+            op.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            op.execute("VACUUM")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_appointments_updated_at", table_name="appointments")
+    with op.batch_alter_table("appointments") as batch_op:
+        batch_op.drop_column("updated_at")
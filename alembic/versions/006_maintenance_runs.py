@@ -0,0 +1,28 @@
+"""maintenance run markers
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "006"
+down_revision = "005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "maintenance_runs",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("last_run_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("maintenance_runs")
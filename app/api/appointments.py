@@ -4,8 +4,8 @@ from typing import List, Optional
 
 import httpx
 import structlog
-from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
-from fastapi.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.config import settings
@@ -14,23 +14,33 @@ from app.crud import (
     delete_logo,
     get_additional_infos,
     load_background_image,
+    load_background_image_info,
     load_color_settings,
     load_logo,
+    load_logo_info,
     save_additional_infos,
     save_background_image,
     save_color_settings,
     save_logo,
 )
-from app.database import DEFAULT_SETTING_NAME, get_db
+from app.database import DEFAULT_SETTING_NAME, get_db, run_db
 from app.dependencies import get_http_client
-from app.schemas import ColorSettings, GenerateRequest
+from app.responses import conditional_json_response, etag_matches
+from app.schemas import ColorSettings, GenerateRequest, ImageAssetInfo
+from app.services.asset_store import StagedAsset, asset_path, discard_staged_asset
 from app.services.churchtools_client import AuthenticationError, fetch_appointments, fetch_calendars, parse_appointment
+from app.services.image_metadata import guess_media_type
 from app.services.jpeg_generator import handle_jpeg_generation
 from app.services.pdf_generator import create_pdf
+from app.services.uploads import InvalidUploadError, UploadTooLargeError, stage_multipart_file
 from app.shared import templates
 from app.utils import get_date_range_from_form, normalize_newlines
 
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10 MB
+# Versioned asset URLs (?v=<hash prefix>) change whenever the image does, so browsers may keep them forever
+ASSET_VERSION_LENGTH = 16
+VERSIONED_ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+UNVERSIONED_ASSET_CACHE_CONTROL = "no-cache"
 
 
 def _require_auth(request: Request) -> None:
@@ -51,8 +61,8 @@ def _build_template_context(
     start_date: str,
     end_date: str,
     color_settings: ColorSettings,
-    has_logo: bool = False,
-    has_background_image: bool = False,
+    logo: Optional[ImageAssetInfo] = None,
+    background_image: Optional[ImageAssetInfo] = None,
     **extra,
 ) -> dict:
     """Build the common template context dict for appointments.html."""
@@ -64,8 +74,10 @@ def _build_template_context(
         "end_date": end_date,
         "base_url": settings.churchtools_base,
         "color_settings": color_settings,
-        "has_logo": has_logo,
-        "has_background_image": has_background_image,
+        "has_logo": logo is not None,
+        "has_background_image": background_image is not None,
+        "logo_url": _versioned_asset_url("/logo", logo),
+        "background_url": _versioned_asset_url("/background", background_image),
         "version": settings.version,
     }
     context.update(extra)
@@ -103,11 +115,7 @@ async def appointments_page(
     else:
         selected_calendar_ids = [str(calendar["id"]) for calendar in calendars]
 
-    color_settings = load_color_settings(db, DEFAULT_SETTING_NAME)
-    logo_data, _ = load_logo(db, DEFAULT_SETTING_NAME)
-    has_logo = logo_data is not None
-    bg_data, _ = load_background_image(db, DEFAULT_SETTING_NAME)
-    has_background_image = bg_data is not None
+    color_settings = await run_db(load_color_settings, db, DEFAULT_SETTING_NAME)
 
     return templates.TemplateResponse(
         "appointments.html",
@@ -118,8 +126,8 @@ async def appointments_page(
             start_date,
             end_date,
             color_settings,
-            has_logo=has_logo,
-            has_background_image=has_background_image,
+            logo=await run_db(load_logo_info, db, DEFAULT_SETTING_NAME),
+            background_image=await run_db(load_background_image_info, db, DEFAULT_SETTING_NAME),
         ),
     )
 
@@ -132,7 +140,7 @@ async def api_appointments(
     start_date: str = Query(...),
     end_date: str = Query(...),
     calendar_ids: List[str] = Query(...),
-) -> JSONResponse:
+) -> Response:
     """JSON endpoint for async appointment loading."""
     login_token = request.cookies.get(settings.cookie_login_token)
     if not login_token:
@@ -148,15 +156,11 @@ async def api_appointments(
         return JSONResponse({"error": "not_authenticated"}, status_code=401)
 
     appointments = [parse_appointment(raw) for raw in raw_appointments]
-    additional_infos = get_additional_infos(db, [app.id for app in appointments])
+    additional_infos = await run_db(get_additional_infos, db, [app.id for app in appointments])
     for appointment in appointments:
         appointment.additional_info = additional_infos.get(appointment.id, "")
 
-    return JSONResponse(
-        {
-            "appointments": [app.model_dump() for app in appointments],
-        }
-    )
+    return conditional_json_response(request, {"appointments": [app.model_dump() for app in appointments]})
 
 
 @router.post("/api/generate")
@@ -177,17 +181,17 @@ async def api_generate(
     appointment_info_list = [
         (app_id, normalize_newlines(body.additional_infos.get(app_id, ""))) for app_id in body.appointment_ids
     ]
-    save_additional_infos(db, appointment_info_list)
-    save_color_settings(db, color_settings)
+    await run_db(save_additional_infos, db, appointment_info_list)
+    await run_db(save_color_settings, db, color_settings)
 
-    # Load background image and logo from DB
+    # Load background image and logo from the asset store
     background_image_stream = None
-    bg_data, _ = load_background_image(db, body.profile)
+    bg_data, _ = await run_db(load_background_image, db, body.profile)
     if bg_data:
         background_image_stream = BytesIO(bg_data)
 
     logo_stream = None
-    logo_data, _ = load_logo(db, body.profile)
+    logo_data, _ = await run_db(load_logo, db, body.profile)
     if logo_data:
         logo_stream = BytesIO(logo_data)
 
@@ -244,73 +248,101 @@ async def api_generate(
     )
 
 
-@router.post("/logo/upload")
-async def upload_logo(request: Request, file: UploadFile = File(...), db: Session = Depends(get_db)) -> JSONResponse:
-    """Upload a logo image and store it in the database."""
-    _require_auth(request)
-    content = await file.read(MAX_UPLOAD_SIZE + 1)
-    if len(content) > MAX_UPLOAD_SIZE:
+def _versioned_asset_url(path: str, info: Optional[ImageAssetInfo]) -> Optional[str]:
+    """URL of a stored image that changes with its content, or None if nothing is stored."""
+    if info is None:
+        return None
+    return f"{path}?v={info.content_hash[:ASSET_VERSION_LENGTH]}"
+
+
+def _asset_file_response(request: Request, info: Optional[ImageAssetInfo], not_found_detail: str) -> Response:
+    """Serve a stored image straight from the asset store so the server can sendfile it.
+
+    The strong ETag is the content hash, so a matching If-None-Match is answered with 304 without
+    touching the file. Requests for the versioned URL may be cached indefinitely; the bare URL is revalidated.
+    """
+    if info is None:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+
+    etag = f'"{info.content_hash}"'
+    version = request.query_params.get("v")
+    is_versioned = version is not None and version == info.content_hash[:ASSET_VERSION_LENGTH]
+    headers = {
+        "ETag": etag,
+        "Cache-Control": VERSIONED_ASSET_CACHE_CONTROL if is_versioned else UNVERSIONED_ASSET_CACHE_CONTROL,
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    path = asset_path(info.content_hash)
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    return FileResponse(path, media_type=info.mime_type or guess_media_type(info.filename), headers=headers)
+
+
+async def _receive_image_upload(request: Request) -> tuple[StagedAsset, str]:
+    """Stream the "file" field of an upload to the staging area, enforcing MAX_UPLOAD_SIZE as it arrives."""
+    try:
+        staged, filename = await stage_multipart_file(request, "file", MAX_UPLOAD_SIZE)
+    except UploadTooLargeError:
         raise HTTPException(status_code=413, detail="Datei zu groß (max. 10 MB)")
-    if not content:
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not staged.size:
+        discard_staged_asset(staged)
         raise HTTPException(status_code=400, detail="Leere Datei")
-    save_logo(db, DEFAULT_SETTING_NAME, content, file.filename)
-    return JSONResponse({"status": "ok", "filename": file.filename})
+    return staged, filename
 
 
-@router.get("/logo")
-async def get_logo(db: Session = Depends(get_db)) -> Response:
-    """Serve the stored logo image for preview."""
-    logo_data, logo_filename = load_logo(db, DEFAULT_SETTING_NAME)
-    if not logo_data:
-        raise HTTPException(status_code=404, detail="Kein Logo gespeichert")
+@router.post("/logo/upload")
+async def upload_logo(request: Request, db: Session = Depends(get_db)) -> JSONResponse:
+    """Upload a logo image and store it in the asset store."""
+    _require_auth(request)
+    staged, filename = await _receive_image_upload(request)
+    try:
+        info = await run_db(save_logo, db, DEFAULT_SETTING_NAME, staged, filename)
+    finally:
+        discard_staged_asset(staged)
+    return JSONResponse({"status": "ok", "filename": filename, "url": _versioned_asset_url("/logo", info)})
 
-    ext = (logo_filename.rsplit(".", 1)[-1] if "." in logo_filename else "png").lower()
-    media_types = {"png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg", "svg": "image/svg+xml"}
-    media_type = media_types.get(ext, "image/png")
 
-    return Response(content=logo_data, media_type=media_type)
+@router.get("/logo")
+async def get_logo(request: Request, db: Session = Depends(get_db)) -> Response:
+    """Serve the stored logo image for preview."""
+    info = await run_db(load_logo_info, db, DEFAULT_SETTING_NAME)
+    return _asset_file_response(request, info, "Kein Logo gespeichert")
 
 
 @router.delete("/logo")
 async def remove_logo(request: Request, db: Session = Depends(get_db)) -> JSONResponse:
     """Delete the stored logo."""
     _require_auth(request)
-    delete_logo(db, DEFAULT_SETTING_NAME)
+    await run_db(delete_logo, db, DEFAULT_SETTING_NAME)
     return JSONResponse({"status": "ok"})
 
 
 @router.post("/background/upload")
-async def upload_background(
-    request: Request, file: UploadFile = File(...), db: Session = Depends(get_db)
-) -> JSONResponse:
-    """Upload a background image and store it in the database."""
+async def upload_background(request: Request, db: Session = Depends(get_db)) -> JSONResponse:
+    """Upload a background image and store it in the asset store."""
     _require_auth(request)
-    content = await file.read(MAX_UPLOAD_SIZE + 1)
-    if len(content) > MAX_UPLOAD_SIZE:
-        raise HTTPException(status_code=413, detail="Datei zu groß (max. 10 MB)")
-    if not content:
-        raise HTTPException(status_code=400, detail="Leere Datei")
-    save_background_image(db, DEFAULT_SETTING_NAME, content, file.filename)
-    return JSONResponse({"status": "ok", "filename": file.filename})
+    staged, filename = await _receive_image_upload(request)
+    try:
+        info = await run_db(save_background_image, db, DEFAULT_SETTING_NAME, staged, filename)
+    finally:
+        discard_staged_asset(staged)
+    return JSONResponse({"status": "ok", "filename": filename, "url": _versioned_asset_url("/background", info)})
 
 
 @router.get("/background")
-async def get_background(db: Session = Depends(get_db)) -> Response:
+async def get_background(request: Request, db: Session = Depends(get_db)) -> Response:
     """Serve the stored background image for preview."""
-    image_data, image_filename = load_background_image(db, DEFAULT_SETTING_NAME)
-    if not image_data:
-        raise HTTPException(status_code=404, detail="Kein Hintergrundbild gespeichert")
-
-    ext = (image_filename.rsplit(".", 1)[-1] if "." in image_filename else "png").lower()
-    media_types = {"png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg", "svg": "image/svg+xml"}
-    media_type = media_types.get(ext, "image/png")
-
-    return Response(content=image_data, media_type=media_type)
+    info = await run_db(load_background_image_info, db, DEFAULT_SETTING_NAME)
+    return _asset_file_response(request, info, "Kein Hintergrundbild gespeichert")
 
 
 @router.delete("/background")
 async def remove_background(request: Request, db: Session = Depends(get_db)) -> JSONResponse:
     """Delete the stored background image."""
     _require_auth(request)
-    delete_background_image(db, DEFAULT_SETTING_NAME)
+    await run_db(delete_background_image, db, DEFAULT_SETTING_NAME)
     return JSONResponse({"status": "ok"})
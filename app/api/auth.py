@@ -4,6 +4,7 @@ from fastapi.responses import RedirectResponse, Response
 
 from app.config import settings
 from app.dependencies import get_http_client
+from app.services.churchtools_client import forget_login_token
 from app.shared import templates
 
 router = APIRouter()
@@ -84,6 +85,7 @@ async def logout(request: Request, client: httpx.AsyncClient = Depends(get_http_
             )
         except Exception:
             pass  # Best-effort: still clear local cookie even if API call fails
+        await forget_login_token(login_token)
 
     response = RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
     response.delete_cookie(key=settings.cookie_login_token)
@@ -10,19 +10,36 @@ from starlette import status
 
 from app.config import settings
 from app.dependencies import get_http_client
+from app.responses import conditional_json_response
+from app.schemas import ServicesGroupBy
 from app.services.churchtools_client import (
     AuthenticationError,
     fetch_agenda,
+    fetch_agendas,
     fetch_calendars,
+    fetch_event,
     fetch_events,
 )
-from app.services.pdf_generator import create_agenda_pdf, create_services_pdf
+from app.services.pdf_generator import create_agenda_pdf, create_agendas_pdf, create_services_pdf
 from app.shared import templates
 from app.utils import get_date_range_from_form
 
 logger = structlog.get_logger()
 router = APIRouter()
 
+# Upper bound for event ids accepted by the batch agenda endpoint and the combined agenda PDF
+MAX_BATCH_EVENT_IDS = 100
+
+
+def _format_date_range(start_date: str, end_date: str) -> str:
+    """Format two YYYY-MM-DD query dates as a German range label, e.g. '01.03.2026 – 31.03.2026'."""
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").strftime("%d.%m.%Y")
+        end = datetime.strptime(end_date, "%Y-%m-%d").strftime("%d.%m.%Y")
+    except ValueError:
+        start, end = start_date, end_date
+    return f"{start} – {end}"
+
 
 @router.get("/agenda")
 async def agenda_page(
@@ -119,7 +136,7 @@ async def api_events(
     start_date: str = Query(...),
     end_date: str = Query(...),
     calendar_ids: List[str] = Query(...),
-) -> JSONResponse:
+) -> Response:
     """JSON endpoint returning events with their service assignments."""
     login_token = request.cookies.get(settings.cookie_login_token)
     if not login_token:
@@ -130,7 +147,7 @@ async def api_events(
     except AuthenticationError:
         return JSONResponse({"error": "not_authenticated"}, status_code=401)
 
-    return JSONResponse({"events": [ev.model_dump() for ev in events]})
+    return conditional_json_response(request, {"events": [ev.model_dump() for ev in events]})
 
 
 @router.get("/api/events/{event_id}/agenda")
@@ -152,6 +169,72 @@ async def api_event_agenda(
     return JSONResponse({"items": [item.model_dump() for item in items]})
 
 
+@router.get("/api/agendas")
+async def api_agendas(
+    request: Request,
+    event_ids: List[int] = Query(...),
+    client: httpx.AsyncClient = Depends(get_http_client),
+) -> JSONResponse:
+    """JSON endpoint returning the agendas for many events in one response, keyed by event id."""
+    login_token = request.cookies.get(settings.cookie_login_token)
+    if not login_token:
+        return JSONResponse({"error": "not_authenticated"}, status_code=401)
+
+    if len(event_ids) > MAX_BATCH_EVENT_IDS:
+        return JSONResponse(
+            {"error": "too_many_events", "detail": f"Maximal {MAX_BATCH_EVENT_IDS} Events pro Anfrage"},
+            status_code=400,
+        )
+
+    try:
+        agendas = await fetch_agendas(login_token, event_ids, client)
+    except AuthenticationError:
+        return JSONResponse({"error": "not_authenticated"}, status_code=401)
+
+    return JSONResponse(
+        {"agendas": {str(event_id): [item.model_dump() for item in items] for event_id, items in agendas.items()}}
+    )
+
+
+@router.get("/api/agenda/pdf")
+async def api_agendas_pdf(
+    request: Request,
+    client: httpx.AsyncClient = Depends(get_http_client),
+    start_date: str = Query(...),
+    end_date: str = Query(...),
+    calendar_ids: List[str] = Query(...),
+) -> Response:
+    """Generate and download one PDF with the agendas of every event in the date range."""
+    login_token = request.cookies.get(settings.cookie_login_token)
+    if not login_token:
+        return JSONResponse({"error": "not_authenticated"}, status_code=401)
+
+    try:
+        events = await fetch_events(login_token, start_date, end_date, calendar_ids, client)
+        # One upstream agenda request per event, so the range is capped like the JSON batch endpoint
+        if len(events) > MAX_BATCH_EVENT_IDS:
+            return JSONResponse(
+                {"error": "too_many_events", "detail": f"Maximal {MAX_BATCH_EVENT_IDS} Events pro Anfrage"},
+                status_code=400,
+            )
+        agendas = await fetch_agendas(login_token, [ev.id for ev in events], client)
+    except AuthenticationError:
+        return JSONResponse({"error": "not_authenticated"}, status_code=401)
+
+    # Events without an agenda are left out of the combined document
+    sections = [(ev.name, ev.start_date, agendas[ev.id]) for ev in events if agendas.get(ev.id)]
+    logger.info(f"Generating combined agenda PDF: {len(sections)} of {len(events)} events")
+
+    pdf_bytes = create_agendas_pdf(sections)
+    timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+
+    return StreamingResponse(
+        BytesIO(pdf_bytes),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={timestamp}_agenda.pdf"},
+    )
+
+
 @router.get("/api/events/{event_id}/agenda/pdf")
 async def api_agenda_pdf(
     request: Request,
@@ -184,14 +267,42 @@ async def api_agenda_pdf(
 async def api_event_services_pdf(
     request: Request,
     event_id: int,
-    event_name: str = Query(...),
-    event_start: str = Query(...),
+    event_name: Optional[str] = Query(None),
+    client: httpx.AsyncClient = Depends(get_http_client),
+) -> Response:
+    """Generate and download a services PDF for a single event."""
+    login_token = request.cookies.get(settings.cookie_login_token)
+    if not login_token:
+        return JSONResponse({"error": "not_authenticated"}, status_code=401)
+
+    try:
+        event = await fetch_event(login_token, event_id, client)
+    except AuthenticationError:
+        return JSONResponse({"error": "not_authenticated"}, status_code=401)
+
+    if not event:
+        return JSONResponse({"error": "Event nicht gefunden"}, status_code=404)
+
+    pdf_bytes = create_services_pdf(event_name or event.name, [event])
+    timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+
+    return StreamingResponse(
+        BytesIO(pdf_bytes),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={timestamp}_dienstplan.pdf"},
+    )
+
+
+@router.get("/api/services/pdf")
+async def api_services_pdf(
+    request: Request,
     client: httpx.AsyncClient = Depends(get_http_client),
     start_date: str = Query(...),
     end_date: str = Query(...),
     calendar_ids: List[str] = Query(...),
+    group_by: ServicesGroupBy = Query("event"),
 ) -> Response:
-    """Generate and download a services PDF for a single event."""
+    """Generate and download one services PDF covering every event in the date range."""
     login_token = request.cookies.get(settings.cookie_login_token)
     if not login_token:
         return JSONResponse({"error": "not_authenticated"}, status_code=401)
@@ -201,12 +312,9 @@ async def api_event_services_pdf(
     except AuthenticationError:
         return JSONResponse({"error": "not_authenticated"}, status_code=401)
 
-    # Filter to the requested event
-    event = next((ev for ev in events if ev.id == event_id), None)
-    if not event:
-        return JSONResponse({"error": "Event nicht gefunden"}, status_code=404)
+    logger.info(f"Generating services PDF: {len(events)} events, grouped by {group_by}")
 
-    pdf_bytes = create_services_pdf(event_name, [event])
+    pdf_bytes = create_services_pdf(_format_date_range(start_date, end_date), events, group_by=group_by)
     timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
 
     return StreamingResponse(
@@ -5,14 +5,17 @@ from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.crud import get_additional_infos
-from app.database import get_db
+from app.database import get_db, run_db
 from app.dependencies import get_http_client
+from app.responses import conditional_html_response
 from app.services.churchtools_client import AuthenticationError, fetch_appointments, parse_appointment
 from app.shared import templates
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="/fragments")
 
+APPOINTMENTS_FRAGMENT = "fragments/appointments.html"
+
 
 @router.get("/appointments")
 async def fragment_appointments(
@@ -37,11 +40,10 @@ async def fragment_appointments(
         return HTMLResponse("<p>Sitzung abgelaufen</p>", status_code=401)
 
     appointments = [parse_appointment(raw) for raw in raw_appointments]
-    additional_infos = get_additional_infos(db, [app.id for app in appointments])
+    additional_infos = await run_db(get_additional_infos, db, [app.id for app in appointments])
     for appointment in appointments:
         appointment.additional_info = additional_infos.get(appointment.id, "")
 
-    return templates.TemplateResponse(
-        "fragments/appointments.html",
-        {"request": request, "appointments": appointments},
-    )
+    # Rendering is cheaper than any cache key over the data would be; the ETag spares the transfer instead
+    html = templates.get_template(APPOINTMENTS_FRAGMENT).render(request=request, appointments=appointments)
+    return conditional_html_response(request, html)
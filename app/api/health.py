@@ -2,10 +2,11 @@ from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
 from app.config import settings
+from app.services.cache import get_cache
 
 router = APIRouter()
 
 
 @router.get("/health")
 async def health() -> JSONResponse:
-    return JSONResponse({"status": "ok", "version": settings.version})
+    return JSONResponse({"status": "ok", "version": settings.version, "cache": get_cache().stats_summary()})
@@ -1,6 +1,6 @@
 import tomllib
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from pydantic import Field, model_validator
@@ -26,17 +26,50 @@ class Settings(BaseSettings):
 
     churchtools_base: str = ""
     db_path: str = "churchtools.db"
+    database_url: str = ""  # SQLAlchemy URL, e.g. postgresql+psycopg://...; defaults to SQLite at db_path
+    # Connection pool for server databases (ignored for SQLite)
+    db_pool_size: int = Field(default=5, ge=1)
+    db_max_overflow: int = Field(default=10, ge=0)
+    db_pool_pre_ping: bool = True
+    db_pool_recycle_seconds: int = Field(default=1800, ge=-1)  # -1 disables recycling
+    asset_dir: str = ""  # content-addressed image store; defaults to "assets" next to the database
+    template_cache_dir: str = ""  # compiled Jinja templates; defaults to "template_cache" next to the database
     churchtools_base_url: str = ""
     cookie_login_token: str = "login_token"
     version: str = _read_version()
     timezone_name: str = Field(default="Europe/Berlin", validation_alias="TIMEZONE")
     log_format: str = "console"  # "console" or "json"
+    # SQLite connection tuning, applied as PRAGMAs on every new connection
+    sqlite_journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"] = "WAL"
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_busy_timeout_ms: int = Field(default=5000, ge=0)
+    sqlite_mmap_size: int = Field(default=256 * 1024 * 1024, ge=0)  # bytes
+    sqlite_cache_size: int = -20000  # negative = KiB, positive = pages
+    sqlite_temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    # Shared cache for ChurchTools lookups: "memory" (per worker), "sqlite" (per host) or "redis" (per cluster)
+    cache_backend: Literal["memory", "sqlite", "redis"] = "memory"
+    cache_path: str = ""  # SQLite cache file; defaults to "cache.db" next to the database
+    cache_max_entries: int = Field(default=1024, ge=1)  # memory backend only
+    redis_url: str = "redis://localhost:6379/0"
+    db_thread_limit: int = Field(default=8, ge=1)  # worker threads for blocking DB calls from async handlers
+    # Additional infos not saved within this many days are deleted by the background compaction (0 disables it)
+    appointment_retention_days: int = Field(default=365, ge=0)
+    compaction_interval_hours: float = Field(default=24, gt=0)
+    compression_min_size: int = Field(default=1024, ge=0)  # bytes; smaller responses are sent uncompressed
     timezone: Optional[ZoneInfo] = Field(default=None, exclude=True)
 
     @model_validator(mode="after")
     def _set_computed_defaults(self) -> "Settings":
         if not self.churchtools_base_url and self.churchtools_base:
             self.churchtools_base_url = f"https://{self.churchtools_base}"
+        if not self.database_url:
+            self.database_url = f"sqlite:///{self.db_path}"
+        if not self.cache_path:
+            self.cache_path = str(Path(self.db_path).parent / "cache.db")
+        if not self.asset_dir:
+            self.asset_dir = str(Path(self.db_path).parent / "assets")
+        if not self.template_cache_dir:
+            self.template_cache_dir = str(Path(self.db_path).parent / "template_cache")
         try:
             object.__setattr__(self, "timezone", ZoneInfo(self.timezone_name))
         except (ZoneInfoNotFoundError, KeyError) as e:
@@ -1,21 +1,105 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, TypeVar
+
 import structlog
+from sqlalchemy import Column, MetaData, String, Table, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.models import Appointment, BackgroundImageSetting, ColorSetting, LogoSetting
-from app.schemas import ColorSettings
+from app.models import (
+    Appointment,
+    BackgroundImageSetting,
+    CacheVersion,
+    ColorSetting,
+    LogoSetting,
+    MaintenanceRun,
+)
+from app.schemas import ColorSettings, ImageAssetInfo
+from app.services.asset_store import StagedAsset, commit_staged_asset, delete_asset, read_asset, store_asset
+from app.services.image_metadata import describe_image, describe_staged_image
 
 logger = structlog.get_logger()
 
+# Rows per executemany batch for bulk upserts
+UPSERT_CHUNK_SIZE = 500
+
+# An unchanged additional info still refreshes its updated_at once this much time has passed,
+# so appointments in use are never pruned while repeated saves stay write-free
+ADDITIONAL_INFO_TOUCH_INTERVAL = timedelta(days=1)
+
+# INSERT constructs that support ON CONFLICT ... DO UPDATE, by dialect name
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+# Ids per IN (...) query; stays below SQLite's historical 999 bound-parameter limit
+READ_CHUNK_SIZE = 900
+
+# Above this many ids, lookups join against a temporary table instead of issuing many IN (...) queries
+TEMP_TABLE_LOOKUP_THRESHOLD = 10_000
+
+# Profile colors and image metadata change rarely; cached reads are checked against this DB version counter
+PROFILE_CACHE_VERSION_NAME = "profile_settings"
+
+# maintenance_runs row recording when any worker last claimed the compaction
+COMPACTION_MARKER_NAME = "compaction"
+PROFILE_CACHE_MAX_ENTRIES = 128
+
+T = TypeVar("T")
+
+_profile_cache: dict[tuple[str, str], object] = {}
+_profile_cache_version: int | None = None
+_profile_cache_lock = threading.Lock()
+
+_lookup_ids_table = Table(
+    "appointment_id_lookup",
+    MetaData(),
+    Column("id", String, primary_key=True),
+    prefixes=["TEMPORARY"],
+)
+
+
+def _upsert(db: Session, table):
+    """Start an INSERT ... ON CONFLICT statement for the session's database dialect."""
+    dialect = db.get_bind().dialect.name
+    if dialect not in _UPSERT_INSERTS:
+        raise ValueError(f"Upserts are not supported for database dialect '{dialect}'")
+    return _UPSERT_INSERTS[dialect](table)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 
 def save_additional_infos(db: Session, appointment_info_list: list[tuple[str, str]]) -> None:
+    """Insert or update additional infos in bulk.
+
+    Uses INSERT ... ON CONFLICT(id) DO UPDATE in chunks; rows whose value is unchanged are not rewritten
+    unless their updated_at is older than ADDITIONAL_INFO_TOUCH_INTERVAL.
+    """
+    now = _utcnow()
+    # Later duplicates win, as with the previous row-by-row update
+    rows = [
+        {"id": appointment_id, "additional_info": info, "updated_at": now}
+        for appointment_id, info in dict(appointment_info_list).items()
+    ]
+    if not rows:
+        return
+
+    stmt = _upsert(db, Appointment)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Appointment.id],
+        set_={"additional_info": stmt.excluded.additional_info, "updated_at": stmt.excluded.updated_at},
+        where=or_(
+            Appointment.additional_info.is_distinct_from(stmt.excluded.additional_info),
+            Appointment.updated_at.is_(None),
+            Appointment.updated_at < now - ADDITIONAL_INFO_TOUCH_INTERVAL,
+        ),
+    )
     try:
-        for appointment_id, additional_info in appointment_info_list:
-            appointment = db.query(Appointment).filter(Appointment.id == appointment_id).first()
-            if appointment:
-                appointment.additional_info = additional_info
-            else:
-                db.add(Appointment(id=appointment_id, additional_info=additional_info))
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            db.execute(stmt, rows[start : start + UPSERT_CHUNK_SIZE])
         db.commit()
     except SQLAlchemyError:
         db.rollback()
@@ -23,126 +107,354 @@ def save_additional_infos(db: Session, appointment_info_list: list[tuple[str, st
 
 
 def get_additional_infos(db: Session, appointment_ids: list[str]) -> dict[str, str]:
+    """Look up additional infos by appointment id.
+
+    Small id sets are queried in IN (...) chunks below SQLite's bound-parameter limit; very large
+    sets (e.g. a year across many calendars) are loaded into a temporary table and joined instead.
+    """
     try:
-        results = db.query(Appointment).filter(Appointment.id.in_(appointment_ids)).all()
-        return {appointment.id: appointment.additional_info for appointment in results}
+        unique_ids = list(dict.fromkeys(appointment_ids))
+        if len(unique_ids) > TEMP_TABLE_LOOKUP_THRESHOLD:
+            return _get_additional_infos_via_temp_table(db, unique_ids)
+
+        infos = {}
+        for start in range(0, len(unique_ids), READ_CHUNK_SIZE):
+            chunk = unique_ids[start : start + READ_CHUNK_SIZE]
+            rows = db.query(Appointment.id, Appointment.additional_info).filter(Appointment.id.in_(chunk)).all()
+            infos.update({appointment_id: additional_info for appointment_id, additional_info in rows})
+        return infos
     except SQLAlchemyError as e:
         logger.error(f"Database error: {e}")
         return {}
 
 
-def save_color_settings(db: Session, settings: ColorSettings) -> None:
+def _get_additional_infos_via_temp_table(db: Session, appointment_ids: list[str]) -> dict[str, str]:
+    connection = db.connection()
+    _lookup_ids_table.create(connection, checkfirst=True)
     try:
-        color_setting = db.query(ColorSetting).filter(ColorSetting.setting_name == settings.name).first()
-        if color_setting:
-            color_setting.background_color = settings.background_color
-            color_setting.background_alpha = settings.background_alpha
-            color_setting.date_color = settings.date_color
-            color_setting.description_color = settings.description_color
-        else:
-            db.add(
-                ColorSetting(
-                    setting_name=settings.name,
-                    background_color=settings.background_color,
-                    background_alpha=settings.background_alpha,
-                    date_color=settings.date_color,
-                    description_color=settings.description_color,
-                )
+        connection.execute(_lookup_ids_table.delete())
+        for start in range(0, len(appointment_ids), UPSERT_CHUNK_SIZE):
+            chunk = appointment_ids[start : start + UPSERT_CHUNK_SIZE]
+            connection.execute(_lookup_ids_table.insert(), [{"id": appointment_id} for appointment_id in chunk])
+        rows = connection.execute(
+            select(Appointment.id, Appointment.additional_info).join(
+                _lookup_ids_table, _lookup_ids_table.c.id == Appointment.id
             )
+        )
+        return {appointment_id: additional_info for appointment_id, additional_info in rows}
+    finally:
+        _lookup_ids_table.drop(connection, checkfirst=True)
+
+
+def delete_stale_additional_infos(db: Session, retention: timedelta) -> int:
+    """Delete additional infos not saved within the retention period and return how many rows were removed."""
+    cutoff = _utcnow() - retention
+    try:
+        result = db.query(Appointment).filter(Appointment.updated_at < cutoff).delete(synchronize_session=False)
         db.commit()
+        return result
     except SQLAlchemyError:
         db.rollback()
         raise
 
 
-def load_color_settings(db: Session, setting_name: str) -> ColorSettings:
+def claim_compaction_run(db: Session, interval: timedelta) -> bool:
+    """Claim the next compaction for this worker if none was claimed within interval.
+
+    The conditional UPDATE is atomic on SQLite and PostgreSQL, so of several workers checking at once only one
+    sees its row updated and compacts; the others skip until the next interval.
+    """
+    now = _utcnow()
     try:
-        color_setting = db.query(ColorSetting).filter(ColorSetting.setting_name == setting_name).first()
-        if color_setting:
-            return ColorSettings(
-                name=color_setting.setting_name,
-                background_color=color_setting.background_color,
-                background_alpha=color_setting.background_alpha,
-                date_color=color_setting.date_color,
-                description_color=color_setting.description_color,
-            )
+        db.execute(_upsert(db, MaintenanceRun).values(name=COMPACTION_MARKER_NAME).on_conflict_do_nothing())
+        result = db.execute(
+            update(MaintenanceRun)
+            .where(MaintenanceRun.name == COMPACTION_MARKER_NAME)
+            .where(or_(MaintenanceRun.last_run_at.is_(None), MaintenanceRun.last_run_at <= now - interval))
+            .values(last_run_at=now)
+        )
+        db.commit()
+        return result.rowcount == 1
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+
+
+def clear_profile_cache() -> None:
+    global _profile_cache_version
+    with _profile_cache_lock:
+        _profile_cache.clear()
+        _profile_cache_version = None
+
+
+def _profile_settings_version(db: Session) -> int:
+    stmt = select(CacheVersion.version).where(CacheVersion.name == PROFILE_CACHE_VERSION_NAME)
+    return db.execute(stmt).scalar() or 0
+
+
+def _bump_profile_settings_version(db: Session) -> None:
+    """Bump the profile version inside the current transaction so every worker drops its cached profiles."""
+    stmt = _upsert(db, CacheVersion).values(name=PROFILE_CACHE_VERSION_NAME, version=1)
+    stmt = stmt.on_conflict_do_update(index_elements=[CacheVersion.name], set_={"version": CacheVersion.version + 1})
+    db.execute(stmt)
+
+
+def _commit_profile_change(db: Session) -> None:
+    _bump_profile_settings_version(db)
+    db.commit()
+    clear_profile_cache()
+
+
+def _cached_profile_value(db: Session, kind: str, setting_name: str, loader: Callable[[], T]) -> T:
+    """Return a cached profile value, reloading it if another process changed any profile since.
+
+    The only query on a hit is a primary-key lookup of the version counter.
+    """
+    global _profile_cache_version
+    version = _profile_settings_version(db)
+    key = (kind, setting_name)
+    with _profile_cache_lock:
+        if version != _profile_cache_version:
+            _profile_cache.clear()
+            _profile_cache_version = version
+        elif key in _profile_cache:
+            return _profile_cache[key]
+
+    value = loader()
+    with _profile_cache_lock:
+        if _profile_cache_version == version:
+            if len(_profile_cache) >= PROFILE_CACHE_MAX_ENTRIES:
+                _profile_cache.pop(next(iter(_profile_cache)))
+            _profile_cache[key] = value
+    return value
+
+
+def save_color_settings(db: Session, settings: ColorSettings) -> None:
+    """Insert or update a profile's colors in one statement; an unchanged row is left untouched."""
+    values = {
+        "background_color": settings.background_color,
+        "background_alpha": settings.background_alpha,
+        "date_color": settings.date_color,
+        "description_color": settings.description_color,
+    }
+    stmt = _upsert(db, ColorSetting).values(setting_name=settings.name, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ColorSetting.setting_name],
+        set_={column: stmt.excluded[column] for column in values},
+        where=or_(*(getattr(ColorSetting, column).is_distinct_from(stmt.excluded[column]) for column in values)),
+    )
+    try:
+        result = db.execute(stmt)
+        if result.rowcount:
+            _commit_profile_change(db)
         else:
-            return ColorSettings(name=setting_name)
+            db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+
+
+def _query_color_settings(db: Session, setting_name: str) -> ColorSettings:
+    color_setting = db.query(ColorSetting).filter(ColorSetting.setting_name == setting_name).first()
+    if not color_setting:
+        return ColorSettings(name=setting_name)
+    return ColorSettings(
+        name=color_setting.setting_name,
+        background_color=color_setting.background_color,
+        background_alpha=color_setting.background_alpha,
+        date_color=color_setting.date_color,
+        description_color=color_setting.description_color,
+    )
+
+
+def load_color_settings(db: Session, setting_name: str) -> ColorSettings:
+    try:
+        colors = _cached_profile_value(db, "colors", setting_name, lambda: _query_color_settings(db, setting_name))
+        return colors.model_copy()
     except SQLAlchemyError as e:
         logger.error(f"Database error: {e}")
         return ColorSettings(name=setting_name)
 
 
-def save_logo(db: Session, setting_name: str, logo_data: bytes, filename: str) -> None:
+def _asset_in_use(db: Session, content_hash: str) -> bool:
+    logo_ref = db.query(LogoSetting).filter(LogoSetting.logo_hash == content_hash)
+    bg_ref = db.query(BackgroundImageSetting).filter(BackgroundImageSetting.image_hash == content_hash)
+    return db.query(logo_ref.exists()).scalar() or db.query(bg_ref.exists()).scalar()
+
+
+def _referenced_asset_hashes(db: Session, logo_filter, background_filter) -> set[str]:
+    """Collect the asset hashes of the logo and background rows matching the given filters."""
+    hashes = {r[0] for r in db.query(LogoSetting.logo_hash).filter(logo_filter)}
+    hashes |= {r[0] for r in db.query(BackgroundImageSetting.image_hash).filter(background_filter)}
+    return hashes
+
+
+def _release_assets(db: Session, content_hashes: set[str]) -> None:
+    """Delete stored assets that no logo or background row references any more.
+
+    Profiles share assets by hash (e.g. after cloning), so a file is only removed with its last reference.
+    """
+    for content_hash in content_hashes:
+        try:
+            if not _asset_in_use(db, content_hash):
+                delete_asset(content_hash)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {e}")
+
+
+def _store_image(image: bytes | StagedAsset, filename: str) -> ImageAssetInfo:
+    """Describe an image and put it in the asset store; streamed uploads are moved in rather than copied."""
+    if isinstance(image, StagedAsset):
+        info = describe_staged_image(image, filename)
+        commit_staged_asset(image)
+    else:
+        info = describe_image(image, filename)
+        store_asset(image, info.content_hash)
+    return info
+
+
+def save_logo(db: Session, setting_name: str, logo_data: bytes | StagedAsset, filename: str) -> ImageAssetInfo:
+    info = _store_image(logo_data, filename)
     try:
         logo = db.query(LogoSetting).filter(LogoSetting.setting_name == setting_name).first()
-        if logo:
-            logo.logo_data = logo_data
-            logo.logo_filename = filename
-        else:
-            db.add(LogoSetting(setting_name=setting_name, logo_data=logo_data, logo_filename=filename))
-        db.commit()
+        previous_hash = logo.logo_hash if logo else None
+        if not logo:
+            logo = LogoSetting(setting_name=setting_name)
+            db.add(logo)
+        logo.logo_filename = filename
+        logo.logo_size = info.size
+        logo.logo_hash = info.content_hash
+        logo.logo_width = info.width
+        logo.logo_height = info.height
+        logo.logo_mime_type = info.mime_type
+        _commit_profile_change(db)
     except SQLAlchemyError:
         db.rollback()
+        # The asset was stored before the transaction; drop it again unless another profile already uses it
+        _release_assets(db, {info.content_hash})
         raise
+    if previous_hash and previous_hash != info.content_hash:
+        _release_assets(db, {previous_hash})
+    return info
 
 
 def load_logo(db: Session, setting_name: str) -> tuple[bytes | None, str | None]:
-    try:
-        logo = db.query(LogoSetting).filter(LogoSetting.setting_name == setting_name).first()
-        if logo:
-            return logo.logo_data, logo.logo_filename
+    info = load_logo_info(db, setting_name)
+    if not info:
         return None, None
+    return read_asset(info.content_hash), info.filename
+
+
+def _query_logo_info(db: Session, setting_name: str) -> ImageAssetInfo | None:
+    logo = db.query(LogoSetting).filter(LogoSetting.setting_name == setting_name).first()
+    if not logo:
+        return None
+    return ImageAssetInfo(
+        filename=logo.logo_filename,
+        size=logo.logo_size,
+        content_hash=logo.logo_hash,
+        mime_type=logo.logo_mime_type or "",
+        width=logo.logo_width,
+        height=logo.logo_height,
+    )
+
+
+def load_logo_info(db: Session, setting_name: str) -> ImageAssetInfo | None:
+    """Load the stored logo's metadata (size, hash, dimensions, media type) without the image bytes."""
+    try:
+        info = _cached_profile_value(db, "logo", setting_name, lambda: _query_logo_info(db, setting_name))
+        return info.model_copy() if info else None
     except SQLAlchemyError as e:
         logger.error(f"Database error: {e}")
-        return None, None
+        return None
 
 
 def delete_logo(db: Session, setting_name: str) -> None:
     try:
         logo = db.query(LogoSetting).filter(LogoSetting.setting_name == setting_name).first()
-        if logo:
-            db.delete(logo)
-            db.commit()
+        if not logo:
+            return
+        content_hash = logo.logo_hash
+        db.delete(logo)
+        _commit_profile_change(db)
     except SQLAlchemyError:
         db.rollback()
         raise
+    _release_assets(db, {content_hash})
 
 
-def save_background_image(db: Session, setting_name: str, image_data: bytes, filename: str) -> None:
+def save_background_image(
+    db: Session, setting_name: str, image_data: bytes | StagedAsset, filename: str
+) -> ImageAssetInfo:
+    info = _store_image(image_data, filename)
     try:
         bg = db.query(BackgroundImageSetting).filter(BackgroundImageSetting.setting_name == setting_name).first()
-        if bg:
-            bg.image_data = image_data
-            bg.image_filename = filename
-        else:
-            db.add(BackgroundImageSetting(setting_name=setting_name, image_data=image_data, image_filename=filename))
-        db.commit()
+        previous_hash = bg.image_hash if bg else None
+        if not bg:
+            bg = BackgroundImageSetting(setting_name=setting_name)
+            db.add(bg)
+        bg.image_filename = filename
+        bg.image_size = info.size
+        bg.image_hash = info.content_hash
+        bg.image_width = info.width
+        bg.image_height = info.height
+        bg.image_mime_type = info.mime_type
+        _commit_profile_change(db)
     except SQLAlchemyError:
         db.rollback()
+        # The asset was stored before the transaction; drop it again unless another profile already uses it
+        _release_assets(db, {info.content_hash})
         raise
+    if previous_hash and previous_hash != info.content_hash:
+        _release_assets(db, {previous_hash})
+    return info
 
 
 def load_background_image(db: Session, setting_name: str) -> tuple[bytes | None, str | None]:
-    try:
-        bg = db.query(BackgroundImageSetting).filter(BackgroundImageSetting.setting_name == setting_name).first()
-        if bg:
-            return bg.image_data, bg.image_filename
+    info = load_background_image_info(db, setting_name)
+    if not info:
         return None, None
+    return read_asset(info.content_hash), info.filename
+
+
+def _query_background_image_info(db: Session, setting_name: str) -> ImageAssetInfo | None:
+    bg = db.query(BackgroundImageSetting).filter(BackgroundImageSetting.setting_name == setting_name).first()
+    if not bg:
+        return None
+    return ImageAssetInfo(
+        filename=bg.image_filename,
+        size=bg.image_size,
+        content_hash=bg.image_hash,
+        mime_type=bg.image_mime_type or "",
+        width=bg.image_width,
+        height=bg.image_height,
+    )
+
+
+def load_background_image_info(db: Session, setting_name: str) -> ImageAssetInfo | None:
+    """Load the stored background image's metadata without the image bytes."""
+    try:
+        info = _cached_profile_value(
+            db, "background", setting_name, lambda: _query_background_image_info(db, setting_name)
+        )
+        return info.model_copy() if info else None
     except SQLAlchemyError as e:
         logger.error(f"Database error: {e}")
-        return None, None
+        return None
 
 
 def delete_background_image(db: Session, setting_name: str) -> None:
     try:
         bg = db.query(BackgroundImageSetting).filter(BackgroundImageSetting.setting_name == setting_name).first()
-        if bg:
-            db.delete(bg)
-            db.commit()
+        if not bg:
+            return
+        content_hash = bg.image_hash
+        db.delete(bg)
+        _commit_profile_change(db)
     except SQLAlchemyError:
         db.rollback()
         raise
+    _release_assets(db, {content_hash})
 
 
 def list_profiles(db: Session) -> list[str]:
@@ -170,8 +482,12 @@ def clone_profile(db: Session, source: str, target: str) -> None:
         db.add(
             LogoSetting(
                 setting_name=target,
-                logo_data=source_logo.logo_data,
                 logo_filename=source_logo.logo_filename,
+                logo_size=source_logo.logo_size,
+                logo_hash=source_logo.logo_hash,
+                logo_width=source_logo.logo_width,
+                logo_height=source_logo.logo_height,
+                logo_mime_type=source_logo.logo_mime_type,
             )
         )
 
@@ -180,28 +496,40 @@ def clone_profile(db: Session, source: str, target: str) -> None:
         db.add(
             BackgroundImageSetting(
                 setting_name=target,
-                image_data=source_bg.image_data,
                 image_filename=source_bg.image_filename,
+                image_size=source_bg.image_size,
+                image_hash=source_bg.image_hash,
+                image_width=source_bg.image_width,
+                image_height=source_bg.image_height,
+                image_mime_type=source_bg.image_mime_type,
             )
         )
 
-    db.commit()
+    _commit_profile_change(db)
 
 
 def delete_profile(db: Session, profile_name: str) -> None:
     if profile_name == "default":
         raise ValueError("Cannot delete the default profile")
 
+    content_hashes = _referenced_asset_hashes(
+        db, LogoSetting.setting_name == profile_name, BackgroundImageSetting.setting_name == profile_name
+    )
     db.query(BackgroundImageSetting).filter(BackgroundImageSetting.setting_name == profile_name).delete()
     db.query(LogoSetting).filter(LogoSetting.setting_name == profile_name).delete()
     db.query(ColorSetting).filter(ColorSetting.setting_name == profile_name).delete()
-    db.commit()
+    _commit_profile_change(db)
+    _release_assets(db, content_hashes)
 
 
 def cleanup_orphaned_settings(db: Session) -> None:
     valid_profiles = {r[0] for r in db.query(ColorSetting.setting_name).all()}
+    content_hashes = _referenced_asset_hashes(
+        db, ~LogoSetting.setting_name.in_(valid_profiles), ~BackgroundImageSetting.setting_name.in_(valid_profiles)
+    )
     db.query(LogoSetting).filter(~LogoSetting.setting_name.in_(valid_profiles)).delete(synchronize_session=False)
     db.query(BackgroundImageSetting).filter(~BackgroundImageSetting.setting_name.in_(valid_profiles)).delete(
         synchronize_session=False
     )
-    db.commit()
+    _commit_profile_change(db)
+    _release_assets(db, content_hashes)
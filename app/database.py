@@ -1,13 +1,65 @@
-from sqlalchemy import create_engine
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, ParamSpec, TypeVar
+
+from sqlalchemy import create_engine, event, make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-from app.config import settings
+from app.config import Settings, settings
 
 DEFAULT_SETTING_NAME = "default"
 
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{settings.db_path}"
+P = ParamSpec("P")
+T = TypeVar("T")
+
+SQLALCHEMY_DATABASE_URL = settings.database_url
+
+
+def apply_sqlite_pragmas(dbapi_connection, config: Settings = settings) -> None:
+    """Configure a raw SQLite connection for concurrent readers and writers.
+
+    WAL lets reads proceed while a write is in progress, synchronous=NORMAL is safe under WAL,
+    and busy_timeout makes a blocked writer wait instead of failing with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={config.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={config.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA mmap_size={int(config.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size={int(config.sqlite_cache_size)}")
+        cursor.execute(f"PRAGMA temp_store={config.sqlite_temp_store}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL, config: Settings = settings):
+    """Create the SQLAlchemy engine.
+
+    SQLite gets its PRAGMAs applied on every new connection; server databases such as PostgreSQL get a
+    bounded connection pool that checks connections before use and recycles them periodically.
+    """
+    if make_url(url).get_backend_name() != "sqlite":
+        return create_engine(
+            url,
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_pre_ping=config.db_pool_pre_ping,
+            pool_recycle=config.db_pool_recycle_seconds,
+        )
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+    db_engine = create_engine(url, connect_args={"check_same_thread": False})
+
+    @event.listens_for(db_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, config)
+
+    return db_engine
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -18,3 +70,17 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dedicated, bounded pool so a burst of slow writes cannot starve the event loop or the default thread pool
+_db_executor = ThreadPoolExecutor(max_workers=settings.db_thread_limit, thread_name_prefix="db")
+
+
+async def run_db(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run a blocking crud call in the DB thread pool and await its result.
+
+    The caller's context variables (e.g. the request-scoped log context) are carried into the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_db_executor, functools.partial(context.run, func, *args, **kwargs))
@@ -1,54 +1,69 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from datetime import timedelta
 from pathlib import Path
 
 import httpx
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.api import appointments, auth, events, fragments, health
 from app.config import settings
 from app.logging_config import configure_logging
+from app.middleware.compression import CompressionMiddleware
 from app.middleware.csrf import CSRFMiddleware
+from app.middleware.security_headers import SecurityHeadersMiddleware
+from app.staticfiles import STATIC_DIR, FingerprintedStaticFiles, get_static_manifest
 
 configure_logging(settings.log_format)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        return response
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     from app.crud import cleanup_orphaned_settings
-    from app.database import SessionLocal
+    from app.database import SessionLocal, run_db
+    from app.services.compaction import run_periodic_compaction
+    from app.services.pdf_generator import warm_up_pdf_styles
+    from app.shared import enable_template_bytecode_cache, warm_up_templates
 
     db = SessionLocal()
     try:
-        cleanup_orphaned_settings(db)
+        await run_db(cleanup_orphaned_settings, db)
     finally:
         db.close()
 
+    warm_up_pdf_styles()
+    enable_template_bytecode_cache(settings.template_cache_dir)
+    warm_up_templates()
+
+    compaction_task = None
+    if settings.appointment_retention_days:
+        compaction_task = asyncio.create_task(
+            run_periodic_compaction(
+                timedelta(hours=settings.compaction_interval_hours),
+                timedelta(days=settings.appointment_retention_days),
+            )
+        )
+
     app.state.http_client = httpx.AsyncClient(timeout=30.0)
     yield
     await app.state.http_client.aclose()
 
+    if compaction_task:
+        compaction_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await compaction_task
+
 
 # Create FastAPI application
 app = FastAPI(title="ChurchTools API", lifespan=lifespan)
 app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(CSRFMiddleware, exempt_paths=["/health"])
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_size)
 
 # Include static files
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+app.mount("/static", FingerprintedStaticFiles(directory=STATIC_DIR, manifest=get_static_manifest()), name="static")
 
 # Make sure the directory for DB exists
 Path(settings.db_path).parent.mkdir(parents=True, exist_ok=True)
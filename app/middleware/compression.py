@@ -0,0 +1,181 @@
+import asyncio
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; without it responses are only gzip-compressed
+    brotli = None
+
+# Media types that are already compressed (or streamed as events) and gain nothing from another pass
+EXCLUDED_CONTENT_TYPES = (
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "image/",
+    "audio/",
+    "video/",
+    "font/woff",
+    "text/event-stream",
+)
+
+# Quality 4-5 is the usual sweet spot for on-the-fly Brotli: smaller than gzip -6 at similar speed
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+
+# Bodies at least this large are compressed in a worker thread so the event loop keeps serving
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+
+def accepted_encodings(accept_encoding: str) -> list[str]:
+    """Return the content codings this server can produce, in order of preference for the request.
+
+    Codings the client refuses with q=0 are dropped; among the rest Brotli wins over gzip.
+    """
+    refused = set()
+    offered = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip()
+        quality = params.strip().removeprefix("q=")
+        if quality and quality.replace(".", "", 1).isdigit() and float(quality) == 0:
+            refused.add(coding)
+        elif coding:
+            offered.add(coding)
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return [coding for coding in supported if (coding in offered or "*" in offered) and coding not in refused]
+
+
+class _GzipCompressor:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        output = self._compressor.compress(body)
+        return output + self._compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        output = self._compressor.process(body)
+        return output + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+COMPRESSORS = {"br": _BrotliCompressor, "gzip": _GzipCompressor}
+
+
+def _vary_on_accept_encoding(headers: MutableHeaders) -> None:
+    # Static files may already vary on Accept-Encoding; listing the token twice is legal but noisy
+    listed = {token.strip().lower() for token in headers.get("vary", "").split(",")}
+    if "accept-encoding" not in listed:
+        headers.add_vary_header("Accept-Encoding")
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    # The encoded bytes differ from the identity representation, so a strong validator becomes weak
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class _CompressionResponder:
+    """Wraps send() for one response: decides on the first body message whether to compress, then streams."""
+
+    def __init__(self, send: Send, coding: str | None, minimum_size: int):
+        self.send = send
+        self.coding = coding
+        self.minimum_size = minimum_size
+        self.initial_message: Message = {}
+        self.compressor = None
+        self.passthrough = False
+        self.started = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers back until the first body chunk shows whether compression applies
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 206, 304)
+                or media_type.startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                if message["status"] == 304 and self.coding and "content-encoding" not in headers:
+                    self._match_compressed_validators(MutableHeaders(scope=message))
+                await self.send(message)
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+        if message["type"] == "http.response.pathsend":
+            # The server sends the file itself, so it cannot be compressed here
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        is_first = not self.started
+        if is_first:
+            self.started = True
+            if self.coding and (more_body or len(body) >= self.minimum_size):
+                self.compressor = COMPRESSORS[self.coding]()
+
+        if self.compressor is not None:
+            message = {**message, "body": await self._compress(body, more_body)}
+
+        if is_first:
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            _vary_on_accept_encoding(headers)
+            if self.compressor is not None:
+                headers["Content-Encoding"] = self.coding
+                _weaken_etag(headers)
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(message["body"]))
+            await self.send(self.initial_message)
+        await self.send(message)
+
+    @staticmethod
+    def _match_compressed_validators(headers: MutableHeaders) -> None:
+        """Give a 304 the Vary and ETag its compressed 200 would have carried, as RFC 9110 requires."""
+        _vary_on_accept_encoding(headers)
+        _weaken_etag(headers)
+
+    async def _compress(self, body: bytes, more_body: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await asyncio.to_thread(self.compressor.compress, body, more_body)
+        return self.compressor.compress(body, more_body)
+
+
+class CompressionMiddleware:
+    """Negotiated Brotli/gzip compression for dynamic responses of at least minimum_size bytes.
+
+    Streaming bodies are compressed chunk by chunk. Responses that already carry a Content-Encoding (such as
+    precompressed static files) or an excluded media type (PDF, ZIP, images) pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encodings = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        coding = encodings[0] if encodings else None
+        await self.app(scope, receive, _CompressionResponder(send, coding, self.minimum_size))
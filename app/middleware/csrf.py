@@ -1,59 +1,162 @@
 import secrets
+from http.cookies import SimpleCookie
 
-from starlette.middleware.base import BaseHTTPMiddleware
+from python_multipart.multipart import parse_options_header
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 COOKIE_NAME = "csrf_token"
 
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
 
-class CSRFMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, exempt_paths: list[str] | None = None):
-        super().__init__(app)
+FORM_TOKEN_FIELD = "_csrf_token"
+
+# Multipart bodies are never buffered whole; only this much is read looking for a leading token part
+MULTIPART_TOKEN_PREFIX_LIMIT = 8 * 1024
+
+
+def _csrf_cookie_header(token: str, secure: bool) -> str:
+    """Build the Set-Cookie value exactly as Response.set_cookie(COOKIE_NAME, token, samesite="lax") would."""
+    cookie: SimpleCookie = SimpleCookie()
+    cookie[COOKIE_NAME] = token
+    cookie[COOKIE_NAME]["path"] = "/"
+    cookie[COOKIE_NAME]["samesite"] = "lax"
+    if secure:
+        cookie[COOKIE_NAME]["secure"] = True
+    return cookie.output(header="").strip()
+
+
+def _tokens_match(candidate: bytes, cookie_token: str) -> bool:
+    """Constant-time comparison on bytes, so non-ASCII input is a mismatch rather than a TypeError."""
+    return secrets.compare_digest(candidate, cookie_token.encode())
+
+
+def _with_cookie(scope: Scope, token: str) -> Scope:
+    """Return a copy of scope whose Cookie header also carries the CSRF token."""
+    headers = MutableHeaders(raw=list(scope["headers"]))
+    existing = headers.get("cookie")
+    headers["cookie"] = f"{existing}; {COOKIE_NAME}={token}" if existing else f"{COOKIE_NAME}={token}"
+    return {**scope, "headers": headers.raw}
+
+
+class CSRFMiddleware:
+    """Double-submit cookie CSRF protection, written as plain ASGI so response bodies are never buffered."""
+
+    def __init__(self, app: ASGIApp, exempt_paths: list[str] | None = None):
+        self.app = app
         self.exempt_paths = set(exempt_paths or [])
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        if request.method in ("GET", "HEAD", "OPTIONS"):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
+
+        if scope["method"] in SAFE_METHODS:
             # Reuse existing token so templates can read it from the incoming cookie.
             # Only generate a new one if no cookie exists yet.
-            if not request.cookies.get(COOKIE_NAME):
+            token = request.cookies.get(COOKIE_NAME)
+            if not token:
                 token = secrets.token_urlsafe(32)
-                # Inject into request scope so templates see it via request.cookies
-                request._cookies[COOKIE_NAME] = token
-            else:
-                token = request.cookies[COOKIE_NAME]
-
-            response = await call_next(request)
-            response.set_cookie(
-                COOKIE_NAME,
-                token,
-                httponly=False,
-                samesite="lax",
-                secure=request.url.scheme == "https",
-            )
-            return response
-
-        if request.url.path in self.exempt_paths:
-            return await call_next(request)
+                # Add it to the Cookie header so templates see it via request.cookies
+                scope = _with_cookie(scope, token)
+            set_cookie = _csrf_cookie_header(token, secure=scope.get("scheme") == "https")
+
+            async def send_with_cookie(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append("set-cookie", set_cookie)
+                await send(message)
+
+            await self.app(scope, receive, send_with_cookie)
+            return
+
+        if scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
 
         cookie_token = request.cookies.get(COOKIE_NAME)
         if not cookie_token:
-            return JSONResponse({"error": "CSRF token missing"}, status_code=403)
+            await JSONResponse({"error": "CSRF token missing"}, status_code=403)(scope, receive, send)
+            return
 
         header_token = request.headers.get("X-CSRF-Token")
-        if header_token and secrets.compare_digest(header_token, cookie_token):
-            return await call_next(request)
+        # Starlette decodes header values as latin-1, so this recovers the raw bytes
+        if header_token and _tokens_match(header_token.encode("latin-1"), cookie_token):
+            await self.app(scope, receive, send)
+            return
 
         content_type = request.headers.get("content-type", "")
-        if "application/x-www-form-urlencoded" in content_type or "multipart/form-data" in content_type:
-            # Cache the body so downstream handlers (FastAPI Form()) can read it again
+        if "multipart/form-data" in content_type:
+            # Uploads: accept only a token sent as the first part, then stream the body on untouched
+            form_token, consumed = await _leading_multipart_token(content_type, receive)
+            if form_token and _tokens_match(form_token, cookie_token):
+                await self.app(scope, _replay_messages(consumed, receive), send)
+                return
+        elif "application/x-www-form-urlencoded" in content_type:
             body = await request.body()
             form = await request.form()
-            form_token = form.get("_csrf_token")
+            form_token = form.get(FORM_TOKEN_FIELD)
             await form.close()
-            # Re-inject cached body so FastAPI can parse it again
-            request._body = body
-            if form_token and secrets.compare_digest(str(form_token), cookie_token):
-                return await call_next(request)
+            if form_token and _tokens_match(str(form_token).encode(), cookie_token):
+                # Replay the consumed body so downstream handlers (FastAPI Form()) can parse it again
+                body_message = {"type": "http.request", "body": body, "more_body": False}
+                await self.app(scope, _replay_messages([body_message], receive), send)
+                return
+
+        await JSONResponse({"error": "CSRF token mismatch"}, status_code=403)(scope, receive, send)
+
+
+async def _leading_multipart_token(content_type: str, receive: Receive) -> tuple[bytes | None, list[Message]]:
+    """Read just enough of a multipart body to extract a leading _csrf_token part.
+
+    Returns the raw token bytes (None if the first part is something else) and the messages consumed so far,
+    which must be replayed to the application.
+    """
+    _, options = parse_options_header(content_type)
+    boundary = options.get(b"boundary")
+    consumed: list[Message] = []
+    if not boundary:
+        return None, consumed
+
+    delimiter = b"--" + boundary
+    prefix = b""
+    more_body = True
+    while more_body and len(prefix) < MULTIPART_TOKEN_PREFIX_LIMIT:
+        message = await receive()
+        consumed.append(message)
+        if message["type"] != "http.request":
+            return None, consumed
+        prefix += message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if prefix.find(b"\r\n" + delimiter, len(delimiter)) != -1:
+            break
+
+    if not prefix.startswith(delimiter + b"\r\n"):
+        return None, consumed
+    headers_end = prefix.find(b"\r\n\r\n", len(delimiter))
+    value_end = prefix.find(b"\r\n" + delimiter, headers_end + 4)
+    if headers_end == -1 or value_end == -1:
+        return None, consumed
+
+    for line in prefix[len(delimiter) + 2 : headers_end].split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-disposition":
+            _, params = parse_options_header(value.strip())
+            if params.get(b"name") == FORM_TOKEN_FIELD.encode() and b"filename" not in params:
+                return prefix[headers_end + 4 : value_end], consumed
+    return None, consumed
+
+
+def _replay_messages(messages: list[Message], receive: Receive) -> Receive:
+    """Return a receive callable that yields the already consumed messages, then defers to the real receive."""
+    pending = list(messages)
+
+    async def replay() -> Message:
+        if pending:
+            return pending.pop(0)
+        return await receive()
 
-        return JSONResponse({"error": "CSRF token mismatch"}, status_code=403)
+    return replay
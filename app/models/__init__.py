@@ -1,6 +1,8 @@
 from app.models.appointment import Appointment
 from app.models.background_image_setting import BackgroundImageSetting
+from app.models.cache_version import CacheVersion
 from app.models.color_setting import ColorSetting
 from app.models.logo_setting import LogoSetting
+from app.models.maintenance_run import MaintenanceRun
 
-__all__ = ["Appointment", "BackgroundImageSetting", "ColorSetting", "LogoSetting"]
+__all__ = ["Appointment", "BackgroundImageSetting", "CacheVersion", "ColorSetting", "LogoSetting", "MaintenanceRun"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, DateTime, String, Text
 
 from app.database import Base
 
@@ -8,3 +8,5 @@ class Appointment(Base):
 
     id = Column(String, primary_key=True)
     additional_info = Column(Text, nullable=True)
+    # Naive UTC; refreshed when the info is saved, used to prune appointments nobody generates any more
+    updated_at = Column(DateTime, nullable=True, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, LargeBinary, String
+from sqlalchemy import Column, Integer, String
 
 from app.database import Base
 
@@ -7,5 +7,10 @@ class BackgroundImageSetting(Base):
     __tablename__ = "background_image_settings"
 
     setting_name = Column(String, primary_key=True)
-    image_data = Column(LargeBinary, nullable=False)
     image_filename = Column(String, nullable=False)
+    # SHA-256 hex digest of the image; the bytes live in the asset store under this name
+    image_hash = Column(String, nullable=False, index=True)
+    image_size = Column(Integer, nullable=False)
+    image_width = Column(Integer, nullable=True)
+    image_height = Column(Integer, nullable=True)
+    image_mime_type = Column(String, nullable=True)
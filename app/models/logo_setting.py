@@ -1,4 +1,4 @@
-from sqlalchemy import Column, LargeBinary, String
+from sqlalchemy import Column, Integer, String
 
 from app.database import Base
 
@@ -7,5 +7,10 @@ class LogoSetting(Base):
     __tablename__ = "logo_settings"
 
     setting_name = Column(String, primary_key=True)
-    logo_data = Column(LargeBinary, nullable=False)
     logo_filename = Column(String, nullable=False)
+    # SHA-256 hex digest of the image; the bytes live in the asset store under this name
+    logo_hash = Column(String, nullable=False, index=True)
+    logo_size = Column(Integer, nullable=False)
+    logo_width = Column(Integer, nullable=True)
+    logo_height = Column(Integer, nullable=True)
+    logo_mime_type = Column(String, nullable=True)
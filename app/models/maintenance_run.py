@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, String
+
+from app.database import Base
+
+
+class MaintenanceRun(Base):
+    """When a background job shared by all worker processes last ran, so only one of them runs it per interval."""
+
+    __tablename__ = "maintenance_runs"
+
+    name = Column(String, primary_key=True)
+    # Naive UTC, like appointments.updated_at; NULL until the first run is claimed
+    last_run_at = Column(DateTime, nullable=True)
@@ -0,0 +1,42 @@
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, status
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+
+# Per-user data: the browser may keep a copy but has to revalidate it on every use
+CONDITIONAL_JSON_CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison as required for If-None-Match, so W/ validators from compressed responses match too."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def json_etag(payload: Any) -> str:
+    """Strong ETag over the normalised payload (sorted keys, compact separators)."""
+    normalised = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return f'"{hashlib.sha256(normalised.encode()).hexdigest()[:32]}"'
+
+
+def conditional_json_response(request: Request, payload: Any) -> Response:
+    """JSONResponse with an ETag, or an empty 304 if the client already holds this payload."""
+    etag = json_etag(payload)
+    headers = {"ETag": etag, "Cache-Control": CONDITIONAL_JSON_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(payload, headers=headers)
+
+
+def conditional_html_response(request: Request, html: str) -> Response:
+    """HTMLResponse with an ETag over the rendered markup, or an empty 304 if the client already holds it."""
+    body = html.encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": CONDITIONAL_JSON_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return HTMLResponse(body, headers=headers)
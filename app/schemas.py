@@ -3,7 +3,7 @@ from typing import Dict, List, Literal
 
 from pydantic import BaseModel, computed_field, field_validator
 
-from app.utils import parse_iso_datetime
+from app.utils import format_iso_datetime
 
 _HEX_COLOR_RE = re.compile(r"^#[0-9A-Fa-f]{6}$")
 
@@ -27,17 +27,17 @@ class AppointmentData(BaseModel):
     @computed_field
     @property
     def start_date_view(self) -> str:
-        return parse_iso_datetime(self.start_date).strftime("%d.%m.%Y")
+        return format_iso_datetime(self.start_date).date
 
     @computed_field
     @property
     def start_time_view(self) -> str:
-        return parse_iso_datetime(self.start_date).strftime("%H:%M")
+        return format_iso_datetime(self.start_date).time
 
     @computed_field
     @property
     def end_time_view(self) -> str:
-        return parse_iso_datetime(self.end_date).strftime("%H:%M")
+        return format_iso_datetime(self.end_date).time
 
 
 class ColorSettings(BaseModel):
@@ -62,6 +62,17 @@ class ColorSettings(BaseModel):
         return v
 
 
+class ImageAssetInfo(BaseModel):
+    """Metadata of a stored logo or background image, available without loading the image bytes."""
+
+    filename: str
+    size: int
+    content_hash: str
+    mime_type: str
+    width: int | None = None
+    height: int | None = None
+
+
 class GenerateRequest(BaseModel):
     """JSON request body for PDF/JPEG generation."""
 
@@ -102,6 +113,9 @@ class EventSummary(BaseModel):
     services: list[EventService] = []
 
 
+ServicesGroupBy = Literal["event", "person", "service"]
+
+
 class AgendaItem(BaseModel):
     """A single item in an event's agenda (worship rundown)."""
 
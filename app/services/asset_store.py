@@ -0,0 +1,82 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+# Uploads are streamed into this subdirectory first, so moving them into the store is a same-filesystem rename
+STAGING_DIR_NAME = ".staging"
+
+
+class StagedAsset(NamedTuple):
+    """An upload written to the staging area whose size and hash are known but which is not yet stored."""
+
+    path: Path
+    size: int
+    content_hash: str
+
+
+def asset_path(content_hash: str) -> Path:
+    """Location of a stored asset, sharded by the first two hex digits of its SHA-256."""
+    return Path(settings.asset_dir) / content_hash[:2] / content_hash
+
+
+def store_asset(data: bytes, content_hash: str) -> Path:
+    """Write an asset under its content hash, skipping the write if identical bytes are already stored.
+
+    The file is written to a temporary name and renamed into place so readers never see a partial asset.
+    """
+    path = asset_path(content_hash)
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except OSError:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def read_asset(content_hash: str) -> bytes | None:
+    try:
+        return asset_path(content_hash).read_bytes()
+    except OSError as e:
+        logger.error(f"Asset {content_hash} could not be read: {e}")
+        return None
+
+
+def delete_asset(content_hash: str) -> None:
+    try:
+        asset_path(content_hash).unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Asset {content_hash} could not be deleted: {e}")
+
+
+def staging_dir() -> Path:
+    path = Path(settings.asset_dir) / STAGING_DIR_NAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def commit_staged_asset(staged: StagedAsset) -> Path:
+    """Move a staged upload into the store under its content hash, dropping it if the asset already exists."""
+    path = asset_path(staged.content_hash)
+    if path.exists():
+        staged.path.unlink(missing_ok=True)
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(staged.path, path)
+    return path
+
+
+def discard_staged_asset(staged: StagedAsset) -> None:
+    staged.path.unlink(missing_ok=True)
@@ -0,0 +1,289 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from app.config import Settings, settings
+
+logger = structlog.get_logger()
+
+# Every key is namespaced so a shared Redis database or cache file can hold other data too
+CACHE_KEY_PREFIX = "churchtools:"
+
+# Expired rows in the SQLite cache are purged on every Nth write
+SQLITE_CACHE_PURGE_EVERY = 100
+
+
+class CacheBackend(ABC):
+    """Key/value store with per-entry expiry.
+
+    Values are JSON-encoded bytes, unless the backend sets serialize = False and keeps Python objects as-is.
+    """
+
+    name: str
+
+    # Local backends answer from memory and are called directly; others run in a worker thread
+    is_local: bool = False
+
+    # Backends that never leave the process skip JSON round trips and hand back the stored object itself
+    serialize: bool = True
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self, prefix: str = "") -> None:
+        """Remove every entry whose key starts with prefix."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU cache of live Python objects; fastest, but each uvicorn worker holds its own copy."""
+
+    name = "memory"
+    is_local = True
+    serialize = False
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+
+class SqliteCacheBackend(CacheBackend):
+    """Cache in a local SQLite file, shared by all workers on the same host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA busy_timeout=5000")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl_seconds),
+            )
+            self._writes += 1
+            if self._writes % SQLITE_CACHE_PURGE_EVERY == 0:
+                self._connection.execute("DELETE FROM cache_entries WHERE expires_at < ?", (now,))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self, prefix: str = "") -> None:
+        # substr() instead of LIKE so "_" and "%" in keys are not treated as wildcards
+        with self._lock:
+            self._connection.execute("DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache in Redis (or any server speaking the Redis protocol), shared across hosts.
+
+    Requires the optional ``redis`` package unless a client object is passed in.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str | None = None, client: Any = None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package (pip install redis)") from e
+            client = redis.Redis.from_url(url)
+        self._client = client
+
+    def get(self, key: str) -> bytes | None:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._client.set(key, value, px=max(int(ttl_seconds * 1000), 1))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+    def clear(self, prefix: str = "") -> None:
+        keys = list(self._client.scan_iter(match=f"{prefix}*"))
+        if keys:
+            self._client.delete(*keys)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    errors: int = 0
+    operations: int = 0
+    total_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def average_latency_ms(self) -> float:
+        return self.total_seconds / self.operations * 1000 if self.operations else 0.0
+
+
+class Cache:
+    """Cache on top of a backend, with hit-rate and latency statistics.
+
+    Values are JSON-encoded for shared backends and stored as-is in the in-process memory backend, so callers
+    that check stores_objects can cache parsed objects without paying for a round trip on every hit.
+
+    Backend failures are logged and treated as misses, so an unreachable Redis only costs the cache.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.stats = CacheStats()
+
+    @property
+    def stores_objects(self) -> bool:
+        """True if values come back as the very objects that were stored (no JSON round trip)."""
+        return not self.backend.serialize
+
+    async def _call(self, method, *args):
+        started = time.perf_counter()
+        try:
+            if self.backend.is_local:
+                return method(*args)
+            return await asyncio.to_thread(method, *args)
+        finally:
+            self.stats.operations += 1
+            self.stats.total_seconds += time.perf_counter() - started
+
+    async def get(self, key: str) -> Any | None:
+        try:
+            raw = await self._call(self.backend.get, CACHE_KEY_PREFIX + key)
+            value = json.loads(raw) if raw is not None and self.backend.serialize else raw
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Cache lookup for {key} failed on {self.backend.name}: {e}")
+            value = None
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        try:
+            raw = json.dumps(value, separators=(",", ":")).encode() if self.backend.serialize else value
+            await self._call(self.backend.set, CACHE_KEY_PREFIX + key, raw, ttl_seconds)
+            self.stats.writes += 1
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Cache write for {key} failed on {self.backend.name}: {e}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self._call(self.backend.delete, CACHE_KEY_PREFIX + key)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Cache delete for {key} failed on {self.backend.name}: {e}")
+
+    async def clear(self, prefix: str = "") -> None:
+        try:
+            await self._call(self.backend.clear, CACHE_KEY_PREFIX + prefix)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Cache clear for {prefix}* failed on {self.backend.name}: {e}")
+
+    def stats_summary(self) -> dict:
+        return {
+            "backend": self.backend.name,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "writes": self.stats.writes,
+            "errors": self.stats.errors,
+            "hit_rate": round(self.stats.hit_rate, 4),
+            "average_latency_ms": round(self.stats.average_latency_ms, 3),
+        }
+
+
+def create_cache_backend(config: Settings = settings) -> CacheBackend:
+    if config.cache_backend == "sqlite":
+        return SqliteCacheBackend(config.cache_path)
+    if config.cache_backend == "redis":
+        return RedisCacheBackend(config.redis_url)
+    return MemoryCacheBackend(config.cache_max_entries)
+
+
+_cache: Cache | None = None
+
+
+def get_cache() -> Cache:
+    """Return the process-wide cache, creating the configured backend on first use."""
+    global _cache
+    if _cache is None:
+        _cache = Cache(create_cache_backend())
+    return _cache
+
+
+def configure_cache(cache: Cache | None) -> None:
+    """Replace the process-wide cache (e.g. with a fresh in-memory one in tests)."""
+    global _cache
+    _cache = cache
@@ -1,4 +1,7 @@
 import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import List
 
@@ -7,10 +10,63 @@ import structlog
 
 from app.config import settings
 from app.schemas import AgendaItem, AppointmentData, EventService, EventSummary
+from app.services.cache import get_cache
 from app.utils import parse_iso_datetime
 
 logger = structlog.get_logger()
 
+# Upper bound for parallel agenda requests to ChurchTools when fetching many events at once
+AGENDA_FETCH_CONCURRENCY = 5
+
+# Parsed agendas are cached per (login token, event) so repeat views and exports skip reparsing;
+# the in-process memory backend keeps the entries as objects, shared backends store them as JSON.
+# Entries with an ETag/Last-Modified validator are revalidated with a conditional request once they
+# are older than AGENDA_CACHE_REVALIDATE_SECONDS and kept for AGENDA_CACHE_RETAIN_SECONDS so the
+# validators can be reused; entries without validators are trusted for AGENDA_CACHE_TTL_SECONDS and
+# then downloaded again.
+AGENDA_CACHE_REVALIDATE_SECONDS = 30
+AGENDA_CACHE_TTL_SECONDS = 300
+AGENDA_CACHE_RETAIN_SECONDS = 24 * 60 * 60
+
+
+@dataclass
+class _AgendaCacheEntry:
+    items: list[AgendaItem]
+    checked_at: float  # wall-clock time, comparable across worker processes
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def is_fresh(self, now: float) -> bool:
+        max_age = AGENDA_CACHE_REVALIDATE_SECONDS if self.has_validators else AGENDA_CACHE_TTL_SECONDS
+        return now - self.checked_at <= max_age
+
+    def to_cache(self) -> dict:
+        return {
+            "items": [item.model_dump(mode="json") for item in self.items],
+            "checked_at": self.checked_at,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+    @classmethod
+    def from_cache(cls, data: dict) -> "_AgendaCacheEntry":
+        return cls(
+            items=[AgendaItem.model_validate(item) for item in data["items"]],
+            checked_at=data["checked_at"],
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+        )
+
+
+# Service definitions (id -> name) change rarely and are shared by all event lookups of one login.
+# They are cached per login token like agendas, since /api/services only returns what the user may see.
+SERVICE_NAMES_TTL_SECONDS = 600
+SERVICE_NAMES_CACHE_PREFIX = "service_names:"
+
 
 class AuthenticationError(Exception):
     """Raised when the ChurchTools API rejects the login token (401/403)."""
@@ -133,8 +189,25 @@ def _extract_person_name(person: dict | None) -> str | None:
     return person.get("title") or None
 
 
+def _token_digest(login_token: str) -> str:
+    # The token is hashed so it never lands in a shared cache in clear text
+    return hashlib.sha256(login_token.encode()).hexdigest()[:32]
+
+
 async def _fetch_service_names(login_token: str, client: httpx.AsyncClient) -> dict[int, str]:
-    """Fetch service definitions and return a {serviceId: name} lookup."""
+    """Fetch service definitions and return a {serviceId: name} lookup.
+
+    Successful lookups are cached per login token for SERVICE_NAMES_TTL_SECONDS.
+    """
+    cache = get_cache()
+    cache_key = SERVICE_NAMES_CACHE_PREFIX + _token_digest(login_token)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        if cache.stores_objects:
+            return cached
+        # Serialised as [id, name] pairs because JSON object keys cannot be integers
+        return {service_id: name for service_id, name in cached}
+
     url = f"{settings.churchtools_base_url}/api/services"
     response = await client.get(url, headers=_auth_headers(login_token))
     if response.status_code in (401, 403):
@@ -142,7 +215,34 @@ async def _fetch_service_names(login_token: str, client: httpx.AsyncClient) -> d
     if response.status_code != 200:
         logger.warning(f"Failed to fetch services: HTTP {response.status_code}")
         return {}
-    return {svc["id"]: svc.get("name", "") for svc in response.json().get("data", [])}
+    service_names = {svc["id"]: svc.get("name", "") for svc in response.json().get("data", [])}
+    value = service_names if cache.stores_objects else list(service_names.items())
+    await cache.set(cache_key, value, SERVICE_NAMES_TTL_SECONDS)
+    return service_names
+
+
+def _parse_event(item: dict, service_names: dict[int, str]) -> EventSummary:
+    """Convert a raw API event (fetched with include=eventServices) to an EventSummary."""
+    services = []
+    for svc in item.get("eventServices", []):
+        service_id = svc.get("serviceId", svc.get("id", 0))
+        services.append(
+            EventService(
+                service_id=service_id,
+                name=service_names.get(service_id, ""),
+                person_name=_extract_person_name(svc.get("person")),
+                is_accepted=svc.get("isAccepted", False),
+            )
+        )
+
+    return EventSummary(
+        id=item["id"],
+        name=item.get("name", ""),
+        start_date=item.get("startDate", ""),
+        end_date=item.get("endDate", ""),
+        calendar_name=item.get("calendar", {}).get("title", ""),
+        services=services,
+    )
 
 
 async def fetch_events(
@@ -172,34 +272,60 @@ async def fetch_events(
     for item in events_response.json().get("data", []):
         if item.get("isCanceled", False):
             continue
-        cal = item.get("calendar", {})
-        if cal.get("domainIdentifier") not in calendar_ids_set:
+        if item.get("calendar", {}).get("domainIdentifier") not in calendar_ids_set:
             continue
+        events.append(_parse_event(item, service_names))
 
-        services = []
-        for svc in item.get("eventServices", []):
-            service_id = svc.get("serviceId", svc.get("id", 0))
-            services.append(
-                EventService(
-                    service_id=service_id,
-                    name=service_names.get(service_id, ""),
-                    person_name=_extract_person_name(svc.get("person")),
-                    is_accepted=svc.get("isAccepted", False),
-                )
-            )
+    return events
 
-        events.append(
-            EventSummary(
-                id=item["id"],
-                name=item.get("name", ""),
-                start_date=item.get("startDate", ""),
-                end_date=item.get("endDate", ""),
-                calendar_name=cal.get("title", ""),
-                services=services,
-            )
-        )
 
-    return events
+async def fetch_event(login_token: str, event_id: int, client: httpx.AsyncClient) -> EventSummary | None:
+    """Fetch a single event with its service assignments. Returns None if the event does not exist (404)."""
+    event_url = f"{settings.churchtools_base_url}/api/events/{event_id}"
+
+    event_response, service_names = await asyncio.gather(
+        client.get(event_url, headers=_auth_headers(login_token), params={"include": "eventServices"}),
+        _fetch_service_names(login_token, client),
+    )
+
+    if event_response.status_code == 404:
+        return None
+    if event_response.status_code in (401, 403):
+        raise AuthenticationError("Login token is invalid or expired")
+    event_response.raise_for_status()
+
+    return _parse_event(event_response.json().get("data", {}), service_names)
+
+
+def _agenda_cache_key(login_token: str, event_id: int) -> str:
+    return f"agenda:{_token_digest(login_token)}:{event_id}"
+
+
+async def forget_login_token(login_token: str) -> None:
+    """Drop the agendas and service names cached for a login token, e.g. when the user logs out."""
+    token_digest = _token_digest(login_token)
+    await get_cache().delete(SERVICE_NAMES_CACHE_PREFIX + token_digest)
+    await get_cache().clear(f"agenda:{token_digest}:")
+
+
+async def _load_cached_agenda(key: str) -> _AgendaCacheEntry | None:
+    cache = get_cache()
+    data = await cache.get(key)
+    if data is None:
+        return None
+    if cache.stores_objects:
+        return data
+    try:
+        return _AgendaCacheEntry.from_cache(data)
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cached agenda {key}: {e}")
+        return None
+
+
+async def _store_cached_agenda(key: str, entry: _AgendaCacheEntry) -> None:
+    ttl = AGENDA_CACHE_RETAIN_SECONDS if entry.has_validators else AGENDA_CACHE_TTL_SECONDS
+    cache = get_cache()
+    await cache.set(key, entry if cache.stores_objects else entry.to_cache(), ttl)
 
 
 async def fetch_agenda(
@@ -207,17 +333,74 @@ async def fetch_agenda(
     event_id: int,
     client: httpx.AsyncClient,
 ) -> list[AgendaItem]:
-    """Fetch the agenda for an event. Returns empty list if no agenda exists (404)."""
+    """Fetch the agenda for an event. Returns empty list if no agenda exists (404).
+
+    Parsed agendas are cached per login token and event and revalidated with
+    If-None-Match/If-Modified-Since when ChurchTools supplies validators.
+    """
+    cache_key = _agenda_cache_key(login_token, event_id)
+    entry = await _load_cached_agenda(cache_key)
+    if entry is not None and entry.is_fresh(time.time()):
+        return entry.items
+
+    entry = await _download_agenda(login_token, event_id, client, entry)
+    await _store_cached_agenda(cache_key, entry)
+    return entry.items
+
+
+async def fetch_agendas(
+    login_token: str,
+    event_ids: list[int],
+    client: httpx.AsyncClient,
+) -> dict[int, list[AgendaItem]]:
+    """Fetch agendas for many events concurrently, at most AGENDA_FETCH_CONCURRENCY at a time."""
+    semaphore = asyncio.Semaphore(AGENDA_FETCH_CONCURRENCY)
+    unique_ids = list(dict.fromkeys(event_ids))
+
+    async def _fetch_one(event_id: int) -> list[AgendaItem]:
+        async with semaphore:
+            return await fetch_agenda(login_token, event_id, client)
+
+    results = await asyncio.gather(*(_fetch_one(event_id) for event_id in unique_ids))
+    return dict(zip(unique_ids, results))
+
+
+async def _download_agenda(
+    login_token: str,
+    event_id: int,
+    client: httpx.AsyncClient,
+    cached: _AgendaCacheEntry | None = None,
+) -> _AgendaCacheEntry:
+    """Download (or revalidate) an agenda and return the resulting cache entry."""
     url = f"{settings.churchtools_base_url}/api/events/{event_id}/agenda"
-    response = await client.get(url, headers=_auth_headers(login_token))
+    headers = _auth_headers(login_token)
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
 
+    response = await client.get(url, headers=headers)
+
+    if response.status_code == 304 and cached is not None:
+        cached.checked_at = time.time()
+        return cached
     if response.status_code == 404:
-        return []
+        return _AgendaCacheEntry(items=[], checked_at=time.time())
     if response.status_code in (401, 403):
         raise AuthenticationError("Login token is invalid or expired")
     response.raise_for_status()
 
-    data = response.json().get("data", {})
+    return _AgendaCacheEntry(
+        items=_parse_agenda(response.json().get("data", {})),
+        checked_at=time.time(),
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+
+
+def _parse_agenda(data: dict) -> list[AgendaItem]:
+    """Convert the raw agenda payload into AgendaItem models."""
     items = []
     for raw_item in data.get("items", []):
         item_type = raw_item.get("type", "default")
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import timedelta
+from typing import NamedTuple
+
+import structlog
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import claim_compaction_run, delete_stale_additional_infos
+from app.database import SessionLocal, engine, run_db
+
+logger = structlog.get_logger()
+
+# PRAGMA auto_vacuum value for INCREMENTAL mode
+SQLITE_AUTO_VACUUM_INCREMENTAL = 2
+
+# The first run waits this long so startup (and a rolling restart of all workers) is not slowed by it
+COMPACTION_STARTUP_DELAY = timedelta(minutes=10)
+
+
+class CompactionResult(NamedTuple):
+    rows_removed: int
+    bytes_reclaimed: int
+
+
+def _database_size(cursor) -> int:
+    page_count = cursor.execute("PRAGMA page_count").fetchone()[0]
+    page_size = cursor.execute("PRAGMA page_size").fetchone()[0]
+    return page_count * page_size
+
+
+def reclaim_free_pages(db_engine: Engine = engine) -> int:
+    """Return free pages to the filesystem with an incremental VACUUM and report the bytes reclaimed.
+
+    Databases not yet in incremental auto-vacuum mode are left alone: the one-time conversion needs a full
+    VACUUM under an exclusive lock, which migration 005 performs before the app starts.
+    """
+    connection = db_engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if cursor.execute("PRAGMA auto_vacuum").fetchone()[0] != SQLITE_AUTO_VACUUM_INCREMENTAL:
+            logger.warning("Skipping incremental VACUUM: database is not in auto_vacuum=INCREMENTAL mode")
+            cursor.close()
+            return 0
+        size_before = _database_size(cursor)
+        # Each step of the pragma frees one page, so it must be drained
+        cursor.execute("PRAGMA incremental_vacuum").fetchall()
+        size_after = _database_size(cursor)
+        cursor.close()
+    finally:
+        connection.close()
+    return max(size_before - size_after, 0)
+
+
+def compact_appointments(
+    retention: timedelta, session_factory: sessionmaker = SessionLocal, db_engine: Engine = engine
+) -> CompactionResult:
+    """Delete additional infos older than the retention period, then reclaim the freed space."""
+    db = session_factory()
+    try:
+        rows_removed = delete_stale_additional_infos(db, retention)
+    finally:
+        db.close()
+
+    bytes_reclaimed = reclaim_free_pages(db_engine) if db_engine.dialect.name == "sqlite" else 0
+    logger.info(f"Compaction removed {rows_removed} stale appointments and reclaimed {bytes_reclaimed} bytes")
+    return CompactionResult(rows_removed, bytes_reclaimed)
+
+
+def compact_appointments_if_due(
+    interval: timedelta,
+    retention: timedelta,
+    session_factory: sessionmaker = SessionLocal,
+    db_engine: Engine = engine,
+) -> CompactionResult | None:
+    """Compact unless another worker already did within interval; returns None when skipped."""
+    db = session_factory()
+    try:
+        claimed = claim_compaction_run(db, interval)
+    finally:
+        db.close()
+    if not claimed:
+        logger.debug("Compaction skipped: another worker ran it recently")
+        return None
+    return compact_appointments(retention, session_factory, db_engine)
+
+
+async def run_periodic_compaction(
+    interval: timedelta, retention: timedelta, startup_delay: timedelta = COMPACTION_STARTUP_DELAY
+) -> None:
+    """Compact after startup_delay and then every interval until cancelled; a failed run is logged and retried later.
+
+    Every worker runs this loop, but a marker in maintenance_runs lets only one of them compact per interval.
+    """
+    await asyncio.sleep(startup_delay.total_seconds())
+    while True:
+        try:
+            await run_db(compact_appointments_if_due, interval, retention)
+        except Exception as e:
+            logger.error(f"Compaction failed: {e}")
+        await asyncio.sleep(interval.total_seconds())
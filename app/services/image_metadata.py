@@ -0,0 +1,64 @@
+import hashlib
+from io import BytesIO
+from typing import BinaryIO
+
+import structlog
+from PIL import Image
+
+from app.schemas import ImageAssetInfo
+from app.services.asset_store import StagedAsset
+
+logger = structlog.get_logger()
+
+MEDIA_TYPES = {"png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg", "svg": "image/svg+xml"}
+DEFAULT_MEDIA_TYPE = "image/png"
+
+
+def guess_media_type(filename: str | None) -> str:
+    """Map an upload filename to a media type by extension, defaulting to PNG."""
+    if not filename or "." not in filename:
+        return DEFAULT_MEDIA_TYPE
+    return MEDIA_TYPES.get(filename.rsplit(".", 1)[-1].lower(), DEFAULT_MEDIA_TYPE)
+
+
+def _image_details(source: BinaryIO | str, filename: str) -> tuple[int | None, int | None, str]:
+    """Read width, height and media type from the image header; formats PIL cannot open (e.g. SVG)
+    keep width/height unset and fall back to the filename for the media type."""
+    width = height = None
+    mime_type = None
+    try:
+        with Image.open(source) as image:
+            width, height = image.size
+            mime_type = Image.MIME.get(image.format)
+    except Exception as e:
+        logger.info(f"Could not read image metadata for {filename}: {e}")
+    return width, height, mime_type or guess_media_type(filename)
+
+
+def describe_image(data: bytes, filename: str) -> ImageAssetInfo:
+    """Compute size, SHA-256, dimensions and media type for an uploaded image.
+
+    Dimensions are read from the image header only.
+    """
+    width, height, mime_type = _image_details(BytesIO(data), filename)
+    return ImageAssetInfo(
+        filename=filename,
+        size=len(data),
+        content_hash=hashlib.sha256(data).hexdigest(),
+        mime_type=mime_type,
+        width=width,
+        height=height,
+    )
+
+
+def describe_staged_image(staged: StagedAsset, filename: str) -> ImageAssetInfo:
+    """Like describe_image, for an upload already on disk; size and hash were computed while streaming."""
+    width, height, mime_type = _image_details(str(staged.path), filename)
+    return ImageAssetInfo(
+        filename=filename,
+        size=staged.size,
+        content_hash=staged.content_hash,
+        mime_type=mime_type,
+        width=width,
+        height=height,
+    )
@@ -1,8 +1,9 @@
 import io
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple
 
 import structlog
-from babel.dates import format_date
 from PIL import Image, ImageColor
 from reportlab.lib import colors
 from reportlab.lib.colors import HexColor, black
@@ -13,10 +14,10 @@ from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
-from app.schemas import AgendaItem, AppointmentData, EventSummary
-from app.utils import normalize_newlines, parse_iso_datetime
+from app.schemas import AgendaItem, AppointmentData, EventSummary, ServicesGroupBy
+from app.utils import format_iso_datetime, normalize_newlines
 
 logger = structlog.get_logger()
 
@@ -94,6 +95,95 @@ def _register_fonts():
     return _cached_fonts
 
 
+# Shared table palette for the A4 agenda and Dienstplan exports
+TABLE_HEADER_COLOR = colors.HexColor("#5E8B5A")
+TABLE_GRID_COLOR = colors.HexColor("#D8DDD0")
+TABLE_ALT_ROW_COLOR = colors.HexColor("#FAFBF8")
+AGENDA_SECTION_BACKGROUND = colors.HexColor("#F0F3ED")
+
+
+class DocumentStyles(NamedTuple):
+    """Pre-built paragraph and table styles for the A4 agenda and Dienstplan PDFs.
+
+    Built once per font pair and shared between requests — treat as read-only.
+    """
+
+    agenda_title: ParagraphStyle
+    agenda_subtitle: ParagraphStyle
+    agenda_cell: ParagraphStyle
+    agenda_section: ParagraphStyle
+    agenda_table: TableStyle
+    services_title: ParagraphStyle
+    services_cell: ParagraphStyle
+    services_event_header: ParagraphStyle
+    services_table: TableStyle
+
+
+def _table_style(font_name_bold: str, *extra) -> TableStyle:
+    return TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, 0), TABLE_HEADER_COLOR),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
+            ("FONTSIZE", (0, 0), (-1, -1), 9),
+            *extra,
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("GRID", (0, 0), (-1, -1), 0.5, TABLE_GRID_COLOR),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, TABLE_ALT_ROW_COLOR]),
+            ("TOPPADDING", (0, 0), (-1, -1), 4),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+        ]
+    )
+
+
+@lru_cache(maxsize=None)
+def _build_document_styles(font_name: str, font_name_bold: str) -> DocumentStyles:
+    sample = getSampleStyleSheet()
+    return DocumentStyles(
+        agenda_title=ParagraphStyle(
+            "AgendaTitle", parent=sample["Heading1"], fontName=font_name_bold, fontSize=16, spaceAfter=6
+        ),
+        agenda_subtitle=ParagraphStyle(
+            "AgendaSubtitle",
+            parent=sample["Normal"],
+            fontName=font_name,
+            fontSize=10,
+            textColor=colors.grey,
+            spaceAfter=12,
+        ),
+        agenda_cell=ParagraphStyle("AgendaCell", parent=sample["Normal"], fontName=font_name, fontSize=9, leading=12),
+        agenda_section=ParagraphStyle(
+            "AgendaSection",
+            parent=sample["Normal"],
+            fontName=font_name_bold,
+            fontSize=10,
+            leading=14,
+            textColor=TABLE_HEADER_COLOR,
+        ),
+        agenda_table=_table_style(font_name_bold, ("ALIGN", (0, 0), (0, -1), "LEFT")),
+        services_title=ParagraphStyle(
+            "ServicesTitle", parent=sample["Heading1"], fontName=font_name_bold, fontSize=16, spaceAfter=6
+        ),
+        services_cell=ParagraphStyle(
+            "ServicesCell", parent=sample["Normal"], fontName=font_name, fontSize=9, leading=12
+        ),
+        services_event_header=ParagraphStyle(
+            "ServicesEventHeader", parent=sample["Normal"], fontName=font_name_bold, fontSize=10, leading=14
+        ),
+        services_table=_table_style(font_name_bold),
+    )
+
+
+def get_document_styles() -> DocumentStyles:
+    """Return the shared style registry for the currently registered font pair."""
+    return _build_document_styles(*_register_fonts())
+
+
+def warm_up_pdf_styles() -> None:
+    """Register fonts and build the style registry ahead of the first request."""
+    get_document_styles()
+
+
 def draw_background_image(canvas, image_stream, page_width, page_height):
     if image_stream is None:
         return
@@ -307,16 +397,15 @@ def _draw_event(
     c.setFillColor(HexColor(date_color))
     c.setFont(font_name_bold, font_size_large)
 
-    start_dt = parse_iso_datetime(event.start_date)
-    end_dt = parse_iso_datetime(event.end_date)
-    german_day_of_week = format_date(start_dt, format="EEEE", locale="de_DE")
-    day_date_str = f"{german_day_of_week}, {start_dt.strftime('%d.%m.%Y')}"
+    start = format_iso_datetime(event.start_date)
+    end = format_iso_datetime(event.end_date)
+    day_date_str = f"{start.weekday}, {start.date}"
     c.drawString(LEFT_COLUMN_X + INDENT, text_y_position - line_height_large, day_date_str)
 
     # Time
     c.setFillColor(HexColor(description_color))
     c.setFont(font_name, font_size_medium)
-    time_str = f"{start_dt.strftime('%H:%M')} - {end_dt.strftime('%H:%M')} Uhr"
+    time_str = f"{start.time} - {end.time} Uhr"
     c.drawString(LEFT_COLUMN_X + INDENT, text_y_position - line_height_large - line_height_medium, time_str)
 
     # MeetingAt (wrapped to left column width)
@@ -387,54 +476,28 @@ def create_pdf(
     return buffer.getvalue()
 
 
-def create_agenda_pdf(event_name: str, event_start: str, agenda_items: list[AgendaItem]) -> bytes:
-    """Create a tabular A4 PDF for a worship service agenda."""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buffer, pagesize=A4, topMargin=20 * mm, bottomMargin=15 * mm, leftMargin=15 * mm, rightMargin=15 * mm
-    )
-
-    font_name, font_name_bold = _register_fonts()
-    styles = getSampleStyleSheet()
-
-    title_style = ParagraphStyle(
-        "AgendaTitle", parent=styles["Heading1"], fontName=font_name_bold, fontSize=16, spaceAfter=6
-    )
-    subtitle_style = ParagraphStyle(
-        "AgendaSubtitle", parent=styles["Normal"], fontName=font_name, fontSize=10, textColor=colors.grey, spaceAfter=12
-    )
-    cell_style = ParagraphStyle("AgendaCell", parent=styles["Normal"], fontName=font_name, fontSize=9, leading=12)
-    section_style = ParagraphStyle(
-        "AgendaSection",
-        parent=styles["Normal"],
-        fontName=font_name_bold,
-        fontSize=10,
-        leading=14,
-        textColor=colors.HexColor("#5E8B5A"),
-    )
-
-    start_dt = parse_iso_datetime(event_start)
-    date_str = start_dt.strftime("%d.%m.%Y")
+def _agenda_elements(event_name: str, event_start: str, agenda_items: list[AgendaItem], styles: DocumentStyles):
+    """Build the title, date line and agenda table flowables for a single event."""
+    date_str = format_iso_datetime(event_start).date
 
     elements = []
-    elements.append(Paragraph(f"Agenda — {event_name}", title_style))
-    elements.append(Paragraph(date_str, subtitle_style))
+    elements.append(Paragraph(f"Agenda — {event_name}", styles.agenda_title))
+    elements.append(Paragraph(date_str, styles.agenda_subtitle))
 
     table_data = [["Zeit", "Titel", "Dauer", "Verantwortlich", "Notiz"]]
     row_styles = []
 
     for item in agenda_items:
         if item.type == "header":
-            table_data.append([Paragraph(item.title, section_style), "", "", "", ""])
+            table_data.append([Paragraph(item.title, styles.agenda_section), "", "", "", ""])
             row_idx = len(table_data) - 1
             row_styles.append(("SPAN", (0, row_idx), (4, row_idx)))
-            row_styles.append(("BACKGROUND", (0, row_idx), (4, row_idx), colors.HexColor("#F0F3ED")))
+            row_styles.append(("BACKGROUND", (0, row_idx), (4, row_idx), AGENDA_SECTION_BACKGROUND))
             continue
 
         time_str = ""
         if item.start:
-            dt = parse_iso_datetime(item.start)
-            time_str = dt.strftime("%H:%M")
+            time_str = format_iso_datetime(item.start).time
 
         title = item.title
         if item.type == "song" and item.song_key:
@@ -444,11 +507,11 @@ def create_agenda_pdf(event_name: str, event_start: str, agenda_items: list[Agen
 
         table_data.append(
             [
-                Paragraph(time_str, cell_style),
-                Paragraph(title.replace("\n", "<br/>"), cell_style),
-                Paragraph(item.duration_display, cell_style),
-                Paragraph(", ".join(item.responsible_names) if item.responsible_names else "", cell_style),
-                Paragraph(item.note or "", cell_style),
+                Paragraph(time_str, styles.agenda_cell),
+                Paragraph(title.replace("\n", "<br/>"), styles.agenda_cell),
+                Paragraph(item.duration_display, styles.agenda_cell),
+                Paragraph(", ".join(item.responsible_names) if item.responsible_names else "", styles.agenda_cell),
+                Paragraph(item.note or "", styles.agenda_cell),
             ]
         )
 
@@ -459,92 +522,146 @@ def create_agenda_pdf(event_name: str, event_start: str, agenda_items: list[Agen
         col_widths[-1] = available - fixed
 
         table = Table(table_data, colWidths=col_widths, repeatRows=1)
-        base_style = [
-            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#5E8B5A")),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-            ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
-            ("FONTSIZE", (0, 0), (-1, -1), 9),
-            ("ALIGN", (0, 0), (0, -1), "LEFT"),
-            ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#D8DDD0")),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#FAFBF8")]),
-            ("TOPPADDING", (0, 0), (-1, -1), 4),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-        ]
-        base_style.extend(row_styles)
-        table.setStyle(TableStyle(base_style))
+        table.setStyle(styles.agenda_table)
+        if row_styles:
+            table.setStyle(row_styles)
         elements.append(table)
 
-    doc.build(elements)
-    return buffer.getvalue()
+    return elements
+
+
+def create_agenda_pdf(event_name: str, event_start: str, agenda_items: list[AgendaItem]) -> bytes:
+    """Create a tabular A4 PDF for a worship service agenda."""
+    return create_agendas_pdf([(event_name, event_start, agenda_items)])
+
 
+def create_agendas_pdf(agendas: list[tuple[str, str, list[AgendaItem]]]) -> bytes:
+    """Create one A4 PDF with an agenda per event, each starting on a new page.
 
-def create_services_pdf(date_range: str, events: list[EventSummary]) -> bytes:
-    """Create a tabular A4 PDF for service assignments across events."""
+    ``agendas`` holds ``(event_name, event_start, agenda_items)`` tuples in output order.
+    """
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(
         buffer, pagesize=A4, topMargin=20 * mm, bottomMargin=15 * mm, leftMargin=15 * mm, rightMargin=15 * mm
     )
 
-    font_name, font_name_bold = _register_fonts()
-    styles = getSampleStyleSheet()
+    styles = get_document_styles()
 
-    title_style = ParagraphStyle(
-        "ServicesTitle", parent=styles["Heading1"], fontName=font_name_bold, fontSize=16, spaceAfter=6
-    )
-    cell_style = ParagraphStyle("ServicesCell", parent=styles["Normal"], fontName=font_name, fontSize=9, leading=12)
-    event_header_style = ParagraphStyle(
-        "ServicesEventHeader", parent=styles["Normal"], fontName=font_name_bold, fontSize=10, leading=14
-    )
+    elements = []
+    for event_name, event_start, agenda_items in agendas:
+        if elements:
+            elements.append(PageBreak())
+        elements.extend(_agenda_elements(event_name, event_start, agenda_items, styles))
+
+    if not elements:
+        elements.append(Paragraph("Keine Agenden vorhanden", styles.agenda_subtitle))
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+OPEN_SERVICE_LABEL = "-- (offen)"
+
+
+def _service_status(svc) -> str:
+    return "Ja" if svc.is_accepted else "?"
 
+
+def _services_by_event(events: list[EventSummary], styles: DocumentStyles) -> list:
     elements = []
-    elements.append(Paragraph(f"Dienstplan — {date_range}", title_style))
-    elements.append(Spacer(1, 6))
+    available = A4[0] - 30 * mm
+    col_widths = [available * 0.35, available * 0.45, available * 0.20]
 
     for event in events:
-        start_dt = parse_iso_datetime(event.start_date)
-        event_label = f"{start_dt.strftime('%d.%m.%Y %H:%M')} — {event.name}"
-        elements.append(Paragraph(event_label, event_header_style))
+        start = format_iso_datetime(event.start_date)
+        event_label = f"{start.date} {start.time} — {event.name}"
+        elements.append(Paragraph(event_label, styles.services_event_header))
         elements.append(Spacer(1, 4))
 
         if not event.services:
-            elements.append(Paragraph("Keine Dienste eingetragen", cell_style))
+            elements.append(Paragraph("Keine Dienste eingetragen", styles.services_cell))
             elements.append(Spacer(1, 10))
             continue
 
         table_data = [["Dienst", "Person", "Status"]]
         for svc in event.services:
-            person = svc.person_name or "-- (offen)"
-            status_str = "Ja" if svc.is_accepted else "?"
             table_data.append(
                 [
-                    Paragraph(svc.name, cell_style),
-                    Paragraph(person, cell_style),
-                    Paragraph(status_str, cell_style),
+                    Paragraph(svc.name, styles.services_cell),
+                    Paragraph(svc.person_name or OPEN_SERVICE_LABEL, styles.services_cell),
+                    Paragraph(_service_status(svc), styles.services_cell),
                 ]
             )
 
-        available = A4[0] - 30 * mm
-        col_widths = [available * 0.35, available * 0.45, available * 0.20]
+        table = Table(table_data, colWidths=col_widths, repeatRows=1)
+        table.setStyle(styles.services_table)
+        elements.append(table)
+        elements.append(Spacer(1, 14))
+
+    return elements
+
+
+def _services_grouped(events: list[EventSummary], group_by: ServicesGroupBy, styles: DocumentStyles) -> list:
+    """Regroup service slots across all events by person or by service name."""
+    groups: dict[str, list] = {}
+    for event in events:
+        start = format_iso_datetime(event.start_date)
+        when = f"{start.date} {start.time}"
+        for svc in event.services:
+            if group_by == "person":
+                key, other = svc.person_name or OPEN_SERVICE_LABEL, svc.name
+            else:
+                key, other = svc.name, svc.person_name or OPEN_SERVICE_LABEL
+            groups.setdefault(key, []).append((when, event.name, other, _service_status(svc)))
+
+    if not groups:
+        return [Paragraph("Keine Dienste eingetragen", styles.services_cell)]
+
+    other_header = "Dienst" if group_by == "person" else "Person"
+    available = A4[0] - 30 * mm
+    col_widths = [available * 0.22, available * 0.33, available * 0.33, available * 0.12]
+
+    # Alphabetical, with unassigned slots collected at the end
+    keys = sorted(groups, key=lambda k: (k == OPEN_SERVICE_LABEL, k.casefold()))
+
+    elements = []
+    for key in keys:
+        elements.append(Paragraph(key, styles.services_event_header))
+        elements.append(Spacer(1, 4))
+
+        table_data = [["Termin", "Event", other_header, "Status"]]
+        for row in groups[key]:
+            table_data.append([Paragraph(value, styles.services_cell) for value in row])
 
         table = Table(table_data, colWidths=col_widths, repeatRows=1)
-        table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#5E8B5A")),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                    ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
-                    ("FONTSIZE", (0, 0), (-1, -1), 9),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#D8DDD0")),
-                    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#FAFBF8")]),
-                    ("TOPPADDING", (0, 0), (-1, -1), 4),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-                ]
-            )
-        )
+        table.setStyle(styles.services_table)
         elements.append(table)
         elements.append(Spacer(1, 14))
 
+    return elements
+
+
+def create_services_pdf(date_range: str, events: list[EventSummary], group_by: ServicesGroupBy = "event") -> bytes:
+    """Create a tabular A4 PDF for service assignments across events.
+
+    By default there is one table per event; ``group_by="person"`` or ``"service"`` regroups
+    all service slots of the range into one table per person or per service instead.
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer, pagesize=A4, topMargin=20 * mm, bottomMargin=15 * mm, leftMargin=15 * mm, rightMargin=15 * mm
+    )
+
+    styles = get_document_styles()
+
+    elements = []
+    elements.append(Paragraph(f"Dienstplan — {date_range}", styles.services_title))
+    elements.append(Spacer(1, 6))
+
+    if group_by == "event":
+        elements.extend(_services_by_event(events, styles))
+    else:
+        elements.extend(_services_grouped(events, group_by, styles))
+
     doc.build(elements)
     return buffer.getvalue()
@@ -0,0 +1,131 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import structlog
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import Request
+
+from app.services.asset_store import StagedAsset, staging_dir
+
+logger = structlog.get_logger()
+
+# Room for multipart boundaries, part headers and small fields on top of the file itself
+MULTIPART_OVERHEAD_ALLOWANCE = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+class InvalidUploadError(Exception):
+    pass
+
+
+class _FilePartReceiver:
+    """Multipart parser callbacks that hash, size-check and collect the data of one file field."""
+
+    def __init__(self, field_name: str, max_size: int):
+        self.field_name = field_name
+        self.max_size = max_size
+        self.filename: str | None = None
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+        self.pending: list[bytes] = []
+        self._headers: dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._in_file = False
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        # Only the first part with the expected name and a filename is kept
+        if name == self.field_name and b"filename" in options and self.filename is None:
+            self.filename = options[b"filename"].decode("utf-8", errors="replace")
+            self._in_file = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._in_file:
+            return
+        self.size += end - start
+        if self.size > self.max_size:
+            raise UploadTooLargeError(f"Upload exceeds {self.max_size} bytes")
+        chunk = data[start:end]
+        self.sha256.update(chunk)
+        self.pending.append(chunk)
+
+    def on_part_end(self) -> None:
+        self._in_file = False
+
+    def take_pending(self) -> bytes:
+        data = b"".join(self.pending)
+        self.pending.clear()
+        return data
+
+
+async def stage_multipart_file(request: Request, field_name: str, max_size: int) -> tuple[StagedAsset, str]:
+    """Stream one file field of a multipart request into the asset staging area.
+
+    The body is parsed chunk by chunk as it arrives: the file data is hashed and written to a temporary
+    file, and the upload is aborted as soon as it exceeds max_size. Returns the staged asset and the
+    client's filename; the caller owns the staged file and must commit or discard it.
+    """
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_size + MULTIPART_OVERHEAD_ALLOWANCE:
+        raise UploadTooLargeError(f"Content-Length {content_length} exceeds {max_size} bytes")
+
+    _, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if not boundary:
+        raise InvalidUploadError("Kein Multipart-Upload")
+
+    receiver = _FilePartReceiver(field_name, max_size)
+    parser = MultipartParser(boundary, receiver.callbacks())
+    fd, tmp_name = tempfile.mkstemp(dir=staging_dir(), prefix="upload-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                data = receiver.take_pending()
+                if data:
+                    await asyncio.to_thread(f.write, data)
+            parser.finalize()
+        if receiver.filename is None:
+            raise InvalidUploadError("Keine Datei übermittelt")
+    except FormParserError as e:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise InvalidUploadError("Ungültiger Multipart-Upload") from e
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    logger.info(f"Staged upload {receiver.filename} ({receiver.size} bytes)")
+    return StagedAsset(Path(tmp_name), receiver.size, receiver.sha256.hexdigest()), receiver.filename
@@ -1,3 +1,24 @@
+from pathlib import Path
+
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+
+from app.staticfiles import static_url
 
 templates = Jinja2Templates(directory="app/templates")
+templates.env.globals["static_url"] = static_url
+
+
+def enable_template_bytecode_cache(directory: str) -> None:
+    """Persist compiled templates in directory so new workers load bytecode instead of compiling.
+
+    Cache entries are keyed by template name and source checksum, so edited templates are recompiled.
+    """
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    templates.env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def warm_up_templates() -> None:
+    """Load every template ahead of the first request (from the bytecode cache when enabled)."""
+    for name in templates.env.list_templates(extensions=["html"]):
+        templates.env.get_template(name)
@@ -98,6 +98,28 @@ function formatIso(date) {
     return y + '-' + m + '-' + d;
 }
 
+// --- Conditional JSON requests ---
+
+// Last body and ETag per URL; re-fetching unchanged data costs a 304 instead of the full payload
+var etagCache = {};
+
+function fetchWithEtag(url) {
+    var cached = etagCache[url];
+    var headers = cached ? { 'If-None-Match': cached.etag } : {};
+    // no-store keeps the browser cache out of the way, so a 304 always reaches this code
+    return fetch(url, { headers: headers, cache: 'no-store' }).then(function (res) {
+        if (res.status === 304 && cached) {
+            return new Response(cached.body, { status: 200, headers: { 'Content-Type': 'application/json' } });
+        }
+        var etag = res.headers.get('ETag');
+        if (!res.ok || !etag) return res;
+        return res.text().then(function (body) {
+            etagCache[url] = { etag: etag, body: body };
+            return new Response(body, { status: res.status, headers: { 'Content-Type': 'application/json' } });
+        });
+    });
+}
+
 // --- Appointment rendering ---
 
 function renderAppointments(appointments) {
@@ -190,7 +212,7 @@ function fetchAppointmentsAjax() {
         params.append('calendar_ids', id);
     });
 
-    fetch('/api/appointments?' + params.toString())
+    fetchWithEtag('/api/appointments?' + params.toString())
         .then(function (res) {
             if (res.status === 401) {
                 window.location.href = '/';
@@ -484,8 +506,8 @@ document.addEventListener('DOMContentLoaded', function () {
                 if (!res.ok) return res.text().then(function (t) { throw new Error('Upload fehlgeschlagen: ' + t); });
                 return res.json();
             })
-            .then(function () {
-                $('#logo-img').src = '/logo?' + Date.now();
+            .then(function (data) {
+                $('#logo-img').src = data.url || '/logo?' + Date.now();
                 $('#logo-preview').style.display = '';
                 $('#logo_delete').style.display = '';
                 hideButtonSpinner(btn);
@@ -528,8 +550,8 @@ document.addEventListener('DOMContentLoaded', function () {
                 if (!res.ok) return res.text().then(function (t) { throw new Error('Upload fehlgeschlagen: ' + t); });
                 return res.json();
             })
-            .then(function () {
-                $('#bg-img').src = '/background?' + Date.now();
+            .then(function (data) {
+                $('#bg-img').src = data.url || '/background?' + Date.now();
                 $('#bg-preview').style.display = '';
                 $('#bg_delete').style.display = '';
                 hideButtonSpinner(btn);
@@ -155,6 +155,13 @@ function renderAgendaEvents(events) {
 
     var html = '<div class="events-count">' + events.length + ' Event' + (events.length !== 1 ? 's' : '') + ' gefunden</div>';
 
+    // Combined PDF export (all agendas in the range)
+    html += '<div class="agenda-export">' +
+        '<a href="/api/agenda/pdf?' + buildEventParams().toString() + '" class="btn-export" download>' +
+            'Alle Agenden (PDF)' +
+        '</a>' +
+    '</div>';
+
     events.forEach(function (ev, i) {
         var delay = Math.min(i * 0.04, 0.8);
         html += '<div class="event-card" data-event-id="' + ev.id + '" data-event-name="' + escapeHtml(ev.name) + '" data-event-start="' + escapeHtml(ev.start_date) + '" style="animation-delay:' + delay + 's">' +
@@ -198,7 +205,49 @@ function toggleEventCard(card) {
     fetchAgenda(eventId, body, eventName, eventStart);
 }
 
+// Agendas prefetched in one batch request, keyed by event id (as string)
+var agendaCache = {};
+var agendaPrefetch = null;
+
+function prefetchAgendas(events) {
+    agendaCache = {};
+    if (!events || events.length === 0) {
+        agendaPrefetch = null;
+        return;
+    }
+
+    var params = new URLSearchParams();
+    events.forEach(function (ev) {
+        params.append('event_ids', ev.id);
+    });
+
+    agendaPrefetch = fetch('/api/agendas?' + params.toString())
+        .then(function (res) {
+            if (!res.ok) return null;
+            return res.json();
+        })
+        .then(function (data) {
+            if (data && data.agendas) agendaCache = data.agendas;
+        })
+        .catch(function () {
+            // Fall back to per-event requests in fetchAgenda
+        });
+}
+
 function fetchAgenda(eventId, bodyEl, eventName, eventStart) {
+    var pending = agendaPrefetch || Promise.resolve();
+    pending.then(function () {
+        var cached = agendaCache[String(eventId)];
+        if (cached) {
+            bodyEl.dataset.loaded = 'true';
+            renderAgendaTable(cached, bodyEl, eventId, eventName, eventStart);
+            return;
+        }
+        fetchSingleAgenda(eventId, bodyEl, eventName, eventStart);
+    });
+}
+
+function fetchSingleAgenda(eventId, bodyEl, eventName, eventStart) {
     fetch('/api/events/' + eventId + '/agenda')
         .then(function (res) {
             if (res.status === 401) {
@@ -326,6 +375,13 @@ function renderServicesTable(events) {
 
     var html = '<div class="events-count">' + events.length + ' Event' + (events.length !== 1 ? 's' : '') + ' gefunden</div>';
 
+    // Range-wide PDF export (one document for all events)
+    html += '<div class="services-range-export">' +
+        renderServicesRangeExportLink('event', 'Gesamter Zeitraum (PDF)') +
+        renderServicesRangeExportLink('person', 'Nach Person (PDF)') +
+        renderServicesRangeExportLink('service', 'Nach Dienst (PDF)') +
+    '</div>';
+
     html += '<div class="services-table-wrapper">' +
         '<table class="services-table">' +
         '<thead><tr>' +
@@ -373,9 +429,8 @@ function renderServicesTable(events) {
         }
 
         // Per-event PDF export button
-        var evPdfParams = buildEventParams();
+        var evPdfParams = new URLSearchParams();
         evPdfParams.append('event_name', ev.name);
-        evPdfParams.append('event_start', ev.start_date);
         html += '<tr class="services-export-row"><td colspan="4">' +
             '<a href="/api/events/' + ev.id + '/services/pdf?' + evPdfParams.toString() + '" class="btn-export" download>' +
                 'PDF herunterladen' +
@@ -388,6 +443,34 @@ function renderServicesTable(events) {
     container.innerHTML = html;
 }
 
+function renderServicesRangeExportLink(groupBy, label) {
+    var params = buildEventParams();
+    params.append('group_by', groupBy);
+    return '<a href="/api/services/pdf?' + params.toString() + '" class="btn-export" download>' + label + '</a>';
+}
+
+// --- Conditional JSON requests ---
+
+// Last body and ETag per URL; re-fetching unchanged data costs a 304 instead of the full payload
+var etagCache = {};
+
+function fetchWithEtag(url) {
+    var cached = etagCache[url];
+    var headers = cached ? { 'If-None-Match': cached.etag } : {};
+    // no-store keeps the browser cache out of the way, so a 304 always reaches this code
+    return fetch(url, { headers: headers, cache: 'no-store' }).then(function (res) {
+        if (res.status === 304 && cached) {
+            return new Response(cached.body, { status: 200, headers: { 'Content-Type': 'application/json' } });
+        }
+        var etag = res.headers.get('ETag');
+        if (!res.ok || !etag) return res;
+        return res.text().then(function (body) {
+            etagCache[url] = { etag: etag, body: body };
+            return new Response(body, { status: res.status, headers: { 'Content-Type': 'application/json' } });
+        });
+    });
+}
+
 // --- Load events (shared) ---
 
 function loadEvents() {
@@ -403,7 +486,7 @@ function loadEvents() {
 
     var params = buildEventParams();
 
-    fetch('/api/events?' + params.toString())
+    fetchWithEtag('/api/events?' + params.toString())
         .then(function (res) {
             if (res.status === 401) {
                 window.location.href = '/';
@@ -419,6 +502,7 @@ function loadEvents() {
                 renderServicesTable(data.events);
             } else {
                 renderAgendaEvents(data.events);
+                prefetchAgendas(data.events);
             }
             hideButtonSpinner(fetchBtn);
         })
@@ -0,0 +1,154 @@
+import hashlib
+import os
+from mimetypes import guess_type
+from pathlib import Path
+from typing import NamedTuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.middleware.compression import accepted_encodings
+
+STATIC_DIR = "app/static"
+STATIC_URL_PREFIX = "/static/"
+
+# Suffix of the precompressed variant written next to each static file by scripts/precompress_static.py
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# Hex digits of the content SHA-256 inserted into fingerprinted file names (app.3f9a0c1e2b4d.js)
+FINGERPRINT_LENGTH = 12
+FINGERPRINTED_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves a precompressed .br/.gz sibling when the client accepts that coding.
+
+    The variants are produced at build time, so no CPU is spent compressing static assets per request.
+    Files without a variant are served as-is (and may still be compressed by CompressionMiddleware).
+    """
+
+    def file_response(
+        self,
+        full_path: os.PathLike | str,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        for coding in accepted_encodings(request_headers.get("accept-encoding", "")):
+            variant = Path(f"{full_path}{PRECOMPRESSED_SUFFIXES[coding]}")
+            try:
+                variant_stat = variant.stat()
+            except OSError:
+                continue
+            # Ignore variants left over from an older version of the file
+            if variant_stat.st_mtime < stat_result.st_mtime:
+                continue
+            response = FileResponse(
+                variant,
+                status_code=status_code,
+                stat_result=variant_stat,
+                media_type=guess_type(str(full_path))[0] or "application/octet-stream",
+                headers={"Content-Encoding": coding, "Vary": "Accept-Encoding"},
+            )
+            not_modified = self.is_not_modified(response.headers, request_headers)
+            # Weak like the ETags CompressionMiddleware gives encoded responses, so its 304s stay consistent
+            response.headers["ETag"] = f"W/{response.headers['etag']}"
+            return NotModifiedResponse(response.headers) if not_modified else response
+
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+class _ManifestEntry(NamedTuple):
+    mtime_ns: int
+    size: int
+    hashed_path: str
+
+
+class StaticManifest:
+    """Maps static file paths to content-fingerprinted names and back.
+
+    Every file is hashed once at startup. Entries are re-hashed when a file's mtime or size changes,
+    so edits made while the server runs (e.g. during development) get a new URL instead of a stale cache hit.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+        self._entries: dict[str, _ManifestEntry] = {}
+        self._originals: dict[str, str] = {}
+        for path in sorted(self.directory.rglob("*")):
+            if path.is_file() and path.suffix not in PRECOMPRESSED_SUFFIXES.values():
+                self._fingerprint(path.relative_to(self.directory).as_posix(), path.stat())
+
+    def _fingerprint(self, path: str, stat_result: os.stat_result) -> _ManifestEntry:
+        digest = hashlib.sha256((self.directory / path).read_bytes()).hexdigest()[:FINGERPRINT_LENGTH]
+        directory, _, name = path.rpartition("/")
+        stem, dot, suffix = name.partition(".")
+        hashed_name = f"{stem}.{digest}{dot}{suffix}"
+        hashed_path = f"{directory}/{hashed_name}" if directory else hashed_name
+        entry = _ManifestEntry(stat_result.st_mtime_ns, stat_result.st_size, hashed_path)
+        self._entries[path] = entry
+        self._originals[hashed_path] = path
+        return entry
+
+    def hashed_path(self, path: str) -> str | None:
+        """Current fingerprinted name of a static file, or None if it does not exist."""
+        try:
+            stat_result = (self.directory / path).stat()
+        except OSError:
+            return None
+        entry = self._entries.get(path)
+        if entry is None or (entry.mtime_ns, entry.size) != (stat_result.st_mtime_ns, stat_result.st_size):
+            entry = self._fingerprint(path, stat_result)
+        return entry.hashed_path
+
+    def original_path(self, hashed_path: str) -> str | None:
+        return self._originals.get(hashed_path)
+
+    def url(self, path: str) -> str:
+        """URL for a static file; falls back to the plain path for files not in the manifest."""
+        path = path.lstrip("/")
+        return STATIC_URL_PREFIX + (self.hashed_path(path) or path)
+
+
+_manifest: StaticManifest | None = None
+
+
+def get_static_manifest() -> StaticManifest:
+    """Return the process-wide manifest of app/static, building it on first use."""
+    global _manifest
+    if _manifest is None:
+        _manifest = StaticManifest(STATIC_DIR)
+    return _manifest
+
+
+def static_url(path: str) -> str:
+    """Jinja global: fingerprinted URL of a file in app/static, e.g. static_url("js/events.js")."""
+    return get_static_manifest().url(path)
+
+
+class FingerprintedStaticFiles(PrecompressedStaticFiles):
+    """Serves fingerprinted names from the manifest with immutable caching.
+
+    The content hash in the name changes whenever the file does, so browsers never need to revalidate.
+    Plain names keep working and are revalidated as usual.
+    """
+
+    def __init__(self, *, manifest: StaticManifest | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        manifest = self.manifest or get_static_manifest()
+        original = manifest.original_path(Path(path).as_posix())
+        if original is None:
+            return await super().get_response(path, scope)
+        response = await super().get_response(original, scope)
+        # An outdated hash still resolves (e.g. a page rendered before a deploy) but must not be cached forever
+        if manifest.hashed_path(original) == Path(path).as_posix():
+            response.headers["Cache-Control"] = FINGERPRINTED_CACHE_CONTROL
+        return response
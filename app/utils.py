@@ -1,15 +1,36 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
 from zoneinfo import ZoneInfo
 
+from babel.dates import get_day_names
 
-def parse_iso_datetime(dt_str: str, tz: Optional[ZoneInfo] = None) -> datetime:
-    """Converts an ISO datetime string to a timezone-aware datetime."""
+# Bound for the datetime caches; a year of appointments across several calendars fits comfortably.
+DATETIME_CACHE_SIZE = 4096
+
+# German weekday names indexed by datetime.weekday() (Monday == 0), resolved once via babel.
+_GERMAN_WEEKDAYS = tuple(get_day_names("wide", locale="de_DE")[i] for i in range(7))
+
+
+class FormattedDateTime(NamedTuple):
+    """A parsed ISO datetime together with its precomputed German display strings."""
+
+    value: datetime
+    weekday: str  # e.g. "Sonntag"
+    date: str  # e.g. "22.03.2026"
+    time: str  # e.g. "10:00"
+
+
+def _resolve_timezone(tz: Optional[ZoneInfo]) -> ZoneInfo:
     if tz is None:
         from app.config import settings
 
-        tz = settings.timezone
+        return settings.timezone
+    return tz
 
+
+@lru_cache(maxsize=DATETIME_CACHE_SIZE)
+def _parse_iso_datetime_cached(dt_str: str, tz: ZoneInfo) -> datetime:
     if dt_str.endswith("Z"):
         dt = datetime.fromisoformat(dt_str.rstrip("Z"))
         utc_dt = dt.replace(tzinfo=timezone.utc)
@@ -19,6 +40,30 @@ def parse_iso_datetime(dt_str: str, tz: Optional[ZoneInfo] = None) -> datetime:
     return utc_dt.astimezone(tz)
 
 
+@lru_cache(maxsize=DATETIME_CACHE_SIZE)
+def _format_iso_datetime_cached(dt_str: str, tz: ZoneInfo) -> FormattedDateTime:
+    dt = _parse_iso_datetime_cached(dt_str, tz)
+    return FormattedDateTime(
+        value=dt,
+        weekday=_GERMAN_WEEKDAYS[dt.weekday()],
+        date=dt.strftime("%d.%m.%Y"),
+        time=dt.strftime("%H:%M"),
+    )
+
+
+def parse_iso_datetime(dt_str: str, tz: Optional[ZoneInfo] = None) -> datetime:
+    """Converts an ISO datetime string to a timezone-aware datetime.
+
+    Results are memoised per (string, timezone); datetimes are immutable so sharing them is safe.
+    """
+    return _parse_iso_datetime_cached(dt_str, _resolve_timezone(tz))
+
+
+def format_iso_datetime(dt_str: str, tz: Optional[ZoneInfo] = None) -> FormattedDateTime:
+    """Parses an ISO datetime string once and returns it with German weekday, date and time strings."""
+    return _format_iso_datetime_cached(dt_str, _resolve_timezone(tz))
+
+
 def get_date_range_from_form(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Tuple[str, str]:
     """
     Calculates a date range based on the provided values or uses default values.
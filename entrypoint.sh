@@ -6,14 +6,15 @@ DB_FILE="${DB_PATH:-/app/data/churchtools.db}"
 # Ensure data directory exists
 mkdir -p "$(dirname "$DB_FILE")"
 
-# If DB exists with app tables but no alembic_version, stamp it as current
+# If DB exists with app tables but no alembic_version, stamp it as the initial
+# schema (which is what untracked databases have) and let upgrade apply the rest
 if [ -f "$DB_FILE" ]; then
     HAS_APP_TABLES=$(sqlite3 "$DB_FILE" "SELECT name FROM sqlite_master WHERE type='table' AND name='color_settings'" 2>/dev/null || true)
     HAS_ALEMBIC=$(sqlite3 "$DB_FILE" "SELECT name FROM sqlite_master WHERE type='table' AND name='alembic_version'" 2>/dev/null || true)
 
     if [ -n "$HAS_APP_TABLES" ] && [ -z "$HAS_ALEMBIC" ]; then
-        echo "Existing database detected without alembic tracking. Stamping as current..."
-        alembic stamp head
+        echo "Existing database detected without alembic tracking. Stamping as initial schema..."
+        alembic stamp 001
     fi
 fi
 
@@ -0,0 +1,83 @@
+"""Compare payload sizes of a month of appointments sent raw, gzip- and Brotli-compressed.
+
+Builds a realistic month (several services, groups and events per week), renders it as the
+/api/appointments JSON and the /fragments/appointments HTML, and compresses both with the settings
+CompressionMiddleware uses on the fly.
+
+Usage: python scripts/benchmark_compression.py
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Allow imports from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.middleware.compression import COMPRESSORS, brotli  # noqa: E402
+from app.schemas import AppointmentData  # noqa: E402
+from app.shared import templates  # noqa: E402
+
+WEEKLY_APPOINTMENTS = [
+    # (weekday, hour, duration hours, title, location, information)
+    (6, 10, 1.5, "Gottesdienst", "Kirche", "Mit Abendmahl und Kindergottesdienst"),
+    (6, 18, 1, "Abendgottesdienst", "Gemeindehaus", ""),
+    (1, 19, 2, "Hauskreis Nord", "Familie Schmidt", "Bitte Bibel mitbringen"),
+    (2, 16, 1.5, "Jungschar", "Jugendraum", ""),
+    (3, 20, 1.5, "Chorprobe", "Kirche", "Probe für das Gemeindefest"),
+    (4, 19, 2, "Jugendkreis", "Jugendraum", ""),
+    (5, 9, 3, "Frauenfrühstück", "Gemeindesaal", "Thema: Gelassenheit im Alltag"),
+]
+
+
+def _month_of_appointments(start: datetime) -> list[AppointmentData]:
+    appointments = []
+    for day in range(31):
+        date = start + timedelta(days=day)
+        for weekday, hour, duration, title, location, information in WEEKLY_APPOINTMENTS:
+            if date.weekday() != weekday:
+                continue
+            begin = date.replace(hour=hour)
+            appointments.append(
+                AppointmentData(
+                    id=f"{len(appointments) + 1000}_{begin:%Y%m%d}",
+                    title=title,
+                    start_date=begin.isoformat() + "Z",
+                    end_date=(begin + timedelta(hours=duration)).isoformat() + "Z",
+                    meeting_at=location,
+                    information=information,
+                    additional_info=f"Leitung: Team {day % 4 + 1}" if day % 3 == 0 else "",
+                )
+            )
+    return appointments
+
+
+def _measure(label: str, payload: bytes) -> None:
+    row = f"{label:<26} {len(payload):>9}"
+    for coding in ("gzip", "br"):
+        if coding == "br" and brotli is None:
+            row += f" {'-':>9} {'-':>8}"
+            continue
+        start = time.perf_counter()
+        compressed = COMPRESSORS[coding]().compress(payload, more_body=False)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        row += f" {len(compressed):>9} {elapsed_ms:>8.2f}"
+    print(row)
+
+
+def main():
+    appointments = _month_of_appointments(datetime(2026, 3, 1))
+    json_body = JSONResponse({"appointments": [a.model_dump() for a in appointments]}).body
+    html_body = templates.get_template("fragments/appointments.html").render(appointments=appointments).encode()
+
+    print(f"{len(appointments)} appointments\n")
+    print(f"{'payload':<26} {'raw B':>9} {'gzip B':>9} {'gzip ms':>8} {'br B':>9} {'br ms':>8}")
+    _measure("/api/appointments (JSON)", json_body)
+    _measure("/fragments/appointments", html_body)
+
+
+if __name__ == "__main__":
+    main()
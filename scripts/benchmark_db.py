@@ -0,0 +1,69 @@
+"""Time additional-info writes for 10/100/1000 appointment ids against a temporary SQLite database.
+
+Compares the bulk upsert in app.crud with the previous one-SELECT-per-row implementation.
+
+Usage: python scripts/benchmark_db.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Allow imports from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import app.models  # noqa: E402, F401
+from app.crud import save_additional_infos  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models import Appointment  # noqa: E402
+
+SIZES = (10, 100, 1000)
+
+
+def _row_by_row_save(db, appointment_info_list):
+    """The pre-bulk implementation, kept here as the baseline."""
+    for appointment_id, additional_info in appointment_info_list:
+        appointment = db.query(Appointment).filter(Appointment.id == appointment_id).first()
+        if appointment:
+            appointment.additional_info = additional_info
+        else:
+            db.add(Appointment(id=appointment_id, additional_info=additional_info))
+    db.commit()
+
+
+def _time_ms(fn, db, rows) -> float:
+    start = time.perf_counter()
+    fn(db, rows)
+    return (time.perf_counter() - start) * 1000
+
+
+def _run(fn, size: int) -> tuple[float, float, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            rows = [(f"1_{i}", f"Info {i}") for i in range(size)]
+            insert = _time_ms(fn, db, rows)
+            unchanged = _time_ms(fn, db, rows)
+            update = _time_ms(fn, db, [(appointment_id, info + " (neu)") for appointment_id, info in rows])
+        finally:
+            db.close()
+            engine.dispose()
+    return insert, unchanged, update
+
+
+def main():
+    print(f"{'ids':>6} {'impl':>10} {'insert ms':>10} {'unchanged ms':>13} {'update ms':>10}")
+    for size in SIZES:
+        for label, fn in (("row-by-row", _row_by_row_save), ("bulk", save_additional_infos)):
+            insert, unchanged, update = _run(fn, size)
+            print(f"{size:>6} {label:>10} {insert:>10.2f} {unchanged:>13.2f} {update:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
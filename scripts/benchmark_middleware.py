@@ -0,0 +1,191 @@
+"""Measure in-process requests per second and upload peak memory through the security-header and CSRF middleware.
+
+Compares the pure-ASGI middleware in app.middleware with the previous BaseHTTPMiddleware versions.
+
+Usage: python scripts/benchmark_middleware.py
+"""
+
+import asyncio
+import os
+import secrets
+import sys
+import time
+import tracemalloc
+
+# Allow imports from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, File, Request, UploadFile  # noqa: E402
+from fastapi.responses import JSONResponse, StreamingResponse  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.middleware.csrf import COOKIE_NAME, CSRFMiddleware  # noqa: E402
+from app.middleware.security_headers import SECURITY_HEADERS, SecurityHeadersMiddleware  # noqa: E402
+
+REQUESTS = 2000
+STREAM_CHUNKS = 64
+STREAM_CHUNK_SIZE = 16 * 1024
+UPLOAD_SIZE = 10 * 1024 * 1024
+
+
+class _BaseHTTPSecurityHeaders(BaseHTTPMiddleware):
+    """The pre-ASGI implementation, kept here as the baseline."""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS.items():
+            response.headers[name] = value
+        return response
+
+
+class _BaseHTTPCSRF(BaseHTTPMiddleware):
+    """The pre-ASGI implementation, kept here as the baseline."""
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method in ("GET", "HEAD", "OPTIONS"):
+            token = request.cookies.get(COOKIE_NAME) or secrets.token_urlsafe(32)
+            response = await call_next(request)
+            response.set_cookie(COOKIE_NAME, token, samesite="lax", secure=request.url.scheme == "https")
+            return response
+        cookie_token = request.cookies.get(COOKIE_NAME)
+        header_token = request.headers.get("X-CSRF-Token")
+        if cookie_token and header_token and secrets.compare_digest(header_token, cookie_token):
+            return await call_next(request)
+        if cookie_token and "multipart/form-data" in request.headers.get("content-type", ""):
+            body = await request.body()
+            form = await request.form()
+            form_token = form.get("_csrf_token")
+            await form.close()
+            request._body = body
+            if form_token and secrets.compare_digest(str(form_token), cookie_token):
+                return await call_next(request)
+        return JSONResponse({"error": "CSRF token mismatch"}, status_code=403)
+
+
+def _build_app(security_headers, csrf) -> FastAPI:
+    bench_app = FastAPI()
+    bench_app.add_middleware(security_headers)
+    bench_app.add_middleware(csrf)
+
+    @bench_app.get("/page")
+    async def page():
+        return JSONResponse({"ok": True})
+
+    @bench_app.post("/save")
+    async def save():
+        return JSONResponse({"ok": True})
+
+    @bench_app.get("/download")
+    async def download():
+        async def chunks():
+            for _ in range(STREAM_CHUNKS):
+                yield b"x" * STREAM_CHUNK_SIZE
+
+        return StreamingResponse(chunks(), media_type="application/zip")
+
+    @bench_app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        size = 0
+        while chunk := await file.read(64 * 1024):
+            size += len(chunk)
+        return JSONResponse({"size": size})
+
+    return bench_app
+
+
+async def _requests_per_second(bench_app: FastAPI, method: str, path: str) -> float:
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        token = (await client.get("/page")).cookies[COOKIE_NAME]
+        headers = {"X-CSRF-Token": token}
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            response = await client.request(method, path, headers=headers)
+            response.raise_for_status()
+        return REQUESTS / (time.perf_counter() - start)
+
+
+def _multipart_upload(token: str | None) -> list[bytes]:
+    """Split a multipart body into 64 KiB chunks, the way a server hands it to the app.
+
+    The file chunks are one shared bytes object, so the list itself costs almost nothing.
+    """
+    chunks = []
+    if token:
+        chunks.append(
+            b'--benchboundary\r\nContent-Disposition: form-data; name="_csrf_token"\r\n\r\n' + token.encode() + b"\r\n"
+        )
+    chunks.append(b'--benchboundary\r\nContent-Disposition: form-data; name="file"; filename="background.png"\r\n')
+    chunks.append(b"Content-Type: image/png\r\n\r\n")
+    file_chunk = b"x" * (64 * 1024)
+    chunks.extend(file_chunk for _ in range(UPLOAD_SIZE // len(file_chunk)))
+    chunks.append(b"\r\n--benchboundary--\r\n")
+    return chunks
+
+
+async def _upload_peak_mib(bench_app: FastAPI, token_in_form: bool) -> float:
+    """Drive the ASGI app directly with a chunked body so only server-side allocations are traced."""
+    token = secrets.token_urlsafe(32)
+    headers = [
+        (b"cookie", f"{COOKIE_NAME}={token}".encode()),
+        (b"content-type", b"multipart/form-data; boundary=benchboundary"),
+    ]
+    if not token_in_form:
+        headers.append((b"x-csrf-token", token.encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/upload",
+        "raw_path": b"/upload",
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+    chunks = _multipart_upload(token if token_in_form else None)
+    status = []
+
+    async def receive():
+        if not chunks:
+            return {"type": "http.disconnect"}
+        return {"type": "http.request", "body": chunks.pop(0), "more_body": bool(chunks)}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    tracemalloc.start()
+    try:
+        await bench_app(scope, receive, send)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert status == [200], status
+    return peak / (1024 * 1024)
+
+
+async def main():
+    variants = (
+        ("BaseHTTP", _build_app(_BaseHTTPSecurityHeaders, _BaseHTTPCSRF)),
+        ("ASGI", _build_app(SecurityHeadersMiddleware, CSRFMiddleware)),
+    )
+    print(f"{'route':>14} {'impl':>9} {'req/s':>9}")
+    for method, path in (("GET", "/page"), ("POST", "/save"), ("GET", "/download")):
+        for label, bench_app in variants:
+            rate = await _requests_per_second(bench_app, method, path)
+            print(f"{method + ' ' + path:>14} {label:>9} {rate:>9.0f}")
+
+    print(f"\n{'10 MiB upload':>14} {'impl':>9} {'peak MiB':>9}")
+    for token_label, token_in_form in (("header token", False), ("form token", True)):
+        for label, bench_app in variants:
+            peak = await _upload_peak_mib(bench_app, token_in_form)
+            print(f"{token_label:>14} {label:>9} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""Time the A4 agenda and Dienstplan PDF generators, separating style setup from rendering.
+
+Usage: python scripts/benchmark_pdf.py
+"""
+
+import os
+import sys
+import timeit
+
+# Allow imports from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.schemas import AgendaItem, EventService, EventSummary  # noqa: E402
+from app.services.pdf_generator import (  # noqa: E402
+    _build_document_styles,
+    _register_fonts,
+    create_agenda_pdf,
+    create_services_pdf,
+    get_document_styles,
+    warm_up_pdf_styles,
+)
+
+ROUNDS = 50
+
+AGENDA_ITEMS = [
+    AgendaItem(position=0, type="header", title="Vorbereitung", is_before_event=True),
+    *[
+        AgendaItem(
+            position=i,
+            type="song" if i % 3 == 0 else "default",
+            title=f"Programmpunkt {i}",
+            start="2026-03-22T09:00:00Z",
+            duration_seconds=300,
+            responsible_names=["Max Mustermann"],
+            song_key="G" if i % 3 == 0 else None,
+        )
+        for i in range(1, 20)
+    ],
+]
+
+EVENTS = [
+    EventSummary(
+        id=i,
+        name=f"Gottesdienst {i}",
+        start_date=f"2026-03-{i + 1:02d}T09:00:00Z",
+        end_date=f"2026-03-{i + 1:02d}T11:00:00Z",
+        calendar_name="GD",
+        services=[
+            EventService(service_id=s, name=f"Dienst {s}", person_name="Anna Schmidt", is_accepted=s % 2 == 0)
+            for s in range(8)
+        ],
+    )
+    for i in range(20)
+]
+
+
+def _per_call_ms(stmt) -> float:
+    return timeit.timeit(stmt, number=ROUNDS) / ROUNDS * 1000
+
+
+def main():
+    warm_up_pdf_styles()
+    font_pair = _register_fonts()
+
+    uncached = _per_call_ms(lambda: _build_document_styles.__wrapped__(*font_pair))
+    cached = _per_call_ms(get_document_styles)
+    agenda = _per_call_ms(lambda: create_agenda_pdf("GD", "2026-03-22T09:00:00Z", AGENDA_ITEMS))
+    services = _per_call_ms(lambda: create_services_pdf("März 2026", EVENTS))
+
+    print(f"style setup (uncached build):  {uncached:.3f} ms")
+    print(f"style setup (registry lookup): {cached:.4f} ms")
+    print(f"create_agenda_pdf:   {agenda:.2f} ms")
+    print(f"create_services_pdf: {services:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
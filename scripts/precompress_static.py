@@ -0,0 +1,53 @@
+"""Write Brotli (.br) and gzip (.gz) variants next to every compressible file in app/static.
+
+PrecompressedStaticFiles serves these variants to browsers that accept them, so static assets are
+compressed once at build time at the highest levels instead of on every request. A variant is only
+kept if it is actually smaller than the original. Brotli variants require the optional brotli package.
+
+Usage: python scripts/precompress_static.py [static_dir]
+   or: make precompress
+"""
+
+import gzip
+import os
+import sys
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "app" / "static"
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".svg", ".html", ".json", ".txt", ".map"}
+
+
+def _write_variant(path: Path, suffix: str, data: bytes, original_size: int) -> int | None:
+    variant = path.with_name(path.name + suffix)
+    if len(data) >= original_size:
+        variant.unlink(missing_ok=True)
+        return None
+    variant.write_bytes(data)
+    # Keep the variant's mtime in step with the original so it is never considered stale
+    stat = path.stat()
+    os.utime(variant, (stat.st_atime, stat.st_mtime))
+    return len(data)
+
+
+def precompress(static_dir: Path = STATIC_DIR) -> None:
+    print(f"{'file':<32} {'raw':>8} {'gzip':>8} {'br':>8}")
+    for path in sorted(static_dir.rglob("*")):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        raw = path.read_bytes()
+        gz_size = _write_variant(path, ".gz", gzip.compress(raw, compresslevel=9, mtime=0), len(raw))
+        br_size = None
+        if brotli is not None:
+            br_size = _write_variant(path, ".br", brotli.compress(raw, quality=11), len(raw))
+        print(f"{str(path.relative_to(static_dir)):<32} {len(raw):>8} {gz_size or '-':>8} {br_size or '-':>8}")
+    if brotli is None:
+        print("brotli is not installed; only gzip variants were written")
+
+
+if __name__ == "__main__":
+    precompress(Path(sys.argv[1]) if len(sys.argv) > 1 else STATIC_DIR)
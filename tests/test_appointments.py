@@ -7,7 +7,7 @@ from fastapi.templating import Jinja2Templates
 
 from app.api.appointments import api_generate, appointments_page
 from app.config import settings
-from app.schemas import AppointmentData, ColorSettings, GenerateRequest
+from app.schemas import AppointmentData, ColorSettings, GenerateRequest, ImageAssetInfo
 from app.services.churchtools_client import AuthenticationError, fetch_appointments, fetch_calendars, parse_appointment
 from app.services.jpeg_generator import handle_jpeg_generation
 
@@ -250,8 +250,10 @@ def test_handle_jpeg_generation(mock_convert):
 
 
 @pytest.mark.asyncio
-@patch("app.api.appointments.load_background_image", return_value=(None, None))
-@patch("app.api.appointments.load_logo", return_value=(None, None))
+@patch("app.api.appointments.load_background_image")
+@patch("app.api.appointments.load_logo")
+@patch("app.api.appointments.load_background_image_info", return_value=None)
+@patch("app.api.appointments.load_logo_info")
 @patch("app.api.appointments.fetch_calendars")
 @patch("app.api.appointments.get_date_range_from_form")
 @patch("app.api.appointments.load_color_settings")
@@ -259,6 +261,8 @@ async def test_appointments_page_with_token(
     mock_load_color,
     mock_get_date,
     mock_fetch_cal,
+    mock_load_logo_info,
+    mock_load_bg_info,
     mock_load_logo,
     mock_load_bg,
     templates_mock,
@@ -278,6 +282,9 @@ async def test_appointments_page_with_token(
     mock_get_date.return_value = ("2023-01-15", "2023-01-22")
     mock_fetch_cal.return_value = [{"id": 1, "name": "Calendar 1"}, {"id": 2, "name": "Calendar 2"}]
     mock_load_color.return_value = ColorSettings(name="default")
+    mock_load_logo_info.return_value = ImageAssetInfo(
+        filename="logo.png", size=3, content_hash="0123456789abcdef" + "0" * 48, mime_type="image/png"
+    )
 
     # Call the function (page renders without appointments, AJAX loads them later)
     await appointments_page(request_mock, db_mock, client_mock, start_date=None, end_date=None, calendar_ids=None)
@@ -303,6 +310,14 @@ async def test_appointments_page_with_token(
     assert context["end_date"] == "2023-01-22"
     assert context["base_url"] == config_mock["CHURCHTOOLS_BASE"]
     assert context["color_settings"] == ColorSettings(name="default")
+    assert context["has_logo"] is True
+    assert context["has_background_image"] is False
+    assert context["logo_url"] == "/logo?v=0123456789abcdef"
+    assert context["background_url"] is None
+
+    # Asset presence is checked without loading the image bytes
+    mock_load_logo.assert_not_called()
+    mock_load_bg.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -594,6 +609,8 @@ async def test_api_generate_no_auth():
 
 
 @pytest.mark.asyncio
+@patch("app.api.appointments.save_color_settings")
+@patch("app.api.appointments.save_additional_infos")
 @patch("app.api.appointments.load_background_image", return_value=(None, None))
 @patch("app.api.appointments.load_logo", return_value=(None, None))
 @patch("app.api.appointments.fetch_appointments")
@@ -601,6 +618,8 @@ async def test_api_generate_auth_error_mid_session(
     mock_fetch_app,
     mock_load_logo,
     mock_load_bg,
+    mock_save_infos,
+    mock_save_colors,
     config_mock,
 ):
     """If fetch_appointments raises AuthenticationError, should return 401."""
@@ -628,3 +647,219 @@ async def test_api_generate_auth_error_mid_session(
 
     response = await api_generate(request=request, body=body, db=db, client=client)
     assert response.status_code == 401
+
+
+def _asset_request(query_string: bytes = b"", headers: list | None = None) -> Request:
+    return Request({"type": "http", "method": "GET", "query_string": query_string, "headers": headers or []})
+
+
+@pytest.mark.asyncio
+async def test_get_logo_serves_file_from_asset_store(tmp_path):
+    from fastapi import HTTPException
+    from fastapi.responses import FileResponse
+
+    from app.api.appointments import get_logo
+
+    content_hash = "ab" + "0" * 62
+    (tmp_path / "ab").mkdir()
+    (tmp_path / "ab" / content_hash).write_bytes(b"png-bytes")
+    info = ImageAssetInfo(filename="logo.png", size=9, content_hash=content_hash, mime_type="image/png")
+
+    with (
+        patch.object(settings, "asset_dir", str(tmp_path)),
+        patch("app.api.appointments.load_logo_info", return_value=info),
+    ):
+        response = await get_logo(_asset_request(), db=MagicMock())
+    assert isinstance(response, FileResponse)
+    assert response.path == tmp_path / "ab" / content_hash
+    assert response.media_type == "image/png"
+
+    with (
+        patch.object(settings, "asset_dir", str(tmp_path / "missing")),
+        patch("app.api.appointments.load_logo_info", return_value=info),
+        pytest.raises(HTTPException) as exc_info,
+    ):
+        await get_logo(_asset_request(), db=MagicMock())
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_background_streams_file_in_chunks(tmp_path):
+    from app.api.appointments import get_background
+
+    content_hash = "cd" + "0" * 62
+    (tmp_path / "cd").mkdir()
+    data = b"x" * (3 * 64 * 1024 + 10)
+    (tmp_path / "cd" / content_hash).write_bytes(data)
+    info = ImageAssetInfo(filename="bg.jpg", size=len(data), content_hash=content_hash, mime_type="image/jpeg")
+
+    with (
+        patch.object(settings, "asset_dir", str(tmp_path)),
+        patch("app.api.appointments.load_background_image_info", return_value=info),
+    ):
+        response = await get_background(_asset_request(), db=MagicMock())
+
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"spec_version": "2.4"},
+        "method": "GET",
+        "headers": [],
+        "http_version": "1.1",
+        "extensions": {},
+    }
+    await response(scope, receive, send)
+
+    chunks = [m["body"] for m in messages if m["type"] == "http.response.body" and m.get("body")]
+    assert len(chunks) > 1
+    assert max(len(chunk) for chunk in chunks) < len(data)
+    assert b"".join(chunks) == data
+
+
+@pytest.mark.asyncio
+async def test_get_logo_cache_headers_and_conditional_requests(tmp_path):
+    from app.api.appointments import get_logo
+
+    content_hash = "ef" + "1" * 62
+    (tmp_path / "ef").mkdir()
+    (tmp_path / "ef" / content_hash).write_bytes(b"png-bytes")
+    info = ImageAssetInfo(filename="logo.png", size=9, content_hash=content_hash, mime_type="image/png")
+    etag = f'"{content_hash}"'
+
+    with (
+        patch.object(settings, "asset_dir", str(tmp_path)),
+        patch("app.api.appointments.load_logo_info", return_value=info),
+    ):
+        unversioned = await get_logo(_asset_request(), db=MagicMock())
+        versioned = await get_logo(_asset_request(f"v={content_hash[:16]}".encode()), db=MagicMock())
+        stale_version = await get_logo(_asset_request(b"v=deadbeef"), db=MagicMock())
+        not_modified = await get_logo(
+            _asset_request(headers=[(b"if-none-match", f'W/"other", {etag}'.encode())]), db=MagicMock()
+        )
+        changed = await get_logo(_asset_request(headers=[(b"if-none-match", b'"other"')]), db=MagicMock())
+
+    assert unversioned.headers["etag"] == etag
+    assert unversioned.headers["cache-control"] == "no-cache"
+    assert versioned.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert stale_version.headers["cache-control"] == "no-cache"
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.body == b""
+    assert changed.status_code == 200
+
+
+def _upload_request(chunks: list[bytes], headers: list | None = None):
+    """Build an authenticated multipart upload request whose body arrives chunk by chunk."""
+    pending = list(chunks)
+    received = []
+
+    async def receive():
+        chunk = pending.pop(0)
+        received.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": bool(pending)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "query_string": b"",
+        "headers": [
+            (b"cookie", f"{settings.cookie_login_token}=token".encode()),
+            (b"content-type", b"multipart/form-data; boundary=uploadboundary"),
+            *(headers or []),
+        ],
+    }
+    return Request(scope, receive), received
+
+
+def _multipart_file_chunks(file_chunks: list[bytes], filename: str = "logo.png") -> list[bytes]:
+    return [
+        b'--uploadboundary\r\nContent-Disposition: form-data; name="file"; filename="'
+        + filename.encode()
+        + b'"\r\nContent-Type: image/png\r\n\r\n',
+        *file_chunks,
+        b"\r\n--uploadboundary--\r\n",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_upload_logo_streams_to_staging_and_hashes_incrementally(tmp_path):
+    import hashlib
+
+    from app.api.appointments import upload_logo
+
+    file_chunks = [b"a" * 65536, b"b" * 65536, b"c" * 100]
+    request, _ = _upload_request(_multipart_file_chunks(file_chunks))
+    staged_uploads = []
+
+    def fake_save_logo(db, setting_name, staged, filename):
+        staged_uploads.append((staged, staged.path.read_bytes(), filename))
+        return ImageAssetInfo(filename=filename, size=staged.size, content_hash=staged.content_hash, mime_type="")
+
+    with (
+        patch.object(settings, "asset_dir", str(tmp_path)),
+        patch("app.api.appointments.save_logo", side_effect=fake_save_logo),
+    ):
+        response = await upload_logo(request, db=MagicMock())
+
+    assert response.status_code == 200
+    [(staged, written, filename)] = staged_uploads
+    assert filename == "logo.png"
+    assert written == b"".join(file_chunks)
+    assert staged.size == len(written)
+    assert staged.content_hash == hashlib.sha256(written).hexdigest()
+    # The staged file is cleaned up even though the (mocked) save did not move it into the store
+    assert list((tmp_path / ".staging").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_upload_background_aborts_at_size_limit(tmp_path):
+    from fastapi import HTTPException
+
+    from app.api.appointments import upload_background
+
+    chunk = b"x" * (1024 * 1024)
+    chunks = _multipart_file_chunks([chunk] * 20, filename="bg.png")
+    request, received = _upload_request(chunks)
+
+    with (
+        patch.object(settings, "asset_dir", str(tmp_path)),
+        patch("app.api.appointments.save_background_image") as save_mock,
+        pytest.raises(HTTPException) as exc_info,
+    ):
+        await upload_background(request, db=MagicMock())
+
+    assert exc_info.value.status_code == 413
+    save_mock.assert_not_called()
+    # Reading stopped just past the 10 MB limit instead of consuming the whole body
+    assert len(received) < len(chunks)
+    assert list((tmp_path / ".staging").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_upload_rejects_oversized_content_length_and_empty_file(tmp_path):
+    from fastapi import HTTPException
+
+    from app.api.appointments import upload_logo
+
+    oversized, received = _upload_request(
+        _multipart_file_chunks([b"x"]), headers=[(b"content-length", str(20 * 1024 * 1024).encode())]
+    )
+    empty, _ = _upload_request(_multipart_file_chunks([]))
+
+    with patch.object(settings, "asset_dir", str(tmp_path)):
+        with pytest.raises(HTTPException) as too_large:
+            await upload_logo(oversized, db=MagicMock())
+        with pytest.raises(HTTPException) as no_content:
+            await upload_logo(empty, db=MagicMock())
+
+    assert too_large.value.status_code == 413
+    assert received == []
+    assert no_content.value.status_code == 400
+    assert list((tmp_path / ".staging").iterdir()) == []
@@ -0,0 +1,143 @@
+import fnmatch
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.config import Settings
+from app.services.cache import (
+    CACHE_KEY_PREFIX,
+    Cache,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    SqliteCacheBackend,
+    create_cache_backend,
+)
+
+
+class FakeRedis:
+    """Local stand-in for a Redis server, implementing the commands the backend uses."""
+
+    def __init__(self):
+        self.data: dict[str, tuple[float, bytes]] = {}
+
+    def get(self, key):
+        entry = self.data.get(key)
+        if entry is None or entry[0] < time.time():
+            return None
+        return entry[1]
+
+    def set(self, key, value, px):
+        self.data[key] = (time.time() + px / 1000, value)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match):
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCacheBackend()
+    if request.param == "sqlite":
+        return SqliteCacheBackend(str(tmp_path / "cache.db"))
+    return RedisCacheBackend(client=FakeRedis())
+
+
+async def test_round_trip_and_stats(backend):
+    cache = Cache(backend)
+
+    assert await cache.get("agenda:1") is None
+    await cache.set("agenda:1", {"items": [1, 2]}, ttl_seconds=60)
+    assert await cache.get("agenda:1") == {"items": [1, 2]}
+
+    summary = cache.stats_summary()
+    assert summary["backend"] == backend.name
+    assert (summary["hits"], summary["misses"], summary["writes"]) == (1, 1, 1)
+    assert summary["hit_rate"] == 0.5
+    assert summary["average_latency_ms"] >= 0
+
+
+async def test_entries_expire(backend):
+    cache = Cache(backend)
+    await cache.set("service_names", [[1, "Predigt"]], ttl_seconds=60)
+
+    with patch("time.time", return_value=time.time() + 61):
+        assert await cache.get("service_names") is None
+
+
+async def test_delete_and_prefix_clear(backend):
+    cache = Cache(backend)
+    await cache.set("agenda:a:1", 1, ttl_seconds=60)
+    await cache.set("agenda:a:2", 2, ttl_seconds=60)
+    await cache.set("agenda_x", 3, ttl_seconds=60)
+    await cache.set("service_names", 4, ttl_seconds=60)
+
+    await cache.delete("agenda:a:1")
+    assert await cache.get("agenda:a:1") is None
+
+    await cache.clear("agenda:")
+    assert await cache.get("agenda:a:2") is None
+    assert await cache.get("agenda_x") == 3
+    assert await cache.get("service_names") == 4
+
+
+async def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "shared.db")
+    await Cache(SqliteCacheBackend(path)).set("service_names", [[1, "Predigt"]], ttl_seconds=60)
+
+    # A second worker process opens the same file
+    assert await Cache(SqliteCacheBackend(path)).get("service_names") == [[1, "Predigt"]]
+
+
+async def test_memory_backend_evicts_least_recently_used():
+    cache = Cache(MemoryCacheBackend(max_entries=2))
+    await cache.set("a", 1, ttl_seconds=60)
+    await cache.set("b", 2, ttl_seconds=60)
+    await cache.get("a")
+    await cache.set("c", 3, ttl_seconds=60)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+
+
+async def test_memory_backend_keeps_objects_without_serialising():
+    cache = Cache(MemoryCacheBackend())
+    value = {1: "Predigt"}  # integer keys would not survive JSON
+    await cache.set("service_names", value, ttl_seconds=60)
+
+    assert cache.stores_objects
+    assert await cache.get("service_names") is value
+    assert not Cache(RedisCacheBackend(client=FakeRedis())).stores_objects
+
+
+async def test_backend_failure_counts_as_miss():
+    fake = FakeRedis()
+    cache = Cache(RedisCacheBackend(client=fake))
+    with patch.object(fake, "get", side_effect=ConnectionError("refused")):
+        assert await cache.get("agenda:1") is None
+    assert cache.stats.errors == 1
+    assert cache.stats.misses == 1
+
+
+async def test_clear_failure_is_counted_not_raised():
+    fake = FakeRedis()
+    cache = Cache(RedisCacheBackend(client=fake))
+    with patch.object(fake, "scan_iter", side_effect=ConnectionError("refused")):
+        await cache.clear("agenda:")
+    assert cache.stats.errors == 1
+
+
+async def test_keys_are_namespaced():
+    fake = FakeRedis()
+    await Cache(RedisCacheBackend(client=fake)).set("service_names", [], ttl_seconds=60)
+    assert list(fake.data) == [CACHE_KEY_PREFIX + "service_names"]
+
+
+def test_create_cache_backend_from_settings(tmp_path):
+    assert isinstance(create_cache_backend(Settings(cache_backend="memory")), MemoryCacheBackend)
+    sqlite_backend = create_cache_backend(Settings(cache_backend="sqlite", cache_path=str(tmp_path / "c.db")))
+    assert isinstance(sqlite_backend, SqliteCacheBackend)
@@ -0,0 +1,182 @@
+import gzip
+import os
+
+import brotli
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware, accepted_encodings
+from app.responses import conditional_json_response
+from app.staticfiles import PrecompressedStaticFiles
+
+PAYLOAD = {"appointments": [{"id": str(i), "title": "Gottesdienst", "meeting_at": "Kirche"} for i in range(200)]}
+
+
+@pytest.fixture
+def client():
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @test_app.get("/json")
+    async def json_endpoint():
+        return JSONResponse(PAYLOAD)
+
+    @test_app.get("/tagged")
+    async def tagged():
+        return JSONResponse(PAYLOAD, headers={"ETag": '"abc"'})
+
+    @test_app.get("/conditional")
+    async def conditional(request: Request):
+        return conditional_json_response(request, PAYLOAD)
+
+    @test_app.get("/small")
+    async def small():
+        return JSONResponse({"ok": True})
+
+    @test_app.get("/pdf")
+    async def pdf():
+        return Response(b"%PDF-" + b"x" * 5000, media_type="application/pdf")
+
+    @test_app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(50):
+                yield f"<div>Termin {i}</div>\n".encode() * 20
+
+        return StreamingResponse(chunks(), media_type="text/html")
+
+    return TestClient(test_app)
+
+
+def test_accepted_encodings_negotiation():
+    assert accepted_encodings("gzip, deflate, br") == ["br", "gzip"]
+    assert accepted_encodings("gzip") == ["gzip"]
+    assert accepted_encodings("br;q=0, gzip;q=0.5") == ["gzip"]
+    assert accepted_encodings("*") == ["br", "gzip"]
+    assert accepted_encodings("identity") == []
+    assert accepted_encodings("") == []
+
+
+def test_json_compressed_with_preferred_encoding(client):
+    # httpx decodes transparently, so check the wire headers and decode the raw stream ourselves
+    with client.stream("GET", "/json", headers={"Accept-Encoding": "gzip, br"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(raw)
+    assert brotli.decompress(raw) == JSONResponse(PAYLOAD).body
+
+    with client.stream("GET", "/json", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw) == JSONResponse(PAYLOAD).body
+
+
+def test_compressed_response_weakens_strong_etag(client):
+    assert client.get("/tagged", headers={"Accept-Encoding": "gzip"}).headers["etag"] == 'W/"abc"'
+    assert client.get("/tagged", headers={"Accept-Encoding": "identity"}).headers["etag"] == '"abc"'
+
+
+def test_not_modified_repeats_validators_of_compressed_response(client):
+    full = client.get("/conditional", headers={"Accept-Encoding": "gzip"})
+    assert full.status_code == 200
+    assert full.headers["content-encoding"] == "gzip"
+    assert full.headers["etag"].startswith("W/")
+
+    not_modified = client.get(
+        "/conditional", headers={"Accept-Encoding": "gzip", "If-None-Match": full.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == full.headers["etag"]
+    assert not_modified.headers["vary"] == full.headers["vary"] == "Accept-Encoding"
+
+    # Without a negotiated coding the 304 keeps the strong validator of the identity response
+    identity = client.get("/conditional", headers={"Accept-Encoding": "identity"})
+    identity_not_modified = client.get(
+        "/conditional", headers={"Accept-Encoding": "identity", "If-None-Match": identity.headers["etag"]}
+    )
+    assert identity_not_modified.status_code == 304
+    assert identity_not_modified.headers["etag"] == identity.headers["etag"]
+
+
+def test_small_excluded_and_unaccepted_responses_are_not_compressed(client):
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "br"}).headers
+    assert "content-encoding" not in client.get("/pdf", headers={"Accept-Encoding": "br"}).headers
+    assert "content-encoding" not in client.get("/json", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_streaming_response_compressed_chunk_by_chunk(client):
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    expected = b"".join(f"<div>Termin {i}</div>\n".encode() * 20 for i in range(50))
+    assert gzip.decompress(raw) == expected
+
+
+@pytest.fixture
+def static_client(tmp_path):
+    css = tmp_path / "app.css"
+    css.write_bytes(b"body { color: red; }\n" * 100)
+    (tmp_path / "app.css.br").write_bytes(brotli.compress(css.read_bytes()))
+    (tmp_path / "app.css.gz").write_bytes(gzip.compress(css.read_bytes()))
+    (tmp_path / "plain.js").write_bytes(b"console.log('hi');\n")
+
+    test_app = FastAPI()
+    test_app.mount("/static", PrecompressedStaticFiles(directory=str(tmp_path)), name="static")
+    return TestClient(test_app), tmp_path
+
+
+def test_static_serves_precompressed_variant(static_client):
+    client, static_dir = static_client
+    original = (static_dir / "app.css").read_bytes()
+
+    with client.stream("GET", "/static/app.css", headers={"Accept-Encoding": "gzip, br"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["content-type"].startswith("text/css")
+    assert brotli.decompress(raw) == original
+
+    gzipped = client.get("/static/app.css", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.content == original
+
+    plain = client.get("/static/app.css", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.content == original
+
+    not_modified = client.get(
+        "/static/app.css", headers={"Accept-Encoding": "br", "If-None-Match": response.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == response.headers["etag"]
+
+
+def test_static_ignores_missing_and_stale_variants(static_client):
+    client, static_dir = static_client
+    assert "content-encoding" not in client.get("/static/plain.js", headers={"Accept-Encoding": "br"}).headers
+
+    # A variant older than its source file is from a previous build and must not be served
+    variant = static_dir / "app.css.br"
+    os.utime(variant, (0, 0))
+    response = client.get("/static/app.css", headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_static_through_middleware_lists_vary_once(tmp_path):
+    (tmp_path / "plain.js").write_bytes(b"console.log('hi');\n")
+    (tmp_path / "large.js").write_bytes(b"console.log('hi');\n" * 200)
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    test_app.mount("/static", PrecompressedStaticFiles(directory=str(tmp_path)), name="static")
+    client = TestClient(test_app)
+
+    plain = client.get("/static/plain.js", headers={"Accept-Encoding": "br"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    compressed = client.get("/static/large.js", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
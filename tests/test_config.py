@@ -55,3 +55,17 @@ class TestSettings(unittest.TestCase):
 
         with self.assertRaises(Exception):
             Settings()
+
+    @patch.dict("os.environ", {"DB_PATH": "/app/data/churchtools.db"}, clear=False)
+    def test_asset_dir_defaults_next_to_database(self):
+        from app.config import Settings
+
+        s = Settings()
+        assert s.asset_dir == "/app/data/assets"
+
+    @patch.dict("os.environ", {"DB_PATH": "/app/data/churchtools.db"}, clear=False)
+    def test_template_cache_dir_defaults_next_to_database(self):
+        from app.config import Settings
+
+        s = Settings()
+        assert s.template_cache_dir == "/app/data/template_cache"
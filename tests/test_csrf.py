@@ -114,3 +114,181 @@ def test_csrf_allows_post_with_form_token():
 
     response = client.post("/test", data={"_csrf_token": csrf_token})
     assert response.status_code == 200
+
+
+def test_csrf_first_visit_token_is_visible_to_handler():
+    from app.middleware.csrf import CSRFMiddleware
+
+    test_app = FastAPI()
+    test_app.add_middleware(CSRFMiddleware, exempt_paths=["/health"])
+
+    @test_app.get("/get-token")
+    async def get_token(request: Request):
+        return HTMLResponse(request.cookies.get("csrf_token", ""))
+
+    client = TestClient(test_app)
+    response = client.get("/get-token")
+    assert response.text
+    assert response.cookies.get("csrf_token") == response.text
+    assert "samesite=lax" in response.headers["set-cookie"].lower()
+
+
+def test_csrf_form_body_is_replayed_to_handler():
+    from fastapi import Form
+
+    from app.middleware.csrf import CSRFMiddleware
+
+    test_app = FastAPI()
+    test_app.add_middleware(CSRFMiddleware, exempt_paths=["/health"])
+
+    @test_app.get("/get-token")
+    async def get_token(request: Request):
+        return HTMLResponse("<html></html>")
+
+    @test_app.post("/test")
+    async def test_post(name: str = Form(...)):
+        return JSONResponse({"name": name})
+
+    client = TestClient(test_app)
+    csrf_token = client.get("/get-token").cookies.get("csrf_token")
+
+    response = client.post("/test", data={"_csrf_token": csrf_token, "name": "Gottesdienst"})
+    assert response.status_code == 200
+    assert response.json() == {"name": "Gottesdienst"}
+
+
+def test_security_headers_on_streaming_response():
+    from fastapi.responses import StreamingResponse
+
+    from app.middleware.security_headers import SECURITY_HEADERS, SecurityHeadersMiddleware
+
+    test_app = FastAPI()
+    test_app.add_middleware(SecurityHeadersMiddleware)
+
+    @test_app.get("/download")
+    async def download():
+        async def chunks():
+            yield b"part-1;"
+            yield b"part-2"
+
+        return StreamingResponse(chunks(), media_type="application/zip")
+
+    response = TestClient(test_app).get("/download")
+    assert response.content == b"part-1;part-2"
+    for name, value in SECURITY_HEADERS.items():
+        assert response.headers[name] == value
+
+
+def _upload_app():
+    from fastapi import File, UploadFile
+
+    from app.middleware.csrf import CSRFMiddleware
+
+    test_app = FastAPI()
+    test_app.add_middleware(CSRFMiddleware, exempt_paths=["/health"])
+
+    @test_app.get("/get-token")
+    async def get_token(request: Request):
+        return HTMLResponse("<html></html>")
+
+    @test_app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return JSONResponse({"size": len(await file.read())})
+
+    return test_app
+
+
+def test_csrf_allows_multipart_with_leading_form_token():
+    client = TestClient(_upload_app())
+    csrf_token = client.get("/get-token").cookies.get("csrf_token")
+
+    # httpx writes data fields before files, so the token is the first part
+    response = client.post(
+        "/upload", data={"_csrf_token": csrf_token}, files={"file": ("logo.png", b"x" * 100_000, "image/png")}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"size": 100_000}
+
+
+def test_csrf_blocks_multipart_with_token_after_file():
+    client = TestClient(_upload_app())
+    csrf_token = client.get("/get-token").cookies.get("csrf_token")
+    boundary = "testboundary"
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="logo.png"\r\n'
+        "Content-Type: image/png\r\n\r\n"
+        "data\r\n"
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="_csrf_token"\r\n\r\n'
+        f"{csrf_token}\r\n"
+        f"--{boundary}--\r\n"
+    ).encode()
+
+    response = client.post(
+        "/upload", content=body, headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    )
+    assert response.status_code == 403
+
+
+def test_csrf_rejects_non_ascii_tokens_with_403():
+    client = TestClient(_upload_app())
+    client.get("/get-token")
+
+    multipart = client.post(
+        "/upload", data={"_csrf_token": "tökén"}, files={"file": ("logo.png", b"x" * 100, "image/png")}
+    )
+    urlencoded = client.post("/upload", data={"_csrf_token": "tökén"})
+    header = client.post("/upload", headers={"X-CSRF-Token": "tökén".encode()})
+
+    assert multipart.status_code == 403
+    assert urlencoded.status_code == 403
+    assert header.status_code == 403
+
+
+async def test_csrf_multipart_token_check_does_not_buffer_upload():
+    from app.middleware.csrf import CSRFMiddleware
+
+    boundary = b"testboundary"
+    token_part = (
+        b'--testboundary\r\nContent-Disposition: form-data; name="_csrf_token"\r\n\r\ntok\r\n'
+        b'--testboundary\r\nContent-Disposition: form-data; name="file"; filename="bg.png"\r\n\r\n'
+    )
+    chunks = [token_part] + [b"x" * 65536] * 20 + [b"\r\n--testboundary--\r\n"]
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages[-1]["more_body"] = False
+    received = []
+
+    async def receive():
+        message = messages.pop(0)
+        received.append(message)
+        return message
+
+    seen_by_app = []
+
+    async def inner_app(scope, receive, send):
+        seen_by_app.append(len(received))
+        while (await receive()).get("more_body"):
+            pass
+        await JSONResponse({"ok": True})(scope, receive, send)
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/upload",
+        "headers": [
+            (b"cookie", b"csrf_token=tok"),
+            (b"content-type", b"multipart/form-data; boundary=" + boundary),
+        ],
+    }
+    await CSRFMiddleware(inner_app)(scope, receive, send)
+
+    assert sent[0]["status"] == 200
+    # Only the leading token part was read before the application took over
+    assert seen_by_app == [1]
+    assert len(received) == len(chunks)
@@ -1,14 +1,24 @@
 import os
 import tempfile
+import threading
 import unittest
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker
 
-from app.crud import get_additional_infos, load_color_settings, save_additional_infos, save_color_settings
-from app.database import Base
+from app.config import Settings
+from app.crud import (
+    clear_profile_cache,
+    delete_stale_additional_infos,
+    get_additional_infos,
+    load_color_settings,
+    save_additional_infos,
+    save_color_settings,
+)
+from app.database import Base, create_db_engine
 from app.models import Appointment, ColorSetting
 from app.schemas import ColorSettings
 
@@ -26,6 +36,7 @@ class TestDatabase(unittest.TestCase):
 
         # Create tables
         Base.metadata.create_all(self.engine)
+        clear_profile_cache()
 
     def tearDown(self):
         # Close session and remove temporary database
@@ -62,6 +73,110 @@ class TestDatabase(unittest.TestCase):
         # Check result
         self.assertEqual(result["appointment3"], "Updated info")
 
+    def test_save_additional_infos_across_chunks(self):
+        from app.crud import UPSERT_CHUNK_SIZE
+
+        count = UPSERT_CHUNK_SIZE * 2 + 7
+        save_additional_infos(self.session, [(f"id{i}", f"info {i}") for i in range(count)])
+        save_additional_infos(self.session, [(f"id{i}", f"changed {i}") for i in range(0, count, 2)])
+
+        result = get_additional_infos(self.session, [f"id{i}" for i in range(count)])
+        self.assertEqual(len(result), count)
+        self.assertEqual(result["id0"], "changed 0")
+        self.assertEqual(result["id1"], "info 1")
+        self.assertEqual(result[f"id{count - 1}"], f"changed {count - 1}")
+
+    def test_save_additional_infos_last_duplicate_wins(self):
+        save_additional_infos(self.session, [("dup", "first"), ("dup", "second")])
+        self.assertEqual(get_additional_infos(self.session, ["dup"]), {"dup": "second"})
+
+    def test_save_additional_infos_skips_unchanged_rows(self):
+        self.session.execute(text("CREATE TABLE update_log (id TEXT)"))
+        self.session.execute(
+            text(
+                "CREATE TRIGGER log_update AFTER UPDATE ON appointments "
+                "BEGIN INSERT INTO update_log VALUES (NEW.id); END"
+            )
+        )
+        self.session.commit()
+
+        save_additional_infos(self.session, [("a", "same"), ("b", "old"), ("c", None)])
+        save_additional_infos(self.session, [("a", "same"), ("b", "new"), ("c", None)])
+
+        updated = [row[0] for row in self.session.execute(text("SELECT id FROM update_log"))]
+        self.assertEqual(updated, ["b"])
+
+    def test_save_additional_infos_refreshes_stale_updated_at(self):
+        save_additional_infos(self.session, [("fresh", "same"), ("stale", "same")])
+        long_ago = datetime(2000, 1, 1)
+        self.session.query(Appointment).filter_by(id="stale").update({"updated_at": long_ago})
+        self.session.commit()
+        fresh_before = self.session.get(Appointment, "fresh").updated_at
+
+        save_additional_infos(self.session, [("fresh", "same"), ("stale", "same")])
+        self.session.expire_all()
+
+        self.assertEqual(self.session.get(Appointment, "fresh").updated_at, fresh_before)
+        self.assertGreater(self.session.get(Appointment, "stale").updated_at, long_ago)
+
+    def test_delete_stale_additional_infos(self):
+        save_additional_infos(self.session, [("recent", "keep"), ("old", "drop")])
+        self.session.query(Appointment).filter_by(id="old").update({"updated_at": datetime(2000, 1, 1)})
+        self.session.commit()
+
+        removed = delete_stale_additional_infos(self.session, timedelta(days=365))
+
+        self.assertEqual(removed, 1)
+        self.assertEqual(get_additional_infos(self.session, ["recent", "old"]), {"recent": "keep"})
+
+    def test_save_color_settings_skips_unchanged_row(self):
+        self.session.execute(text("CREATE TABLE update_log (setting_name TEXT)"))
+        self.session.execute(
+            text(
+                "CREATE TRIGGER log_update AFTER UPDATE ON color_settings "
+                "BEGIN INSERT INTO update_log VALUES (NEW.setting_name); END"
+            )
+        )
+        self.session.commit()
+
+        save_color_settings(self.session, ColorSettings(name="p"))
+        save_color_settings(self.session, ColorSettings(name="p"))
+        self.assertEqual(self.session.execute(text("SELECT COUNT(*) FROM update_log")).scalar(), 0)
+
+        save_color_settings(self.session, ColorSettings(name="p", date_color="#000000"))
+        self.assertEqual(self.session.execute(text("SELECT COUNT(*) FROM update_log")).scalar(), 1)
+
+    def test_get_additional_infos_large_id_set_uses_temp_table(self):
+        count = 50_000
+        save_additional_infos(self.session, [(f"1_{i}", f"Info {i}") for i in range(0, count, 2)])
+
+        import app.crud
+
+        with patch(
+            "app.crud._get_additional_infos_via_temp_table", wraps=app.crud._get_additional_infos_via_temp_table
+        ) as temp_table_lookup:
+            result = get_additional_infos(self.session, [f"1_{i}" for i in range(count)])
+        temp_table_lookup.assert_called_once()
+
+        self.assertEqual(len(result), count // 2)
+        self.assertEqual(result["1_0"], "Info 0")
+        self.assertEqual(result[f"1_{count - 2}"], f"Info {count - 2}")
+        self.assertNotIn("1_1", result)
+
+        # The temporary table is dropped again, so a second lookup works on the same session
+        self.assertEqual(len(get_additional_infos(self.session, [f"1_{i}" for i in range(count)])), count // 2)
+
+    def test_get_additional_infos_large_id_set_chunked(self):
+        count = 50_000
+        save_additional_infos(self.session, [(f"1_{i}", f"Info {i}") for i in range(0, count, 2)])
+
+        with patch("app.crud.TEMP_TABLE_LOOKUP_THRESHOLD", count):
+            result = get_additional_infos(self.session, [f"1_{i}" for i in range(count)])
+
+        self.assertEqual(len(result), count // 2)
+        self.assertEqual(result["1_4"], "Info 4")
+        self.assertNotIn("1_3", result)
+
     def test_save_and_load_color_settings(self):
         # Test data
         settings = ColorSettings(
@@ -163,5 +278,178 @@ class TestDatabase(unittest.TestCase):
             self.assertIn("Database error", mock_logger.error.call_args[0][0])
 
 
+class TestSqliteTuning(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(f"sqlite:///{os.path.join(self.temp_dir.name, 'tuning.db')}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.temp_dir.cleanup()
+
+    def test_pragmas_applied_on_connect(self):
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("PRAGMA journal_mode").scalar(), "wal")
+            self.assertEqual(conn.exec_driver_sql("PRAGMA synchronous").scalar(), 1)  # NORMAL
+            self.assertEqual(conn.exec_driver_sql("PRAGMA busy_timeout").scalar(), 5000)
+            self.assertEqual(conn.exec_driver_sql("PRAGMA cache_size").scalar(), -20000)
+            self.assertEqual(conn.exec_driver_sql("PRAGMA temp_store").scalar(), 2)  # MEMORY
+
+    def test_pragmas_follow_settings_overrides(self):
+        config = Settings(sqlite_journal_mode="DELETE", sqlite_synchronous="FULL", sqlite_busy_timeout_ms=1234)
+        engine = create_db_engine(f"sqlite:///{os.path.join(self.temp_dir.name, 'override.db')}", config)
+        try:
+            with engine.connect() as conn:
+                self.assertEqual(conn.exec_driver_sql("PRAGMA journal_mode").scalar(), "delete")
+                self.assertEqual(conn.exec_driver_sql("PRAGMA synchronous").scalar(), 2)  # FULL
+                self.assertEqual(conn.exec_driver_sql("PRAGMA busy_timeout").scalar(), 1234)
+        finally:
+            engine.dispose()
+
+    def test_concurrent_reads_and_writes(self):
+        errors = []
+        ids = [f"1_{i}" for i in range(200)]
+
+        def writer(worker: int):
+            db = self.Session()
+            try:
+                for round_ in range(20):
+                    save_additional_infos(db, [(appointment_id, f"w{worker} r{round_}") for appointment_id in ids])
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.close()
+
+        def reader():
+            db = self.Session()
+            try:
+                for _ in range(50):
+                    db.query(Appointment.id).filter(Appointment.id.in_(ids)).all()
+                    db.rollback()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        db = self.Session()
+        try:
+            self.assertEqual(len(get_additional_infos(db, ids)), len(ids))
+        finally:
+            db.close()
+
+    def _add_stale_additional_infos(self, prefix: str, count: int = 2000):
+        db = self.Session()
+        try:
+            save_additional_infos(db, [(f"{prefix}-{i}", "x" * 500) for i in range(count)])
+            db.query(Appointment).filter(Appointment.id.like(f"{prefix}-%")).update(
+                {"updated_at": datetime(2000, 1, 1)}, synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def test_compaction_removes_stale_rows_and_reclaims_space(self):
+        from app.services.compaction import SQLITE_AUTO_VACUUM_INCREMENTAL, compact_appointments
+
+        db = self.Session()
+        try:
+            save_additional_infos(db, [("current", "keep")])
+        finally:
+            db.close()
+        self._add_stale_additional_infos("old")
+
+        # Without the conversion done by migration 005 the compaction never runs a full VACUUM itself
+        result = compact_appointments(timedelta(days=30), self.Session, self.engine)
+        self.assertEqual(result, (2000, 0))
+        with self.engine.connect() as conn:
+            self.assertNotEqual(conn.exec_driver_sql("PRAGMA auto_vacuum").scalar(), SQLITE_AUTO_VACUUM_INCREMENTAL)
+            self.assertEqual(conn.exec_driver_sql("SELECT id FROM appointments").scalars().all(), ["current"])
+
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.exec_driver_sql("VACUUM")
+
+        self._add_stale_additional_infos("again")
+        result = compact_appointments(timedelta(days=30), self.Session, self.engine)
+        self.assertEqual(result.rows_removed, 2000)
+        self.assertGreater(result.bytes_reclaimed, 0)
+
+    def test_only_one_worker_claims_each_compaction(self):
+        from app.crud import claim_compaction_run
+
+        interval = timedelta(hours=24)
+        claims = []
+
+        def worker():
+            db = self.Session()
+            try:
+                claims.append(claim_compaction_run(db, interval))
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(claims), [False, False, False, True])
+
+        # Once the interval has passed the next run can be claimed again
+        later = datetime.now(timezone.utc).replace(tzinfo=None) + interval + timedelta(minutes=1)
+        with patch("app.crud._utcnow", return_value=later):
+            db = self.Session()
+            try:
+                self.assertTrue(claim_compaction_run(db, interval))
+            finally:
+                db.close()
+
+
+class TestDatabaseBackends(unittest.TestCase):
+    def test_server_database_gets_tuned_pool(self):
+        config = Settings(
+            database_url="postgresql+psycopg://user:pass@db/churchtools",
+            db_pool_size=7,
+            db_max_overflow=3,
+            db_pool_recycle_seconds=600,
+        )
+        with patch("app.database.create_engine") as mock_create_engine:
+            create_db_engine(config.database_url, config)
+
+        mock_create_engine.assert_called_once_with(
+            "postgresql+psycopg://user:pass@db/churchtools",
+            pool_size=7,
+            max_overflow=3,
+            pool_pre_ping=True,
+            pool_recycle=600,
+        )
+
+    def test_database_url_defaults_to_sqlite_db_path(self):
+        self.assertEqual(Settings(db_path="/data/x.db").database_url, "sqlite:////data/x.db")
+
+    def test_upserts_follow_session_dialect(self):
+        from sqlalchemy.dialects import postgresql
+
+        from app.crud import _upsert
+
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        stmt = _upsert(db, Appointment).on_conflict_do_nothing(index_elements=[Appointment.id])
+        self.assertIn("ON CONFLICT (id) DO NOTHING", str(stmt.compile(dialect=postgresql.dialect())))
+
+        db.get_bind.return_value.dialect.name = "mssql"
+        with self.assertRaises(ValueError):
+            _upsert(db, Appointment)
+
+
 if __name__ == "__main__":
     unittest.main()
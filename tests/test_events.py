@@ -1,11 +1,29 @@
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
-from app.api.events import api_agenda_pdf, api_event_agenda, api_event_services_pdf, api_events
+from app.api.events import (
+    api_agenda_pdf,
+    api_agendas,
+    api_agendas_pdf,
+    api_event_agenda,
+    api_event_services_pdf,
+    api_events,
+    api_services_pdf,
+)
 from app.config import settings
 from app.schemas import AgendaItem, EventService, EventSummary
-from app.services.churchtools_client import _extract_person_name, fetch_agenda, fetch_events
+from app.services.cache import Cache, MemoryCacheBackend, configure_cache
+from app.services.churchtools_client import (
+    _extract_person_name,
+    fetch_agenda,
+    fetch_agendas,
+    fetch_event,
+    fetch_events,
+    forget_login_token,
+)
 
 
 def test_event_service_with_person():
@@ -102,6 +120,13 @@ def config_mock():
         yield
 
 
+@pytest.fixture(autouse=True)
+def _clear_client_caches():
+    configure_cache(Cache(MemoryCacheBackend()))
+    yield
+    configure_cache(None)
+
+
 SAMPLE_EVENTS_RESPONSE = {
     "data": [
         {
@@ -216,6 +241,83 @@ async def test_fetch_events_auth_error(config_mock):
         await fetch_events("bad_token", "2026-03-22", "2026-03-29", ["5"], client)
 
 
+SAMPLE_SERVICES_RESPONSE = {"data": [{"id": 1, "name": "Predigt"}, {"id": 2, "name": "Worship"}]}
+
+
+def _route_get(event_payload, event_status=200):
+    """Return a fake client.get that answers /api/services and single-event lookups separately."""
+
+    async def fake_get(url, headers=None, params=None):
+        response = MagicMock()
+        if url.endswith("/api/services"):
+            response.status_code = 200
+            response.json.return_value = SAMPLE_SERVICES_RESPONSE
+        else:
+            response.status_code = event_status
+            response.json.return_value = {"data": event_payload}
+        return response
+
+    return fake_get
+
+
+@pytest.mark.asyncio
+async def test_fetch_event_single_lookup(config_mock):
+    client = AsyncMock()
+    client.get.side_effect = _route_get(SAMPLE_EVENTS_RESPONSE["data"][0])
+
+    result = await fetch_event("token", 1, client)
+
+    assert result.id == 1
+    assert result.calendar_name == "Gottesdienste"
+    assert [svc.name for svc in result.services] == ["Predigt", "Worship"]
+    assert result.services[0].person_name == "Max Mustermann"
+    event_call = next(c for c in client.get.call_args_list if c.args[0].endswith("/api/events/1"))
+    assert event_call.kwargs["params"] == {"include": "eventServices"}
+
+
+@pytest.mark.asyncio
+async def test_fetch_event_not_found(config_mock):
+    client = AsyncMock()
+    client.get.side_effect = _route_get(None, event_status=404)
+
+    assert await fetch_event("token", 999, client) is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_event_auth_error(config_mock):
+    from app.services.churchtools_client import AuthenticationError
+
+    client = AsyncMock()
+    client.get.side_effect = _route_get(None, event_status=401)
+
+    with pytest.raises(AuthenticationError):
+        await fetch_event("bad_token", 1, client)
+
+
+@pytest.mark.asyncio
+async def test_service_names_are_cached_between_lookups(config_mock):
+    client = AsyncMock()
+    client.get.side_effect = _route_get(SAMPLE_EVENTS_RESPONSE["data"][0])
+
+    await fetch_event("token", 1, client)
+    await fetch_event("token", 1, client)
+
+    service_calls = [c for c in client.get.call_args_list if c.args[0].endswith("/api/services")]
+    assert len(service_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_service_names_are_cached_per_login_token(config_mock):
+    client = AsyncMock()
+    client.get.side_effect = _route_get(SAMPLE_EVENTS_RESPONSE["data"][0])
+
+    await fetch_event("token", 1, client)
+    await fetch_event("other_token", 1, client)
+
+    service_calls = [c for c in client.get.call_args_list if c.args[0].endswith("/api/services")]
+    assert len(service_calls) == 2
+
+
 def test_extract_person_name_full():
     person = {
         "title": "Max Mustermann",
@@ -343,6 +445,157 @@ async def test_fetch_agenda_auth_error(config_mock):
         await fetch_agenda("bad_token", 1, client)
 
 
+@pytest.mark.asyncio
+async def test_fetch_agenda_is_cached_per_event(config_mock):
+    client = AsyncMock()
+    client.get.return_value = _agenda_response(200, payload=SAMPLE_AGENDA_RESPONSE)
+
+    first = await fetch_agenda("token", 1, client)
+    second = await fetch_agenda("token", 1, client)
+
+    assert second == first
+    assert client.get.call_count == 1
+
+    await fetch_agenda("other_token", 1, client)
+    assert client.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_forget_login_token_drops_only_that_users_entries(config_mock):
+    client = AsyncMock()
+    client.get.return_value = _agenda_response(200, payload=SAMPLE_AGENDA_RESPONSE)
+
+    await fetch_agenda("token", 1, client)
+    await fetch_agenda("other_token", 1, client)
+    await forget_login_token("token")
+
+    await fetch_agenda("other_token", 1, client)
+    assert client.get.call_count == 2
+    await fetch_agenda("token", 1, client)
+    assert client.get.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_agenda_memory_cache_hit_skips_reparsing(config_mock):
+    from app.services.churchtools_client import _AgendaCacheEntry
+
+    client = AsyncMock()
+    client.get.return_value = _agenda_response(200, payload=SAMPLE_AGENDA_RESPONSE)
+
+    first = await fetch_agenda("token", 1, client)
+    with patch.object(_AgendaCacheEntry, "from_cache", side_effect=AssertionError("reparsed")):
+        second = await fetch_agenda("token", 1, client)
+
+    assert second is first
+
+
+@pytest.mark.asyncio
+async def test_fetch_agenda_shared_across_workers_via_sqlite_cache(config_mock, tmp_path):
+    from app.services.cache import SqliteCacheBackend
+
+    client = AsyncMock()
+    client.get.return_value = _agenda_response(200, payload=SAMPLE_AGENDA_RESPONSE)
+    cache_path = str(tmp_path / "cache.db")
+
+    configure_cache(Cache(SqliteCacheBackend(cache_path)))
+    first = await fetch_agenda("token", 1, client)
+
+    # Another worker process with its own connection to the same cache file
+    other_worker_cache = Cache(SqliteCacheBackend(cache_path))
+    configure_cache(other_worker_cache)
+    second = await fetch_agenda("token", 1, client)
+
+    assert second == first
+    assert client.get.call_count == 1
+    assert other_worker_cache.stats.hits == 1
+
+
+def _agenda_response(status_code, headers=None, payload=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = httpx.Headers(headers or {})
+    response.json.return_value = payload
+    return response
+
+
+def _after_agenda_ttl():
+    from app.services import churchtools_client
+
+    later = time.time() + churchtools_client.AGENDA_CACHE_TTL_SECONDS + 1
+    return patch("app.services.churchtools_client.time.time", return_value=later)
+
+
+@pytest.mark.asyncio
+async def test_fetch_agenda_revalidates_with_etag(config_mock):
+    client = AsyncMock()
+    client.get.side_effect = [
+        _agenda_response(
+            200,
+            {"ETag": '"v1"', "Last-Modified": "Sun, 22 Mar 2026 08:00:00 GMT"},
+            SAMPLE_AGENDA_RESPONSE,
+        ),
+        _agenda_response(304),
+    ]
+
+    first = await fetch_agenda("token", 1, client)
+    with _after_agenda_ttl():
+        second = await fetch_agenda("token", 1, client)
+
+    assert second == first
+    revalidation_headers = client.get.call_args_list[1].kwargs["headers"]
+    assert revalidation_headers["If-None-Match"] == '"v1"'
+    assert revalidation_headers["If-Modified-Since"] == "Sun, 22 Mar 2026 08:00:00 GMT"
+
+
+@pytest.mark.asyncio
+async def test_fetch_agenda_refetches_after_ttl_without_validators(config_mock):
+    client = AsyncMock()
+    client.get.side_effect = [
+        _agenda_response(200, payload=SAMPLE_AGENDA_RESPONSE),
+        _agenda_response(200, payload={"data": {"items": []}}),
+    ]
+
+    first = await fetch_agenda("token", 1, client)
+    with _after_agenda_ttl():
+        second = await fetch_agenda("token", 1, client)
+
+    assert len(first) == 3
+    assert second == []
+    assert "If-None-Match" not in client.get.call_args_list[1].kwargs["headers"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_agendas_bounded_concurrency(config_mock):
+    import asyncio
+
+    from app.services import churchtools_client
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_get(url, headers=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = SAMPLE_AGENDA_RESPONSE
+        return response
+
+    client = AsyncMock()
+    client.get.side_effect = slow_get
+
+    event_ids = list(range(1, 13)) + [1]
+    result = await fetch_agendas("token", event_ids, client)
+
+    assert sorted(result) == list(range(1, 13))
+    assert all(len(items) == 3 for items in result.values())
+    assert client.get.call_count == 12
+    assert max_in_flight <= churchtools_client.AGENDA_FETCH_CONCURRENCY
+
+
 # ---------------------------------------------------------------------------
 # Task 4: JSON API endpoints
 # ---------------------------------------------------------------------------
@@ -389,6 +642,36 @@ async def test_api_events_success(mock_fetch, config_mock):
     mock_fetch.assert_called_once_with("token", "2026-03-22", "2026-03-29", ["5"], client)
 
 
+@pytest.mark.asyncio
+@patch("app.api.events.fetch_events")
+async def test_api_events_not_modified(mock_fetch, config_mock):
+    from fastapi import Request
+
+    request = MagicMock(spec=Request)
+    request.cookies.get.return_value = "token"
+    request.headers = {}
+    mock_fetch.return_value = [
+        EventSummary(
+            id=1,
+            name="Gottesdienst",
+            start_date="2026-03-22T09:00:00Z",
+            end_date="2026-03-22T11:00:00Z",
+            calendar_name="GD",
+        )
+    ]
+    kwargs = {"client": AsyncMock(), "start_date": "2026-03-22", "end_date": "2026-03-29", "calendar_ids": ["5"]}
+
+    first = await api_events(request=request, **kwargs)
+    etag = first.headers["etag"]
+    request.headers = {"if-none-match": etag}
+    second = await api_events(request=request, **kwargs)
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.body == b""
+
+
 @pytest.mark.asyncio
 async def test_api_events_no_auth(config_mock):
     from fastapi import Request
@@ -491,10 +774,54 @@ async def test_api_agenda_pdf(mock_fetch_agenda, mock_create_pdf, config_mock):
     assert response.media_type == "application/pdf"
 
 
+@pytest.mark.asyncio
+@patch("app.api.events.create_services_pdf")
+@patch("app.api.events.fetch_event")
+async def test_api_event_services_pdf(mock_fetch_event, mock_create_pdf, config_mock):
+    from fastapi import Request
+    from fastapi.responses import StreamingResponse
+
+    request = MagicMock(spec=Request)
+    request.cookies.get.return_value = "token"
+    client = AsyncMock()
+
+    event = EventSummary(
+        id=1,
+        name="GD",
+        start_date="2026-03-22T09:00:00Z",
+        end_date="2026-03-22T11:00:00Z",
+        calendar_name="GD",
+        services=[],
+    )
+    mock_fetch_event.return_value = event
+    mock_create_pdf.return_value = b"%PDF-1.4 fake"
+
+    response = await api_event_services_pdf(request=request, event_id=1, event_name="GD", client=client)
+
+    assert isinstance(response, StreamingResponse)
+    assert response.media_type == "application/pdf"
+    mock_fetch_event.assert_called_once_with("token", 1, client)
+    mock_create_pdf.assert_called_once_with("GD", [event])
+
+
+@pytest.mark.asyncio
+@patch("app.api.events.fetch_event")
+async def test_api_event_services_pdf_not_found(mock_fetch_event, config_mock):
+    from fastapi import Request
+
+    request = MagicMock(spec=Request)
+    request.cookies.get.return_value = "token"
+    mock_fetch_event.return_value = None
+
+    response = await api_event_services_pdf(request=request, event_id=999, event_name=None, client=AsyncMock())
+
+    assert response.status_code == 404
+
+
 @pytest.mark.asyncio
 @patch("app.api.events.create_services_pdf")
 @patch("app.api.events.fetch_events")
-async def test_api_event_services_pdf(mock_fetch_events, mock_create_pdf, config_mock):
+async def test_api_services_pdf_range(mock_fetch_events, mock_create_pdf, config_mock):
     from fastapi import Request
     from fastapi.responses import StreamingResponse
 
@@ -502,28 +829,155 @@ async def test_api_event_services_pdf(mock_fetch_events, mock_create_pdf, config
     request.cookies.get.return_value = "token"
     client = AsyncMock()
 
-    mock_fetch_events.return_value = [
+    events = [
         EventSummary(
-            id=1,
+            id=i,
             name="GD",
             start_date="2026-03-22T09:00:00Z",
             end_date="2026-03-22T11:00:00Z",
             calendar_name="GD",
             services=[],
-        ),
+        )
+        for i in (1, 2)
     ]
+    mock_fetch_events.return_value = events
     mock_create_pdf.return_value = b"%PDF-1.4 fake"
 
-    response = await api_event_services_pdf(
+    response = await api_services_pdf(
         request=request,
-        event_id=1,
-        event_name="GD",
-        event_start="2026-03-22T09:00:00Z",
         client=client,
-        start_date="2026-03-22",
-        end_date="2026-03-29",
+        start_date="2026-03-01",
+        end_date="2026-03-31",
         calendar_ids=["5"],
+        group_by="person",
     )
 
     assert isinstance(response, StreamingResponse)
     assert response.media_type == "application/pdf"
+    mock_fetch_events.assert_called_once_with("token", "2026-03-01", "2026-03-31", ["5"], client)
+    mock_create_pdf.assert_called_once_with("01.03.2026 – 31.03.2026", events, group_by="person")
+
+
+@pytest.mark.asyncio
+async def test_api_services_pdf_no_auth(config_mock):
+    from fastapi import Request
+
+    request = MagicMock(spec=Request)
+    request.cookies.get.return_value = None
+
+    response = await api_services_pdf(
+        request=request,
+        client=AsyncMock(),
+        start_date="2026-03-01",
+        end_date="2026-03-31",
+        calendar_ids=["5"],
+        group_by="event",
+    )
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+@patch("app.api.events.fetch_agendas")
+async def test_api_agendas_batch(mock_fetch, config_mock):
+    import json
+
+    from fastapi import Request
+
+    request = MagicMock(spec=Request)
+    request.cookies.get.return_value = "token"
+    client = AsyncMock()
+
+    mock_fetch.return_value = {
+        1: [AgendaItem(position=1, title="Begruessung", start="2026-03-22T09:00:00Z", duration_seconds=300)],
+        2: [],
+    }
+
+    response = await api_agendas(request=request, event_ids=[1, 2], client=client)
+
+    assert response.status_code == 200
+    body = json.loads(response.body)
+    assert list(body["agendas"]) == ["1", "2"]
+    assert body["agendas"]["1"][0]["title"] == "Begruessung"
+    assert body["agendas"]["2"] == []
+    mock_fetch.assert_called_once_with("token", [1, 2], client)
+
+
+@pytest.mark.asyncio
+async def test_api_agendas_batch_too_many_ids(config_mock):
+    from fastapi import Request
+
+    from app.api.events import MAX_BATCH_EVENT_IDS
+
+    request = MagicMock(spec=Request)
+    request.cookies.get.return_value = "token"
+
+    response = await api_agendas(request=request, event_ids=list(range(MAX_BATCH_EVENT_IDS + 1)), client=AsyncMock())
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+@patch("app.api.events.create_agendas_pdf")
+@patch("app.api.events.fetch_agendas")
+@patch("app.api.events.fetch_events")
+async def test_api_agendas_pdf_skips_events_without_agenda(
+    mock_fetch_events, mock_fetch_agendas, mock_create_pdf, config_mock
+):
+    from fastapi import Request
+    from fastapi.responses import StreamingResponse
+
+    request = MagicMock(spec=Request)
+    request.cookies.get.return_value = "token"
+    client = AsyncMock()
+
+    mock_fetch_events.return_value = [
+        EventSummary(
+            id=i,
+            name=f"GD {i}",
+            start_date="2026-03-22T09:00:00Z",
+            end_date="2026-03-22T11:00:00Z",
+            calendar_name="GD",
+        )
+        for i in (1, 2)
+    ]
+    items = [AgendaItem(position=1, title="Begruessung")]
+    mock_fetch_agendas.return_value = {1: items, 2: []}
+    mock_create_pdf.return_value = b"%PDF-1.4 fake"
+
+    response = await api_agendas_pdf(
+        request=request, client=client, start_date="2026-03-01", end_date="2026-03-31", calendar_ids=["5"]
+    )
+
+    assert isinstance(response, StreamingResponse)
+    mock_fetch_agendas.assert_called_once_with("token", [1, 2], client)
+    mock_create_pdf.assert_called_once_with([("GD 1", "2026-03-22T09:00:00Z", items)])
+
+
+@pytest.mark.asyncio
+@patch("app.api.events.fetch_agendas")
+@patch("app.api.events.fetch_events")
+async def test_api_agendas_pdf_too_many_events(mock_fetch_events, mock_fetch_agendas, config_mock):
+    from fastapi import Request
+
+    from app.api.events import MAX_BATCH_EVENT_IDS
+
+    request = MagicMock(spec=Request)
+    request.cookies.get.return_value = "token"
+    mock_fetch_events.return_value = [
+        EventSummary(
+            id=i,
+            name=f"GD {i}",
+            start_date="2026-03-22T09:00:00Z",
+            end_date="2026-03-22T11:00:00Z",
+            calendar_name="GD",
+        )
+        for i in range(MAX_BATCH_EVENT_IDS + 1)
+    ]
+
+    response = await api_agendas_pdf(
+        request=request, client=AsyncMock(), start_date="2026-01-01", end_date="2026-12-31", calendar_ids=["5"]
+    )
+
+    assert response.status_code == 400
+    mock_fetch_agendas.assert_not_called()
@@ -1,5 +1,5 @@
 from app.schemas import AgendaItem, EventService, EventSummary
-from app.services.pdf_generator import create_agenda_pdf, create_services_pdf
+from app.services.pdf_generator import create_agenda_pdf, create_agendas_pdf, create_services_pdf, get_document_styles
 
 
 def _make_agenda_items():
@@ -51,6 +51,25 @@ def test_create_agenda_pdf_empty_items():
     assert result[:5] == b"%PDF-"
 
 
+def test_create_agendas_pdf_one_page_per_event():
+    items = _make_agenda_items()
+    single = create_agenda_pdf("Gottesdienst", "2026-03-22T09:00:00Z", items)
+    combined = create_agendas_pdf(
+        [
+            ("Gottesdienst", "2026-03-22T09:00:00Z", items),
+            ("Abendgottesdienst", "2026-03-22T18:00:00Z", items),
+        ]
+    )
+    assert combined[:5] == b"%PDF-"
+    assert single.count(b"/Type /Page\n") == 1
+    assert combined.count(b"/Type /Page\n") == 2
+
+
+def test_create_agendas_pdf_empty():
+    result = create_agendas_pdf([])
+    assert result[:5] == b"%PDF-"
+
+
 def _make_events():
     return [
         EventSummary(
@@ -88,3 +107,26 @@ def test_create_services_pdf_empty_events():
     result = create_services_pdf("22.03. \u2013 29.03.2026", [])
     assert isinstance(result, bytes)
     assert result[:5] == b"%PDF-"
+
+
+def test_document_styles_are_built_once():
+    first = get_document_styles()
+    create_agenda_pdf("Gottesdienst", "2026-03-22T09:00:00Z", _make_agenda_items())
+    create_services_pdf("22.03. \u2013 29.03.2026", _make_events())
+    assert get_document_styles() is first
+    assert first.agenda_table is get_document_styles().agenda_table
+
+
+def test_create_services_pdf_grouped_by_person():
+    result = create_services_pdf("22.03. \u2013 29.03.2026", _make_events(), group_by="person")
+    assert result[:5] == b"%PDF-"
+
+
+def test_create_services_pdf_grouped_by_service():
+    result = create_services_pdf("22.03. \u2013 29.03.2026", _make_events(), group_by="service")
+    assert result[:5] == b"%PDF-"
+
+
+def test_create_services_pdf_grouped_without_services():
+    result = create_services_pdf("22.03. \u2013 29.03.2026", [], group_by="person")
+    assert result[:5] == b"%PDF-"
@@ -0,0 +1,72 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from starlette.requests import Request
+
+from app.api.fragments import fragment_appointments
+from app.config import settings
+from app.shared import templates
+
+
+def _raw_appointment(appointment_id: int, title: str) -> dict:
+    return {
+        "base": {"id": appointment_id, "title": title, "address": {"meetingAt": "Kirche"}},
+        "calculated": {"startDate": "2026-03-01T09:00:00Z", "endDate": "2026-03-01T10:00:00Z"},
+    }
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [(b"cookie", f"{settings.cookie_login_token}=token".encode())]
+    if if_none_match:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+async def _render(raw_appointments: list[dict], additional_infos: dict, if_none_match: str | None = None):
+    with (
+        patch("app.api.fragments.fetch_appointments", AsyncMock(return_value=raw_appointments)),
+        patch("app.api.fragments.get_additional_infos", return_value=additional_infos),
+    ):
+        return await fragment_appointments(
+            _request(if_none_match),
+            db=MagicMock(),
+            start_date="2026-03-01",
+            end_date="2026-03-31",
+            calendar_ids=["1"],
+            client=None,
+        )
+
+
+async def test_fragment_revalidates_unchanged_data_with_304():
+    raw = [_raw_appointment(1, "Gottesdienst"), _raw_appointment(2, "Chorprobe")]
+
+    first = await _render(raw, {"1": "Predigt: Pfarrer Müller"})
+    assert first.status_code == 200
+    assert "Gottesdienst" in first.body.decode() and "Pfarrer Müller" in first.body.decode()
+    etag = first.headers["etag"]
+
+    repeat = await _render(raw, {"1": "Predigt: Pfarrer Müller"}, if_none_match=etag)
+    assert repeat.status_code == 304
+    assert repeat.headers["etag"] == etag
+
+    # A changed additional info or appointment list yields a new representation
+    edited = await _render(raw, {"1": "Predigt: Pfarrerin Schmidt"}, if_none_match=etag)
+    shorter = await _render(raw[:1], {"1": "Predigt: Pfarrer Müller"}, if_none_match=etag)
+    assert edited.status_code == 200 and "Pfarrerin Schmidt" in edited.body.decode()
+    assert shorter.status_code == 200 and "Chorprobe" not in shorter.body.decode()
+
+
+def test_bytecode_cache_persists_compiled_templates(tmp_path):
+    from jinja2 import FileSystemBytecodeCache
+
+    from app.shared import enable_template_bytecode_cache, warm_up_templates
+
+    cache_dir = tmp_path / "template_cache"
+    try:
+        enable_template_bytecode_cache(str(cache_dir))
+        templates.env.cache.clear()
+        warm_up_templates()
+        assert isinstance(templates.env.bytecode_cache, FileSystemBytecodeCache)
+        assert len(list(cache_dir.iterdir())) == len(templates.env.list_templates(extensions=["html"]))
+    finally:
+        templates.env.bytecode_cache = None
+        templates.env.cache.clear()
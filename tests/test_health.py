@@ -11,3 +11,37 @@ def test_health_endpoint():
     data = response.json()
     assert data["status"] == "ok"
     assert "version" in data
+    assert {"backend", "hit_rate", "average_latency_ms"} <= data["cache"].keys()
+
+
+async def test_health_stays_responsive_while_db_worker_is_busy():
+    import asyncio
+    import threading
+
+    import httpx
+
+    from app.database import run_db
+
+    db_call_started = threading.Event()
+    release_db_call = threading.Event()
+
+    def blocking_db_call() -> str:
+        # Stands in for a long write; holds its DB worker thread until the test lets it finish
+        db_call_started.set()
+        release_db_call.wait(timeout=10)
+        return "done"
+
+    db_call = asyncio.create_task(run_db(blocking_db_call))
+    try:
+        assert await asyncio.to_thread(db_call_started.wait, 10)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            response = await async_client.get("/health")
+
+        # /health answered while the DB call was still blocked, so it never waited on it
+        assert response.status_code == 200
+        assert not db_call.done()
+    finally:
+        release_db_call.set()
+    assert await db_call == "done"
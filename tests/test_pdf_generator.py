@@ -15,6 +15,7 @@ from app.services.pdf_generator import (
     setup_new_page,
     wrap_text,
 )
+from app.utils import FormattedDateTime
 
 
 class TestPdfGenerator(unittest.TestCase):
@@ -266,26 +267,21 @@ class TestPdfGenerator(unittest.TestCase):
             )
         ]
 
-        # Mock parse_iso_datetime
-        with patch("app.services.pdf_generator.parse_iso_datetime") as mock_parse:
-            # Create a mock datetime object
-            mock_dt = MagicMock()
-            mock_dt.strftime.side_effect = lambda fmt: "15.01.2023" if fmt == "%d.%m.%Y" else "11:00"
-            mock_parse.return_value = mock_dt
-
-            # Mock format_date
-            with patch("app.services.pdf_generator.format_date") as mock_format:
-                mock_format.return_value = "Sonntag"
-
-                # Call the function
-                result = create_pdf(
-                    appointments,
-                    "#c1540c",  # date_color
-                    "#ffffff",  # background_color
-                    "#4e4e4e",  # description_color
-                    128,  # alpha
-                    None,  # image_stream
-                )
+        # Mock format_iso_datetime
+        with patch("app.services.pdf_generator.format_iso_datetime") as mock_format:
+            mock_format.return_value = FormattedDateTime(
+                value=MagicMock(), weekday="Sonntag", date="15.01.2023", time="11:00"
+            )
+
+            # Call the function
+            result = create_pdf(
+                appointments,
+                "#c1540c",  # date_color
+                "#ffffff",  # background_color
+                "#4e4e4e",  # description_color
+                128,  # alpha
+                None,  # image_stream
+            )
 
         # Check that Canvas was created with a BytesIO buffer
         mock_canvas.assert_called_once()
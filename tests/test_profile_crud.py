@@ -1,10 +1,14 @@
 import os
 import tempfile
 import unittest
+from pathlib import Path
+from unittest.mock import patch
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.orm import sessionmaker
 
+from app.config import settings
+from app.crud import clear_profile_cache
 from app.database import Base
 
 
@@ -18,10 +22,20 @@ class TestProfileCRUD(unittest.TestCase):
         import app.models  # noqa: F401
 
         Base.metadata.create_all(self.engine)
+        clear_profile_cache()
+
+        self.asset_dir = tempfile.TemporaryDirectory()
+        self.asset_dir_patch = patch.object(settings, "asset_dir", self.asset_dir.name)
+        self.asset_dir_patch.start()
 
     def tearDown(self):
         self.session.close()
         os.unlink(self.temp_db.name)
+        self.asset_dir_patch.stop()
+        self.asset_dir.cleanup()
+
+    def _stored_assets(self):
+        return sorted(p.name for p in Path(self.asset_dir.name).rglob("*") if p.is_file())
 
     def test_list_profiles_default_only(self):
         from app.crud import list_profiles, save_color_settings
@@ -67,3 +81,169 @@ class TestProfileCRUD(unittest.TestCase):
         delete_profile(self.session, "temp")
         profiles = list_profiles(self.session)
         self.assertNotIn("temp", profiles)
+
+    def test_logo_metadata_without_blob(self):
+        from io import BytesIO
+
+        from PIL import Image
+
+        from app.crud import load_logo_info, save_logo
+        from app.models import LogoSetting
+
+        buffer = BytesIO()
+        Image.new("RGB", (40, 20), "red").save(buffer, format="PNG")
+        png = buffer.getvalue()
+
+        self.assertIsNone(load_logo_info(self.session, "default"))
+        save_logo(self.session, "default", png, "logo.png")
+        self.session.expire_all()
+
+        info = load_logo_info(self.session, "default")
+        self.assertEqual(info.size, len(png))
+        self.assertEqual((info.width, info.height), (40, 20))
+        self.assertEqual(info.mime_type, "image/png")
+        self.assertEqual(len(info.content_hash), 64)
+
+        # The image bytes live in the asset store, not in the database row
+        self.assertNotIn("logo_data", inspect(LogoSetting).columns)
+        self.assertEqual(self._stored_assets(), [info.content_hash])
+
+    def test_background_metadata_for_non_raster_image(self):
+        from app.crud import load_background_image_info, save_background_image
+
+        save_background_image(self.session, "default", b"<svg></svg>", "bg.svg")
+        info = load_background_image_info(self.session, "default")
+        self.assertEqual(info.mime_type, "image/svg+xml")
+        self.assertIsNone(info.width)
+
+    def test_clone_profile_copies_asset_metadata(self):
+        from app.crud import clone_profile, load_logo, load_logo_info, save_color_settings, save_logo
+        from app.schemas import ColorSettings
+
+        save_color_settings(self.session, ColorSettings(name="default"))
+        save_logo(self.session, "default", b"logodata", "logo.jpg")
+        clone_profile(self.session, "default", "copy")
+        self.assertEqual(load_logo_info(self.session, "copy"), load_logo_info(self.session, "default"))
+        self.assertEqual(load_logo(self.session, "copy"), (b"logodata", "logo.jpg"))
+        # Both profiles share the single stored file
+        self.assertEqual(len(self._stored_assets()), 1)
+
+    def test_shared_asset_removed_with_last_reference(self):
+        from app.crud import clone_profile, delete_logo, delete_profile, load_logo, save_color_settings, save_logo
+        from app.schemas import ColorSettings
+
+        save_color_settings(self.session, ColorSettings(name="default"))
+        save_logo(self.session, "default", b"logodata", "logo.png")
+        clone_profile(self.session, "default", "copy")
+
+        delete_profile(self.session, "copy")
+        self.assertEqual(len(self._stored_assets()), 1)
+        self.assertEqual(load_logo(self.session, "default"), (b"logodata", "logo.png"))
+
+        delete_logo(self.session, "default")
+        self.assertEqual(self._stored_assets(), [])
+
+    def test_replacing_image_releases_previous_asset(self):
+        from app.crud import load_background_image, save_background_image
+
+        save_background_image(self.session, "default", b"first", "bg.png")
+        save_background_image(self.session, "default", b"second", "bg.png")
+        self.assertEqual(len(self._stored_assets()), 1)
+        self.assertEqual(load_background_image(self.session, "default"), (b"second", "bg.png"))
+
+    def test_failed_save_removes_new_asset(self):
+        from sqlalchemy.exc import OperationalError
+
+        from app.crud import save_background_image, save_logo
+
+        save_logo(self.session, "default", b"shared", "logo.png")
+        failure = OperationalError("COMMIT", {}, Exception("database is locked"))
+        with patch("app.crud._commit_profile_change", side_effect=failure):
+            with self.assertRaises(OperationalError):
+                save_logo(self.session, "sunday", b"new logo", "logo.png")
+            with self.assertRaises(OperationalError):
+                save_background_image(self.session, "sunday", b"new background", "bg.png")
+            # An asset another profile still references survives the failed save
+            with self.assertRaises(OperationalError):
+                save_background_image(self.session, "sunday", b"shared", "bg.png")
+
+        self.assertEqual(len(self._stored_assets()), 1)
+
+    def test_save_logo_moves_staged_upload_into_store(self):
+        import hashlib
+
+        from app.crud import load_logo, load_logo_info, save_logo
+        from app.services.asset_store import StagedAsset, staging_dir
+
+        staged_path = staging_dir() / "upload-test"
+        staged_path.write_bytes(b"streamed")
+        staged = StagedAsset(staged_path, 8, hashlib.sha256(b"streamed").hexdigest())
+
+        info = save_logo(self.session, "default", staged, "logo.png")
+        self.assertEqual(info.content_hash, staged.content_hash)
+        self.assertEqual(load_logo_info(self.session, "default").size, 8)
+        self.assertEqual(load_logo(self.session, "default"), (b"streamed", "logo.png"))
+        self.assertFalse(staged_path.exists())
+        self.assertEqual(self._stored_assets(), [staged.content_hash])
+
+    def _count_queries(self):
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        return statements
+
+    def test_profile_reads_are_cached_until_a_write(self):
+        from app.crud import load_color_settings, load_logo_info, save_color_settings, save_logo
+        from app.schemas import ColorSettings
+
+        save_color_settings(self.session, ColorSettings(name="default", date_color="#111111"))
+        save_logo(self.session, "default", b"logodata", "logo.png")
+        load_color_settings(self.session, "default")
+        load_logo_info(self.session, "default")
+
+        statements = self._count_queries()
+        self.assertEqual(load_color_settings(self.session, "default").date_color, "#111111")
+        self.assertEqual(load_logo_info(self.session, "default").filename, "logo.png")
+        # Only the version counter is checked on a hit
+        self.assertEqual(len(statements), 2)
+        self.assertTrue(all("cache_versions" in statement for statement in statements))
+
+        save_color_settings(self.session, ColorSettings(name="default", date_color="#222222"))
+        self.assertEqual(load_color_settings(self.session, "default").date_color, "#222222")
+
+    def test_unchanged_color_save_keeps_cache_version(self):
+        from app.crud import _profile_settings_version, save_color_settings
+        from app.schemas import ColorSettings
+
+        save_color_settings(self.session, ColorSettings(name="default"))
+        version = _profile_settings_version(self.session)
+        save_color_settings(self.session, ColorSettings(name="default"))
+        self.assertEqual(_profile_settings_version(self.session), version)
+
+    def test_change_from_another_worker_invalidates_cache(self):
+        from app.crud import _bump_profile_settings_version, load_color_settings, save_color_settings
+        from app.models import ColorSetting
+        from app.schemas import ColorSettings
+
+        save_color_settings(self.session, ColorSettings(name="default", date_color="#111111"))
+        self.assertEqual(load_color_settings(self.session, "default").date_color, "#111111")
+
+        # Another process writes through its own connection; this process's cache is untouched
+        other = sessionmaker(bind=self.engine)()
+        other.query(ColorSetting).filter_by(setting_name="default").update({"date_color": "#333333"})
+        _bump_profile_settings_version(other)
+        other.commit()
+        other.close()
+
+        self.assertEqual(load_color_settings(self.session, "default").date_color, "#333333")
+
+    def test_delete_profile_invalidates_cached_assets(self):
+        from app.crud import clone_profile, delete_profile, load_logo_info, save_color_settings, save_logo
+        from app.schemas import ColorSettings
+
+        save_color_settings(self.session, ColorSettings(name="default"))
+        save_logo(self.session, "default", b"logodata", "logo.png")
+        clone_profile(self.session, "default", "copy")
+        self.assertIsNotNone(load_logo_info(self.session, "copy"))
+
+        delete_profile(self.session, "copy")
+        self.assertIsNone(load_logo_info(self.session, "copy"))
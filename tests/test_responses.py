@@ -0,0 +1,68 @@
+import json
+
+from starlette.requests import Request
+
+from app.responses import (
+    CONDITIONAL_JSON_CACHE_CONTROL,
+    conditional_html_response,
+    conditional_json_response,
+    etag_matches,
+    json_etag,
+)
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def test_json_etag_ignores_key_order():
+    assert json_etag({"a": 1, "b": [1, 2]}) == json_etag({"b": [1, 2], "a": 1})
+
+
+def test_json_etag_changes_with_payload():
+    assert json_etag({"a": 1}) != json_etag({"a": 2})
+
+
+def test_json_etag_is_strong():
+    etag = json_etag({"a": 1})
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_etag_matches_weak_and_lists():
+    etag = json_etag({"a": 1})
+    assert etag_matches(etag, etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_conditional_json_response_full_body():
+    payload = {"appointments": [{"id": "1", "title": "Gottesdienst"}]}
+    response = conditional_json_response(_request(), payload)
+
+    assert response.status_code == 200
+    assert json.loads(response.body) == payload
+    assert response.headers["etag"] == json_etag(payload)
+    assert response.headers["cache-control"] == CONDITIONAL_JSON_CACHE_CONTROL
+
+
+def test_conditional_json_response_not_modified():
+    payload = {"appointments": []}
+    response = conditional_json_response(_request(f"W/{json_etag(payload)}"), payload)
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == json_etag(payload)
+
+
+def test_conditional_html_response_round_trip():
+    full = conditional_html_response(_request(), "<p>Gottesdienst</p>")
+    assert full.status_code == 200
+    assert full.body == b"<p>Gottesdienst</p>"
+
+    not_modified = conditional_html_response(_request(full.headers["etag"]), "<p>Gottesdienst</p>")
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == full.headers["etag"]
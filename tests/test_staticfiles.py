@@ -0,0 +1,104 @@
+import gzip
+import hashlib
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.staticfiles import FINGERPRINTED_CACHE_CONTROL, FingerprintedStaticFiles, StaticManifest
+
+APP_JS_V1 = b"console.log('v1');\n"
+APP_JS_V2 = b"console.log('version 2');\n"
+CSS = b"body {}\n"
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / "js").mkdir()
+    (tmp_path / "js" / "app.js").write_bytes(APP_JS_V1)
+    (tmp_path / "js" / "app.js.gz").write_bytes(gzip.compress(APP_JS_V1))
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "flatpickr.min.css").write_bytes(CSS)
+    return tmp_path
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def test_manifest_fingerprints_files(static_dir):
+    manifest = StaticManifest(static_dir)
+    digest = _digest(APP_JS_V1)
+
+    assert manifest.url("js/app.js") == f"/static/js/app.{digest}.js"
+    assert manifest.url("/js/app.js") == f"/static/js/app.{digest}.js"
+    assert manifest.url("css/flatpickr.min.css") == f"/static/css/flatpickr.{_digest(CSS)}.min.css"
+    assert manifest.original_path(f"js/app.{digest}.js") == "js/app.js"
+    # Precompressed variants are served through their source file, not fingerprinted at startup
+    assert len(manifest._originals) == 2
+    assert manifest.url("js/missing.js") == "/static/js/missing.js"
+
+
+def test_manifest_rehashes_changed_file(static_dir):
+    manifest = StaticManifest(static_dir)
+    old_url = manifest.url("js/app.js")
+
+    source = static_dir / "js" / "app.js"
+    source.write_bytes(APP_JS_V2)
+    os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 1_000_000_000))
+
+    assert manifest.url("js/app.js") == f"/static/js/app.{_digest(APP_JS_V2)}.js"
+    assert manifest.url("js/app.js") != old_url
+
+
+def test_fingerprinted_url_is_immutable(static_dir):
+    manifest = StaticManifest(static_dir)
+    test_app = FastAPI()
+    test_app.mount("/static", FingerprintedStaticFiles(directory=str(static_dir), manifest=manifest), name="static")
+    client = TestClient(test_app)
+
+    hashed = client.get(manifest.url("js/app.js"), headers={"Accept-Encoding": "identity"})
+    assert hashed.status_code == 200
+    assert hashed.content == APP_JS_V1
+    assert hashed.headers["cache-control"] == FINGERPRINTED_CACHE_CONTROL
+
+    # The precompressed variant is picked for the fingerprinted name too
+    compressed = client.get(manifest.url("js/app.js"), headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["cache-control"] == FINGERPRINTED_CACHE_CONTROL
+
+    plain = client.get("/static/js/app.js")
+    assert plain.status_code == 200
+    assert "cache-control" not in plain.headers
+
+    assert client.get("/static/js/app.000000000000.js").status_code == 404
+
+
+def test_outdated_fingerprint_is_not_cached_forever(static_dir):
+    manifest = StaticManifest(static_dir)
+    test_app = FastAPI()
+    test_app.mount("/static", FingerprintedStaticFiles(directory=str(static_dir), manifest=manifest), name="static")
+    client = TestClient(test_app)
+    old_url = manifest.url("js/app.js")
+
+    source = static_dir / "js" / "app.js"
+    source.write_bytes(APP_JS_V2)
+    os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 1_000_000_000))
+
+    response = client.get(old_url)
+    assert response.status_code == 200
+    assert "cache-control" not in response.headers
+    assert client.get(manifest.url("js/app.js")).headers["cache-control"] == FINGERPRINTED_CACHE_CONTROL
+
+
+def test_templates_reference_fingerprinted_assets():
+    from starlette.requests import Request
+
+    from app.shared import templates
+    from app.staticfiles import get_static_manifest
+
+    request = Request({"type": "http", "headers": []})
+    html = templates.get_template("login.html").render(request=request, base_url="", version="0.0.0-test")
+    assert get_static_manifest().url("css/login.css") in html
+    assert "/static/css/login.css" not in html
@@ -2,7 +2,7 @@ import unittest
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from app.utils import get_date_range_from_form, normalize_newlines, parse_iso_datetime
+from app.utils import format_iso_datetime, get_date_range_from_form, normalize_newlines, parse_iso_datetime
 
 
 class TestUtils(unittest.TestCase):
@@ -27,6 +27,23 @@ class TestUtils(unittest.TestCase):
         result = parse_iso_datetime(dt_str, tz=ny_tz)
         self.assertEqual(result.hour, 9)  # 14 UTC = 9 EST
 
+    def test_parse_iso_datetime_is_memoised(self):
+        dt_str = "2023-01-15T14:30:00Z"
+        self.assertIs(parse_iso_datetime(dt_str), parse_iso_datetime(dt_str))
+
+    def test_format_iso_datetime(self):
+        result = format_iso_datetime("2026-03-22T09:00:00Z")
+        self.assertEqual(result.weekday, "Sonntag")
+        self.assertEqual(result.date, "22.03.2026")
+        self.assertEqual(result.time, "10:00")
+        self.assertEqual(result.value, parse_iso_datetime("2026-03-22T09:00:00Z"))
+
+    def test_format_iso_datetime_custom_timezone(self):
+        result = format_iso_datetime("2026-03-22T03:00:00Z", tz=ZoneInfo("America/New_York"))
+        self.assertEqual(result.weekday, "Samstag")
+        self.assertEqual(result.date, "21.03.2026")
+        self.assertEqual(result.time, "23:00")
+
     def test_normalize_newlines(self):
         # Test with Windows-style line endings
         windows_text = "Line1\r\nLine2\r\nLine3"